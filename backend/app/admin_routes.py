@@ -0,0 +1,67 @@
+import os
+from fastapi import APIRouter, Depends, status
+from .models import User
+from .auth_routes import get_current_user
+from .errors import raise_forbidden_error
+from .recompute import start_recompute, restart_recompute, recompute_status, results_version
+from .runtime import start_reload, reload_status, active_bundle
+from .leaderboard import materialize_leaderboard
+from .memo import cache_stats, clear_caches
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+ADMIN_EMAILS = {e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()}
+
+def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise_forbidden_error("You don't have permission to perform this action.", reason="admin_only")
+    return current_user
+
+@router.get("/recompute")
+def get_recompute_status(admin: User = Depends(get_admin_user)):
+    return {
+        **recompute_status,
+        "current_version": results_version()
+    }
+
+@router.post("/recompute", status_code=status.HTTP_202_ACCEPTED)
+def trigger_recompute(admin: User = Depends(get_admin_user)):
+    started = start_recompute()
+    return {
+        "started": started,
+        **recompute_status
+    }
+
+@router.get("/reload")
+def get_reload_status(admin: User = Depends(get_admin_user)):
+    return {
+        **reload_status,
+        "current_version": active_bundle().version
+    }
+
+def _on_bundle_swap(bundle):
+    materialize_leaderboard(bundle)
+    restart_recompute(bundle)
+
+@router.post("/reload", status_code=status.HTTP_202_ACCEPTED)
+def trigger_reload(admin: User = Depends(get_admin_user)):
+    # Reloads this worker's models and datasets; when the version changes,
+    # the leaderboard is rebuilt and saved simulations are recomputed
+    # against the new bundle.
+    started = start_reload(on_swap=_on_bundle_swap)
+    return {
+        "started": started,
+        **reload_status
+    }
+
+@router.get("/cache")
+def get_cache_stats(admin: User = Depends(get_admin_user)):
+    return {
+        "stages": cache_stats(),
+        "current_version": active_bundle().version
+    }
+
+@router.delete("/cache")
+def clear_cache(admin: User = Depends(get_admin_user)):
+    clear_caches()
+    return {"stages": cache_stats()}
@@ -1,13 +1,16 @@
+import numpy as np
 from .services import get_country_total_co2, get_country_population
 
+REDUCTION_PRICE_POINTS = [
+    (0, 0.03),
+    (30, 0.03),
+    (60, 0.05),
+    (100, 0.08),
+    (150, 0.12),
+]
+
 def calculate_reduction_rate(carbon_price_usd):
-    price_points = [
-        (0, 0.03),
-        (30, 0.03),
-        (60, 0.05),
-        (100, 0.08),
-        (150, 0.12),
-    ]
+    price_points = REDUCTION_PRICE_POINTS
     
     if carbon_price_usd <= 0:
         return 0.03
@@ -27,6 +30,21 @@ def calculate_reduction_rate(carbon_price_usd):
     
     return min(0.12, 0.15)  
 
+def calculate_reduction_rate_array(carbon_price_usd):
+    # Element-wise calculate_reduction_rate; same interpolation arithmetic, so
+    # results match the scalar version exactly.
+    price = np.asarray(carbon_price_usd, dtype=float)
+    prices = np.array([p for p, _ in REDUCTION_PRICE_POINTS], dtype=float)
+    rates = np.array([r for _, r in REDUCTION_PRICE_POINTS], dtype=float)
+
+    segment = np.clip(np.searchsorted(prices, price, side='right') - 1, 0, len(prices) - 2)
+    price_low, price_high = prices[segment], prices[segment + 1]
+    rate_low, rate_high = rates[segment], rates[segment + 1]
+    rate = np.minimum(rate_low + (rate_high - rate_low) * ((price - price_low) / (price_high - price_low)), 0.15)
+
+    rate = np.where(price >= 150, 0.12, rate)
+    return np.where(price <= 0, 0.03, rate)
+
 def calculate_co2_impact(coverage_pct, country, year, carbon_price_usd=50):
     total_co2_mt = get_country_total_co2(country, year)
 
@@ -36,6 +54,9 @@ def calculate_co2_impact(coverage_pct, country, year, carbon_price_usd=50):
     if total_co2_mt <= 0:
         return None
 
+    return co2_impact_from_totals(coverage_pct, total_co2_mt, carbon_price_usd, get_country_population(country, year))
+
+def co2_impact_from_totals(coverage_pct, total_co2_mt, carbon_price_usd, population):
     co2_covered_mt = (coverage_pct / 100) * total_co2_mt
     co2_uncovered_mt = total_co2_mt - co2_covered_mt
 
@@ -48,7 +69,6 @@ def calculate_co2_impact(coverage_pct, country, year, carbon_price_usd=50):
     if co2_potentially_reduced_mt < 0.01:
         co2_potentially_reduced_mt = 0.01
 
-    population = get_country_population(country, year)
     co2_covered_per_capita = (co2_covered_mt * 1_000_000) / population if population else 0
 
     return {
@@ -61,9 +81,74 @@ def calculate_co2_impact(coverage_pct, country, year, carbon_price_usd=50):
         'co2_covered_per_capita_tonnes': round(co2_covered_per_capita, 3),
         'reduction_rate_used': reduction_rate,
         'carbon_price_usd': carbon_price_usd,
-        'disclaimer': f'Potential reduction based on {int(reduction_rate*100)}% rate for ${carbon_price_usd}/tonne carbon price (literature-based estimate). Actual reductions depend on policy design, enforcement quality, and sector compliance.'
+        'disclaimer': co2_impact_disclaimer(reduction_rate, carbon_price_usd)
+    }
+
+def co2_impact_disclaimer(reduction_rate, carbon_price_usd) -> str:
+    return f'Potential reduction based on {int(reduction_rate*100)}% rate for ${carbon_price_usd}/tonne carbon price (literature-based estimate). Actual reductions depend on policy design, enforcement quality, and sector compliance.'
+
+def co2_reduced_array(coverage_percent, total_co2_mt, carbon_price_usd):
+    # Array form of the reduction step in calculate_co2_impact, before rounding.
+    co2_covered_mt = (coverage_percent / 100) * np.asarray(total_co2_mt, dtype=float)
+    reduced = np.minimum(co2_covered_mt * calculate_reduction_rate_array(carbon_price_usd), co2_covered_mt * 0.20)
+    return np.where(reduced < 0.01, 0.01, reduced)
+
+# Numeric fields of calculate_co2_impact, one record per row; valid is False
+# where the scalar version returns None.
+CO2_IMPACT_DTYPE = np.dtype([
+    ('valid', bool),
+    ('total_country_co2_mt', float),
+    ('co2_covered_mt', float),
+    ('co2_uncovered_mt', float),
+    ('co2_potentially_reduced_mt', float),
+    ('co2_covered_per_capita_tonnes', float),
+    ('reduction_rate_used', float),
+])
+
+def calculate_co2_impact_array(coverage_pct, total_co2_mt, carbon_price_usd, population) -> np.ndarray:
+    # co2_impact_from_totals element-wise over broadcast arrays, rounded the
+    # same way; co2_impact_record turns a row into the scalar dict.
+    coverage, total, price, population = np.broadcast_arrays(*(
+        np.asarray(values, dtype=float) for values in (coverage_pct, total_co2_mt, carbon_price_usd, population)
+    ))
+    co2_covered_mt = (coverage / 100) * total
+    has_population = population != 0
+    per_capita = np.where(has_population, (co2_covered_mt * 1_000_000) / np.where(has_population, population, 1), 0.0)
+
+    impact = np.empty(coverage.shape, dtype=CO2_IMPACT_DTYPE)
+    impact['valid'] = ~(total <= 0)
+    impact['total_country_co2_mt'] = np.round(total, 1)
+    impact['co2_covered_mt'] = np.round(co2_covered_mt, 1)
+    impact['co2_uncovered_mt'] = np.round(total - co2_covered_mt, 1)
+    impact['co2_potentially_reduced_mt'] = np.round(co2_reduced_array(coverage, total, price), 3)
+    impact['co2_covered_per_capita_tonnes'] = np.round(per_capita, 3)
+    impact['reduction_rate_used'] = calculate_reduction_rate_array(price)
+    return impact
+
+def co2_impact_record(impact, coverage_pct, carbon_price_usd):
+    # One CO2_IMPACT_DTYPE row as the dict calculate_co2_impact returns.
+    if not impact['valid']:
+        return None
+    reduction_rate = float(impact['reduction_rate_used'])
+    return {
+        'total_country_co2_mt': impact['total_country_co2_mt'],
+        'co2_covered_mt': impact['co2_covered_mt'],
+        'co2_covered_percent': round(coverage_pct, 1),
+        'co2_uncovered_mt': impact['co2_uncovered_mt'],
+        'co2_uncovered_percent': round(100 - coverage_pct, 1),
+        'co2_potentially_reduced_mt': impact['co2_potentially_reduced_mt'],
+        'co2_covered_per_capita_tonnes': impact['co2_covered_per_capita_tonnes'],
+        'reduction_rate_used': reduction_rate,
+        'carbon_price_usd': carbon_price_usd,
+        'disclaimer': co2_impact_disclaimer(reduction_rate, carbon_price_usd)
     }
 
+CO2_PER_CAR_TONNES = 4.6
+CO2_PER_TREE_TONNES = 0.06
+CO2_PER_COAL_PLANT_MT = 3.5
+CO2_PER_HOME_TONNES = 7.87
+EQUIVALENCIES_SOURCE = 'Conversion factors based on EPA Greenhouse Gas Equivalencies Calculator: 4.6 tons/vehicle, 0.06 tons/tree/year, 3.5M tons/1GW coal plant, 7.87 tons/home/year. Sources: EPA, USDA Forest Service, IEA.'
+
 def calculate_equivalencies(co2_reduced_mt):
     if co2_reduced_mt is None or co2_reduced_mt <= 0:
         return {
@@ -71,20 +156,46 @@ def calculate_equivalencies(co2_reduced_mt):
             'trees_planted_1year': 0,
             'coal_plants_closed': 0.0,
             'homes_powered_clean_1year': 0,
-            'source_context': 'Conversion factors based on EPA Greenhouse Gas Equivalencies Calculator: 4.6 tons/vehicle, 0.06 tons/tree/year, 3.5M tons/1GW coal plant, 7.87 tons/home/year. Sources: EPA, USDA Forest Service, IEA.'
+            'source_context': EQUIVALENCIES_SOURCE
         }
     
     co2_reduced_tonnes = co2_reduced_mt * 1_000_000
     
-    CO2_PER_CAR_TONNES = 4.6
-    CO2_PER_TREE_TONNES = 0.06
-    CO2_PER_COAL_PLANT_MT = 3.5
-    CO2_PER_HOME_TONNES = 7.87
-    
     return {
         'cars_off_road_1year': max(0, int(co2_reduced_tonnes / CO2_PER_CAR_TONNES)),
         'trees_planted_1year': max(0, int(co2_reduced_tonnes / CO2_PER_TREE_TONNES)),
         'coal_plants_closed': max(0.0, round(co2_reduced_mt / CO2_PER_COAL_PLANT_MT, 2)),
         'homes_powered_clean_1year': max(0, int(co2_reduced_tonnes / CO2_PER_HOME_TONNES)),
-        'source_context': 'Conversion factors based on EPA Greenhouse Gas Equivalencies Calculator: 4.6 tons/vehicle, 0.06 tons/tree/year, 3.5M tons/1GW coal plant, 7.87 tons/home/year. Sources: EPA, USDA Forest Service, IEA.'
+        'source_context': EQUIVALENCIES_SOURCE
+    }
+
+EQUIVALENCIES_DTYPE = np.dtype([
+    ('cars_off_road_1year', np.int64),
+    ('trees_planted_1year', np.int64),
+    ('coal_plants_closed', float),
+    ('homes_powered_clean_1year', np.int64),
+])
+
+def calculate_equivalencies_array(co2_reduced_mt) -> np.ndarray:
+    # calculate_equivalencies element-wise; NaN stands in for None.
+    reduced = np.asarray(co2_reduced_mt, dtype=float)
+    positive = reduced > 0
+    reduced = np.where(positive, reduced, 0.0)
+    co2_reduced_tonnes = reduced * 1_000_000
+
+    equivalencies = np.empty(reduced.shape, dtype=EQUIVALENCIES_DTYPE)
+    equivalencies['cars_off_road_1year'] = np.trunc(co2_reduced_tonnes / CO2_PER_CAR_TONNES)
+    equivalencies['trees_planted_1year'] = np.trunc(co2_reduced_tonnes / CO2_PER_TREE_TONNES)
+    equivalencies['coal_plants_closed'] = np.round(reduced / CO2_PER_COAL_PLANT_MT, 2)
+    equivalencies['homes_powered_clean_1year'] = np.trunc(co2_reduced_tonnes / CO2_PER_HOME_TONNES)
+    return equivalencies
+
+def equivalencies_record(equivalencies) -> dict:
+    # One EQUIVALENCIES_DTYPE row as the dict calculate_equivalencies returns.
+    return {
+        'cars_off_road_1year': int(equivalencies['cars_off_road_1year']),
+        'trees_planted_1year': int(equivalencies['trees_planted_1year']),
+        'coal_plants_closed': float(equivalencies['coal_plants_closed']),
+        'homes_powered_clean_1year': int(equivalencies['homes_powered_clean_1year']),
+        'source_context': EQUIVALENCIES_SOURCE
     }
@@ -1,27 +1,28 @@
 import pandas as pd
 from pathlib import Path
+from .storage import file_fingerprint
+from .runtime import active_bundle
 
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR.parent.parent / "dataset"
 
-training_data = None
-COUNTRIES_WITH_HISTORICAL_DATA = []
-
 def load_training_data():
-    global training_data, COUNTRIES_WITH_HISTORICAL_DATA
-
     clean_data = DATA_DIR / "processed" / "ecoimpact_clean_for_retraining.csv"
     if not clean_data.exists():
         raise FileNotFoundError(f"Required dataset not found: {clean_data}")
     
     training_data = pd.read_csv(clean_data)
-    COUNTRIES_WITH_HISTORICAL_DATA = training_data['Jurisdiction'].unique().tolist()
+    return {
+        'training_data': training_data,
+        'countries_with_history': frozenset(training_data['Jurisdiction'].unique().tolist()),
+        'training_data_version': file_fingerprint([clean_data]),
+    }
 
 def is_country_in_training(country):
-    return country in COUNTRIES_WITH_HISTORICAL_DATA
+    return country in active_bundle().countries_with_history
 
 def generate_success_context(country, policy_type, predicted_risk_pct, risk_category, region=None):
-    if country not in COUNTRIES_WITH_HISTORICAL_DATA:
+    if country not in active_bundle().countries_with_history:
         region_text = f"{region}" if region else "the region"
         context_message = (
             f"{country} has no historical record of implementing carbon pricing policies in our training dataset. "
@@ -65,6 +66,7 @@ def generate_success_context(country, policy_type, predicted_risk_pct, risk_cate
     }
 
 def calculate_benchmarking(user_coverage_pct, user_revenue, user_carbon_price, region):
+    training_data = active_bundle().training_data
     historical = training_data[training_data['Region'] == region]
 
     if len(historical) == 0:
@@ -116,8 +118,8 @@ def calculate_risk_adjusted_revenue(revenue_usd, abolishment_probability):
     }
 
 def generate_context(country, policy_type, carbon_price, coverage_pct, revenue, abolishment_risk, risk_category, region=None):
-    if training_data is None:
-        load_training_data()
+    bundle = active_bundle()
+    training_data = bundle.training_data
 
     success_ctx = generate_success_context(country, policy_type, abolishment_risk, risk_category, region)
 
@@ -171,7 +173,7 @@ def generate_context(country, policy_type, carbon_price, coverage_pct, revenue,
     if abolishment_risk > 50:
         key_risks.append("High political resistance to carbon pricing")
 
-    if country in COUNTRIES_WITH_HISTORICAL_DATA:
+    if country in bundle.countries_with_history:
         country_history = training_data[training_data['Jurisdiction'] == country]
         abolished_count = (country_history['Status'] == 'Abolished').sum()
         if abolished_count > 0:
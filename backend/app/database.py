@@ -78,6 +78,16 @@ def get_db():
         db.close()
 
 
+_db_initialized = False
+
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    # Once per process tree: under gunicorn the master runs it before forking
+    # (see gunicorn.conf.py) and workers inherit the flag, so they don't race
+    # each other through the migrations.
+    global _db_initialized
+    if _db_initialized:
+        return
+    from .migrations import run_migrations
+    run_migrations(engine)
+    _db_initialized = True
 
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import orjson
+from fastapi.responses import JSONResponse
+from .storage import PROJECTION_FIELDS
+
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+STREAM_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream',
+}
+
+# Datetimes come out as pydantic writes them (UTC as Z); NumPy scalars and
+# arrays are written directly.
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+class FastJSONResponse(JSONResponse):
+    # For content the app built itself and already knows to be valid:
+    # rendered once by orjson, with no response_model validation.
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+# Opt-in compact results (?compact=true): projections go out as one array
+# per field, and the long fixed texts are replaced by an index into a
+# response-level "strings" list, so a text shared by several results (the
+# EPA source note, a country's context message) is sent once.
+SHARED_STRING_FIELDS = ('equivalencies_source', 'recommendation', 'context_explanation')
+
+def compact_results(results: dict, strings: dict) -> dict:
+    # strings maps text -> index and is shared by every result in a response;
+    # list(strings) is the table to send.
+    compact = dict(results)
+    for field in SHARED_STRING_FIELDS:
+        if isinstance(compact.get(field), str):
+            compact[field] = strings.setdefault(compact[field], len(strings))
+    projections = results.get('projections') or []
+    compact['projections'] = {field: [p.get(field) for p in projections] for field in PROJECTION_FIELDS}
+    return compact
+
+def iter_events(events, format):
+    # (event, data) pairs as NDJSON lines or Server-Sent Events, one chunk
+    # per event so each is flushed as soon as it is produced.
+    for event, data in events:
+        if format == 'sse':
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode('utf-8')
+        else:
+            yield (json.dumps({"event": event, "data": data}, default=str) + '\n').encode('utf-8')
+
+def iter_ndjson(batches, columns):
+    for batch in batches:
+        lines = [json.dumps(dict(zip(columns, row)), default=str) for row in batch]
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+def iter_csv(batches, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+class _ChunkSink:
+    # Write-only file object that hands each written chunk back to the
+    # generator instead of accumulating the whole file.
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def _arrow_type(pa, alias):
+    if alias == 'timestamp':
+        return pa.timestamp('us', tz='UTC')
+    return pa.type_for_alias(alias)
+
+def iter_parquet(batches, columns, column_types):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, _arrow_type(pa, column_types[name])) for name in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    try:
+        for batch in batches:
+            values = list(zip(*batch)) if batch else [[] for _ in columns]
+            table = pa.Table.from_arrays(
+                [pa.array(list(col), type=schema.field(i).type) for i, col in enumerate(values)],
+                schema=schema
+            )
+            writer.write_table(table)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    data = sink.drain()
+    if data:
+        yield data
@@ -0,0 +1,31 @@
+import hashlib
+import os
+from fastapi import Request, Response
+
+# Reference data only changes when a reload swaps the datasets, so browsers
+# may reuse it for REFERENCE_MAX_AGE seconds before revalidating. History is
+# per user and changes with every save, so it is revalidated on each load.
+REFERENCE_MAX_AGE = int(os.getenv("REFERENCE_MAX_AGE", "300"))
+REFERENCE_CACHE_CONTROL = f"public, max-age={REFERENCE_MAX_AGE}"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+def make_etag(*parts) -> str:
+    # Weak, so it stays valid when a response is compressed in transit.
+    digest = hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires.
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque for tag in header.split(','))
+
+def cache_headers(etag: str, cache_control: str) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
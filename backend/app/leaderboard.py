@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import numpy as np
+from pydantic import ValidationError
+from .schemas import PredictionRequest
+from .projections import build_projection_grid, evaluate_grid, clamp_revenue_paths
+from .calculations import co2_reduced_array
+from .predict import risk_category_for_probability
+from .services import get_available_countries, get_countries_features, co2_entity_ids, co2_totals
+from .runtime import RuntimeBundle, active_bundle, use_bundle
+
+# Reference scenarios ranked for every available country. Override with a
+# JSON list of objects in LEADERBOARD_SCENARIOS, each with an id plus
+# PredictionRequest fields other than country.
+DEFAULT_LEADERBOARD_SCENARIOS = [
+    {"id": "tax-50-50", "policy_type": "Carbon tax", "carbon_price_usd": 50, "coverage_percent": 50, "year": 2025, "projection_years": 10},
+    {"id": "ets-50-50", "policy_type": "ETS", "carbon_price_usd": 50, "coverage_percent": 50, "year": 2025, "projection_years": 10},
+    {"id": "tax-100-70", "policy_type": "Carbon tax", "carbon_price_usd": 100, "coverage_percent": 70, "year": 2025, "projection_years": 10},
+]
+LEADERBOARD_SCENARIOS = json.loads(os.getenv("LEADERBOARD_SCENARIOS") or "null") or DEFAULT_LEADERBOARD_SCENARIOS
+
+LEADERBOARD_METRICS = (
+    "revenue_million", "risk_adjusted_value_million", "cumulative_revenue_million",
+    "co2_reduced_mt", "co2_reduced_cumulative_mt",
+)
+
+# Tables for the current and previous bundle, so requests still pinned to
+# the old bundle during a reload don't trigger a rebuild.
+KEEP_VERSIONS = 2
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+def _scenario_rows(scenario: dict, countries, features: dict) -> list:
+    # The headline numbers /predict/all reports for one scenario in every
+    # country, from one pass through each model.
+    params = {k: v for k, v in scenario.items() if k != "id"}
+    requests = [PredictionRequest(country=c, **params) for c in countries]
+    grid = build_projection_grid(requests, [features[c] for c in countries])
+    revenue, abolishment_prob, has_history = evaluate_grid(grid)
+    n = grid['n_years'][0]
+    revenue = clamp_revenue_paths(revenue.reshape(len(countries), n))
+    abolishment_prob = abolishment_prob.reshape(len(countries), n)[:, 0]
+    has_history = has_history.reshape(len(countries), n)[:, 0]
+
+    total_co2 = co2_totals(co2_entity_ids(countries)[:, None], requests[0].year + np.arange(n)[None, :])
+    co2_reduced = co2_reduced_array(requests[0].coverage_percent, total_co2, grid['carbon_price_usd'].reshape(len(countries), n))
+    co2_reduced = np.where(total_co2 > 0, co2_reduced, 0.0)
+
+    rows = []
+    for i, country in enumerate(countries):
+        predicted_revenue = float(revenue[i, 0])
+        risk_category = risk_category_for_probability(abolishment_prob[i])[0] if has_history[i] else "At Risk"
+        abolishment_risk = float(abolishment_prob[i]) * 100
+        if risk_category == "Low Risk":
+            risk_adjusted_value = predicted_revenue
+        else:
+            risk_adjusted_value = max(0.0, predicted_revenue * (1 - abolishment_risk / 100))
+        annual_reduced = [max(0.0, round(float(v), 3)) for v in co2_reduced[i]]
+        rows.append({
+            "country": country,
+            "region": features[country]['region'],
+            "revenue_million": round(predicted_revenue, 2),
+            "risk_adjusted_value_million": max(0.0, round(risk_adjusted_value, 2)),
+            "cumulative_revenue_million": max(0.0, round(float(np.cumsum(revenue[i])[-1]), 2)),
+            "co2_reduced_mt": annual_reduced[0],
+            "co2_reduced_cumulative_mt": max(0.0, round(sum(annual_reduced), 3)),
+            "abolishment_risk_percent": round(abolishment_risk, 1),
+            "risk_category": risk_category,
+        })
+    return rows
+
+def validate_scenarios(scenarios) -> list:
+    # ValueError naming the first bad entry, so a malformed override fails
+    # at startup instead of as a 500 on the first /leaderboard request.
+    if not isinstance(scenarios, list):
+        raise ValueError("LEADERBOARD_SCENARIOS must be a JSON list of objects")
+    ids = set()
+    for i, scenario in enumerate(scenarios):
+        if not isinstance(scenario, dict) or not isinstance(scenario.get("id"), str) or not scenario["id"]:
+            raise ValueError(f"LEADERBOARD_SCENARIOS[{i}] needs a non-empty string id")
+        if scenario["id"] in ids:
+            raise ValueError(f"LEADERBOARD_SCENARIOS[{i}] repeats id {scenario['id']!r}")
+        ids.add(scenario["id"])
+        params = {k: v for k, v in scenario.items() if k != "id"}
+        if "country" in params:
+            raise ValueError(f"LEADERBOARD_SCENARIOS[{i}] must not set country")
+        try:
+            PredictionRequest(country="", **params)
+        except ValidationError as e:
+            raise ValueError(f"LEADERBOARD_SCENARIOS[{i}] is not a valid scenario: {e}") from e
+    return scenarios
+
+def build_leaderboard(bundle: RuntimeBundle) -> dict:
+    # Every row, pre-sorted once per metric; serving a page is a list slice.
+    with use_bundle(bundle):
+        available = get_available_countries()
+        table = {"version": bundle.version, "scenarios": {}}
+        for scenario in LEADERBOARD_SCENARIOS:
+            features, _ = get_countries_features(available, scenario.get("year", 2025))
+            countries = [c for c in available if c in features]
+            rows = _scenario_rows(scenario, countries, features)
+            table["scenarios"][scenario["id"]] = {
+                "scenario": scenario,
+                "rankings": {
+                    metric: sorted(rows, key=lambda row: (-row[metric], row["country"]))
+                    for metric in LEADERBOARD_METRICS
+                },
+            }
+    return table
+
+def materialize_leaderboard(bundle: RuntimeBundle = None) -> dict:
+    bundle = bundle or active_bundle()
+    with _tables_lock:
+        table = _tables.get(bundle.version)
+        if table is None:
+            validate_scenarios(LEADERBOARD_SCENARIOS)
+            table = build_leaderboard(bundle)
+            _tables[bundle.version] = table
+            for version in list(_tables)[:-KEEP_VERSIONS]:
+                del _tables[version]
+    return table
+
+def get_leaderboard() -> dict:
+    table = _tables.get(active_bundle().version)
+    return table if table is not None else materialize_leaderboard()
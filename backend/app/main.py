@@ -1,13 +1,29 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
-from .schemas import PredictionRequest, PredictionResponse
-from .predict import load_models, predict_revenue, predict_success
-from .calculations import calculate_co2_impact, calculate_equivalencies
-from .context import generate_context, load_training_data
-from .services import load_all_data, get_country_features, get_available_countries, get_country_total_co2
+import asyncio
+import json
+import os
+from typing import List, Optional
+from .schemas import PredictionRequest, PredictionResponse, UncertaintyRequest, UncertaintyResponse, SolveRequest, SolveResponse
+from .schemas import AggregateRequest, AggregateResponse, BatchPredictionRequest
+from .projections import run_predictions, run_prediction_results, run_uncertainty, aggregate_totals, iter_prediction_events
+from .exporters import iter_events, STREAM_MEDIA_TYPES, FastJSONResponse
+from .solver import solve_policy
+from .runtime import active_bundle, PinRuntimeBundleMiddleware
+from .compression import CompressionMiddleware
+from .services import get_country_features, get_countries_features, countries_with_co2_data, get_available_countries, get_country_total_co2, SERIES_METRICS, DATASET_MIN_YEAR
+from .mappings import get_bloc_members
 from .auth_routes import router as auth_router
 from .simulation_routes import router as simulation_router
+from .admin_routes import router as admin_router
+from .recompute import start_recompute, stop_recompute
+from .leaderboard import materialize_leaderboard, get_leaderboard, LEADERBOARD_METRICS
+from .tuning import open_session, apply_update, TUNE_DEBOUNCE_SECONDS
+from .series import country_series, MAX_SERIES_COUNTRIES
+from .http_cache import make_etag, etag_matches, cache_headers, not_modified, REFERENCE_CACHE_CONTROL
 from .database import init_db
 from .models import Comparison  
 
@@ -19,10 +35,13 @@ async def lifespan(app: FastAPI):
         print(f"Database initialization warning: {e}")
         print("Make sure DATABASE_URL is set in .env file")
     
-    load_models()
-    load_all_data()
-    load_training_data()
+    # Reuses the bundle gunicorn loaded before forking (see gunicorn.conf.py)
+    active_bundle()
+    materialize_leaderboard()
+    if os.getenv("RECOMPUTE_ON_STARTUP", "true").lower() == "true":
+        start_recompute()
     yield
+    stop_recompute()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -33,6 +52,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(PinRuntimeBundleMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -110,6 +131,7 @@ async def global_exception_handler(request, exc):
 
 app.include_router(auth_router)
 app.include_router(simulation_router)
+app.include_router(admin_router)
 
 @app.get("/")
 def read_root():
@@ -132,260 +154,341 @@ def predict_all(request: PredictionRequest):
         except ValueError as e:
             raise HTTPException(400, f"Country data not available: {str(e)}")
 
-        region = country_features['region']
-        income_group = country_features['income_group']
-        fossil_fuel_pct = country_features['fossil_fuel_pct']
-        population = country_features['population']
-        gdp = country_features['gdp']
-
-        predicted_revenue = predict_revenue(
-            request.country,
-            request.policy_type,
-            request.carbon_price_usd,
-            request.coverage_percent,
-            request.year,
-            fossil_fuel_pct,
-            population,
-            gdp
-        )
-
-        co2_impact = calculate_co2_impact(
-            request.coverage_percent,
-            request.country,
-            request.year,
-            request.carbon_price_usd
-        )
-
-        if co2_impact is None:
-            co2_impact = {
-                'total_country_co2_mt': 0.0,
-                'co2_covered_mt': 0.0,
-                'co2_covered_percent': request.coverage_percent,
-                'co2_uncovered_mt': 0.0,
-                'co2_uncovered_percent': 100 - request.coverage_percent,
-                'co2_potentially_reduced_mt': 0.0,
-                'co2_covered_per_capita_tonnes': 0.0,
-                'reduction_rate_used': 0.0,
-                'carbon_price_usd': request.carbon_price_usd,
-                'disclaimer': f'CO2 emissions data not available for {request.country}. Revenue and risk predictions are still provided.'
-            }
-        
-        equivalencies = calculate_equivalencies(co2_impact['co2_potentially_reduced_mt'])
-
-        abolishment_risk, risk_category, confidence = predict_success(
-            request.country,
-            request.policy_type,
-            request.coverage_percent,
-            request.year,
-            fossil_fuel_pct,
-            gdp
-        )
-
-        if risk_category == "Low Risk":
-            risk_adjusted_value = predicted_revenue
-        else:
-            success_probability = 1 - (abolishment_risk / 100)
-            risk_adjusted_value = max(0.0, predicted_revenue * success_probability)
-        
-        risk_adjusted_value = max(0.0, risk_adjusted_value) if risk_adjusted_value is not None else 0.0
-
-        context = generate_context(
-            request.country,
-            request.policy_type,
-            request.carbon_price_usd,
-            request.coverage_percent,
-            predicted_revenue,
-            abolishment_risk,
-            risk_category,
-            region
-        )
-        
-        if not context.get('recommendation') or not isinstance(context['recommendation'], str):
-            context['recommendation'] = 'Policy assessment available.'
-        if not context.get('similar_policies') or not isinstance(context['similar_policies'], list) or len(context['similar_policies']) == 0:
-            context['similar_policies'] = ['Historical policy data analysis available.']
-        if not context.get('key_risks') or not isinstance(context['key_risks'], list) or len(context['key_risks']) == 0:
-            context['key_risks'] = ['Standard implementation considerations apply.']
-        if not context.get('success_context') or not context['success_context'].get('context_message') or not isinstance(context['success_context']['context_message'], str):
-            context['success_context'] = {
-                'context_message': f'Risk assessment for {request.country} based on regional patterns and economic factors.',
-                'recommendation': context.get('recommendation', 'Policy assessment available.'),
-                'has_historical_data': False,
-                'confidence': 'Medium'
-            }
+        # Built by the pipeline in response-model shape, so it is written
+        # out directly instead of being validated again.
+        # results_version is stamped from the bundle pinned for this request,
+        # so a save of this response records the version it came from.
+        return FastJSONResponse({
+            **run_prediction_results([request], [country_features])[0],
+            'results_version': active_bundle().version
+        })
 
-        projections = []
-        cumulative_co2_reduced = 0.0
-        cumulative_revenue = 0.0
-        base_year_co2 = co2_impact['total_country_co2_mt'] if co2_impact else 0.0
-        
-        projection_years = max(1, min(20, request.projection_years))
-        previous_revenue = predicted_revenue
-        
-        gdp_growth_rate = 0.03
-        population_growth_rate = 0.01
-        fossil_fuel_decline_rate = 0.005
-        min_revenue_growth_rate = 0.015
-        
-        for year_offset in range(projection_years):
-            future_year = request.year + year_offset
-
-            if year_offset == 0:
-                future_features = country_features
-            else:
-                future_features = {
-                    'fossil_fuel_pct': max(0, country_features['fossil_fuel_pct'] - (fossil_fuel_decline_rate * year_offset * 100)),
-                    'population': country_features['population'] * ((1 + population_growth_rate) ** year_offset),
-                    'gdp': country_features['gdp'] * ((1 + gdp_growth_rate) ** year_offset),
-                    'region': country_features['region'],
-                    'income_group': country_features['income_group']
-                }
-
-            carbon_price = request.carbon_price_usd
-
-            if year_offset == 0:
-                future_revenue = predicted_revenue
-            else:
-                future_revenue = predict_revenue(
-                    request.country,
-                    request.policy_type,
-                    carbon_price,
-                    request.coverage_percent,
-                    future_year,
-                    future_features['fossil_fuel_pct'],
-                    future_features['population'],
-                    future_features['gdp']
-                )
-                
-                if future_revenue <= 0:
-                    from .predict import calculate_revenue_formula
-                    future_revenue = calculate_revenue_formula(carbon_price, request.coverage_percent, request.country, future_year)
-                
-                min_expected_revenue = previous_revenue * (1 + min_revenue_growth_rate)
-                if future_revenue < min_expected_revenue:
-                    future_revenue = min_expected_revenue
-                
-                max_reasonable_multiplier = 3.0
-                if future_revenue > previous_revenue * max_reasonable_multiplier:
-                    future_revenue = previous_revenue * max_reasonable_multiplier
-            
-            previous_revenue = future_revenue
-
-            future_co2 = calculate_co2_impact(
-                request.coverage_percent,
-                request.country,
-                future_year,
-                carbon_price
-            )
-            
-            if future_co2 is None:
-                future_co2 = {
-                    'total_country_co2_mt': 0.0,
-                    'co2_covered_mt': 0.0,
-                    'co2_potentially_reduced_mt': 0.0,
-                    'co2_covered_per_capita_tonnes': 0.0
-                }
-
-            future_abolishment, _, _ = predict_success(
-                request.country,
-                request.policy_type,
-                request.coverage_percent,
-                future_year,
-                future_features['fossil_fuel_pct'],
-                future_features['gdp']
-            )
-
-            risk_escalation_rate = 0.005
-            time_escalated_risk = min(100.0, future_abolishment + (risk_escalation_rate * 100 * year_offset))
-
-            if time_escalated_risk < 35:
-                escalated_risk_category = "Low Risk"
-            elif time_escalated_risk > 65:
-                escalated_risk_category = "High Risk"
-            else:
-                escalated_risk_category = "At Risk"
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, f"Prediction error: {str(e)}")
+
+# Batch streams evaluate this many requests per model call.
+STREAM_CHUNK_SIZE = 16
 
-            if escalated_risk_category == "Low Risk":
-                future_risk_adjusted_value = future_revenue
+def _event_stream(events, format: str):
+    def guarded():
+        try:
+            yield from events
+        except Exception as e:
+            yield "error", {"message": f"Prediction error: {str(e)}"}
+        yield "end", {}
+
+    return StreamingResponse(
+        iter_events(guarded(), format),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _check_stream_format(format: str):
+    if format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(400, f"Format must be one of: {', '.join(STREAM_MEDIA_TYPES)}")
+
+@app.post("/predict/stream")
+def predict_stream(request: PredictionRequest, format: str = "ndjson"):
+    # /predict/all as a stream: a headline event, one projection event per
+    # year, a details event with context and equivalencies, then end.
+    _check_stream_format(format)
+    if request.carbon_price_usd <= 0:
+        raise HTTPException(400, "Carbon price must be positive")
+    if not (10 <= request.coverage_percent <= 90):
+        raise HTTPException(400, "Coverage must be between 10-90%")
+
+    try:
+        country_features = get_country_features(request.country, request.year)
+    except ValueError as e:
+        raise HTTPException(400, f"Country data not available: {str(e)}")
+
+    return _event_stream(iter_prediction_events(request, country_features), format)
+
+def _batch_events(requests):
+    feature_cache = {}
+    # Countries without CO2 data would fail the whole chunk's batched call,
+    # so they become per-item errors up front, as on /predict/aggregate.
+    with_co2 = countries_with_co2_data({r.country for r in requests})
+    for start in range(0, len(requests), STREAM_CHUNK_SIZE):
+        valid, features, indexes = [], [], []
+        for index in range(start, min(start + STREAM_CHUNK_SIZE, len(requests))):
+            request = requests[index]
+            key = (request.country, request.year)
+            try:
+                if key not in feature_cache:
+                    feature_cache[key] = get_country_features(request.country, request.year)
+            except ValueError as e:
+                yield "error", {"index": index, "message": f"Country data not available: {str(e)}"}
+                continue
+            if request.country not in with_co2:
+                yield "error", {"index": index, "message": f"Country data not available: CO2 data not found for {request.country}"}
+                continue
+            valid.append(request)
+            features.append(feature_cache[key])
+            indexes.append(index)
+
+        for index, result in zip(indexes, run_prediction_results(valid, features)):
+            yield "result", {"index": index, "prediction": result}
+
+@app.post("/predict/stream/batch")
+def predict_stream_batch(body: BatchPredictionRequest, format: str = "ndjson"):
+    # One result or error event per request, tagged with its index and
+    # evaluated STREAM_CHUNK_SIZE requests per model call.
+    _check_stream_format(format)
+    return _event_stream(_batch_events(body.requests), format)
+
+@app.websocket("/ws/tune")
+async def tune_policy(websocket: WebSocket):
+    # Live what-if session. The client sends {"type": "init", "params": {...}}
+    # with a full PredictionRequest, then {"type": "update", "params": {...}}
+    # deltas, each with an optional "seq". Updates arriving while one is
+    # evaluated are merged and only the latest values are evaluated; the
+    # reply carries the seq of the last update applied and only the fields
+    # that changed.
+    await websocket.accept()
+    session = None
+    # Bumped by every init; an evaluation started under an older session is
+    # dropped rather than sent as a diff against the new one.
+    generation = 0
+    pending = {}
+    latest_seq = None
+    received = asyncio.Event()
+
+    def error_message(e):
+        if isinstance(e, ValidationError):
+            return "; ".join(f"{'.'.join(str(l) for l in err['loc'])}: {err['msg']}" for err in e.errors())
+        return f"Country data not available: {str(e)}" if isinstance(e, ValueError) else f"Prediction error: {str(e)}"
+
+    async def receive_message():
+        frame = await websocket.receive()
+        if frame["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(frame.get("code", 1000))
+        try:
+            return json.loads(frame.get("text") or frame.get("bytes") or "")
+        except ValueError:
+            await websocket.send_json({"type": "error", "seq": None, "message": "Messages must be JSON"})
+            return None
+
+    async def receive():
+        nonlocal session, generation, pending, latest_seq
+        while True:
+            message = await receive_message()
+            if not isinstance(message, dict) or not isinstance(message.get("params"), dict):
+                if message is not None:
+                    await websocket.send_json({"type": "error", "seq": None, "message": "Messages need a params object"})
+                continue
+            if message.get("type") == "init":
+                generation += 1
+                pending = {}
+                latest_seq = None
+                received.clear()
+                try:
+                    session = await run_in_threadpool(open_session, message["params"])
+                    await websocket.send_json({"type": "result", "seq": message.get("seq"), "full": True, "data": session["result"]})
+                except Exception as e:
+                    await websocket.send_json({"type": "error", "seq": message.get("seq"), "message": error_message(e)})
+            elif session is None:
+                await websocket.send_json({"type": "error", "seq": message.get("seq"), "message": "Send an init message first"})
             else:
-                success_probability = 1 - (time_escalated_risk / 100)
-                future_risk_adjusted_value = max(0.0, future_revenue * success_probability)
-
-            annual_co2_reduced = round(future_co2['co2_potentially_reduced_mt'], 3) if future_co2 else 0
-            annual_co2_reduced = max(0.0, annual_co2_reduced)
-            cumulative_co2_reduced += annual_co2_reduced
-            cumulative_revenue += future_revenue
-            
-            future_total_co2 = future_co2['total_country_co2_mt'] if future_co2 else base_year_co2
-            future_total_co2 = max(0.0, future_total_co2)
-            co2_after_reduction = max(0.0, future_total_co2 - annual_co2_reduced)
-            co2_reduced_from_base = max(0.0, cumulative_co2_reduced)
-
-            projection_entry = {
-                'year': int(future_year),
-                'revenue_million': max(0.0, round(future_revenue, 2)),
-                'co2_reduced_mt': max(0.0, annual_co2_reduced),
-                'co2_reduced_cumulative_mt': max(0.0, round(cumulative_co2_reduced, 3)),
-                'co2_after_reduction_mt': max(0.0, round(co2_after_reduction, 2)),
-                'co2_reduced_from_base_mt': max(0.0, round(co2_reduced_from_base, 3)),
-                'abolishment_risk_percent': max(0.0, min(100.0, round(time_escalated_risk, 1))),
-                'risk_category': str(escalated_risk_category) if escalated_risk_category else "At Risk",
-                'risk_adjusted_value_million': max(0.0, round(future_risk_adjusted_value, 2)),
-                'cumulative_revenue_million': max(0.0, round(cumulative_revenue, 2))
-            }
-            projections.append(projection_entry)
-
-        return PredictionResponse(
-            revenue_million=round(predicted_revenue, 2),
-            abolishment_risk_percent=round(abolishment_risk, 1),
-            risk_category=risk_category,
-            total_country_co2_mt=co2_impact['total_country_co2_mt'],
-            co2_covered_mt=co2_impact['co2_covered_mt'],
-            co2_reduced_mt=co2_impact['co2_potentially_reduced_mt'],
-            co2_covered_per_capita_tonnes=co2_impact['co2_covered_per_capita_tonnes'],
-            cars_off_road_equivalent=equivalencies['cars_off_road_1year'],
-            trees_planted_equivalent=equivalencies['trees_planted_1year'],
-            coal_plants_closed_equivalent=equivalencies['coal_plants_closed'],
-            homes_powered_equivalent=equivalencies['homes_powered_clean_1year'],
-            equivalencies_source=equivalencies['source_context'],
-            risk_adjusted_value_million=max(0.0, round(risk_adjusted_value, 2)) if risk_adjusted_value is not None else 0.0,
-            recommendation=context.get('recommendation', 'Policy assessment available.'),
-            similar_policies=context.get('similar_policies', ['Historical policy data analysis available.']),
-            key_risks=context.get('key_risks', ['Standard implementation considerations apply.']),
-            context_explanation=context.get('success_context', {}).get('context_message', f'Risk assessment for {request.country} based on regional patterns and economic factors.'),
-            projections=projections if isinstance(projections, list) else []
-        )
+                pending.update(message["params"])
+                latest_seq = message.get("seq")
+                received.set()
+
+    async def evaluate():
+        nonlocal pending
+        while True:
+            await received.wait()
+            await asyncio.sleep(TUNE_DEBOUNCE_SECONDS)
+            received.clear()
+            delta, seq, current, started = pending, latest_seq, session, generation
+            pending = {}
+            if current is None or not delta:
+                continue
+            try:
+                changed = await run_in_threadpool(apply_update, current, delta)
+            except Exception as e:
+                if started == generation:
+                    await websocket.send_json({"type": "error", "seq": seq, "message": error_message(e)})
+                continue
+            if started == generation:
+                await websocket.send_json({"type": "result", "seq": seq, "full": False, "changed": changed})
+
+    def evaluate_done(task):
+        if not task.cancelled() and not isinstance(task.exception(), (type(None), WebSocketDisconnect)):
+            logger.error("Tuning session evaluation stopped", exc_info=task.exception())
+
+    worker = asyncio.create_task(evaluate())
+    worker.add_done_callback(evaluate_done)
+    try:
+        await receive()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        worker.cancel()
+
+@app.post("/predict/uncertainty", response_model=UncertaintyResponse)
+def predict_uncertainty(request: UncertaintyRequest):
+    try:
+        if request.carbon_price_usd <= 0:
+            raise HTTPException(400, "Carbon price must be positive")
+        if not (10 <= request.coverage_percent <= 90):
+            raise HTTPException(400, "Coverage must be between 10-90%")
+
+        try:
+            country_features = get_country_features(request.country, request.year)
+        except ValueError as e:
+            raise HTTPException(400, f"Country data not available: {str(e)}")
+
+        return {
+            "samples": request.samples,
+            "seed": request.seed,
+            "projections": run_uncertainty(request, country_features, request.samples, request.seed)
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, f"Prediction error: {str(e)}")
+
+@app.post("/predict/solve", response_model=SolveResponse)
+def predict_solve(request: SolveRequest):
+    try:
+        if request.price_min_usd >= request.price_max_usd:
+            raise HTTPException(400, "Minimum carbon price must be below the maximum")
+        if request.coverage_min_percent > request.coverage_max_percent:
+            raise HTTPException(400, "Minimum coverage must not exceed the maximum")
+
+        try:
+            country_features = get_country_features(request.country, request.year)
+            return solve_policy(request, country_features)
+        except ValueError as e:
+            raise HTTPException(400, f"Country data not available: {str(e)}")
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(500, f"Prediction error: {str(e)}")
 
+@app.post("/predict/aggregate", response_model=AggregateResponse)
+def predict_aggregate(request: AggregateRequest):
+    try:
+        if not (10 <= request.coverage_percent <= 90):
+            raise HTTPException(400, "Coverage must be between 10-90%")
+
+        members = list(request.countries)
+        if request.bloc:
+            bloc_members = get_bloc_members(request.bloc)
+            if bloc_members is None:
+                raise HTTPException(400, f"Unknown bloc: {request.bloc}")
+            members = bloc_members + members
+        members = list(dict.fromkeys(members))
+        if not members:
+            raise HTTPException(400, "Provide a bloc or at least one country")
+
+        # One pass over each dataset for every member, then a single batched
+        # projection for all of them.
+        features, errors = get_countries_features(members, request.year)
+        with_co2 = countries_with_co2_data(features)
+        for country in features:
+            if country not in with_co2:
+                errors[country] = f"CO2 data not found for {country}"
+        included = [c for c in members if c in features and c not in errors]
+        if not included:
+            raise HTTPException(400, "Country data not available for any member")
+
+        common = request.dict(exclude={'countries', 'bloc'})
+        requests = [PredictionRequest(country=country, **common) for country in included]
+        responses = run_predictions(requests, [features[c] for c in included])
+
+        return {
+            "members": [{"country": c, "prediction": r} for c, r in zip(included, responses)],
+            "skipped": [{"country": c, "reason": errors[c]} for c in members if c in errors],
+            "totals": aggregate_totals(responses)
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, f"Prediction error: {str(e)}")
+
+@app.get("/leaderboard/scenarios")
+def get_leaderboard_scenarios():
+    table = get_leaderboard()
+    return {
+        "scenarios": [entry["scenario"] for entry in table["scenarios"].values()],
+        "metrics": list(LEADERBOARD_METRICS)
+    }
+
+@app.get("/leaderboard")
+def get_leaderboard_page(
+    scenario: str = None,
+    sort: str = "revenue_million",
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200)
+):
+    table = get_leaderboard()
+    if not table["scenarios"]:
+        raise HTTPException(404, "No leaderboard scenarios are configured")
+    scenario = scenario or next(iter(table["scenarios"]))
+    if scenario not in table["scenarios"]:
+        raise HTTPException(400, f"Unknown scenario: {scenario}")
+    if sort not in LEADERBOARD_METRICS:
+        raise HTTPException(400, f"Sort must be one of: {', '.join(LEADERBOARD_METRICS)}")
+
+    ranking = table["scenarios"][scenario]["rankings"][sort]
+    return {
+        "scenario": table["scenarios"][scenario]["scenario"],
+        "sort": sort,
+        "version": table["version"],
+        "total": len(ranking),
+        "offset": offset,
+        "limit": limit,
+        "entries": [
+            {"rank": offset + i + 1, **row} for i, row in enumerate(ranking[offset:offset + limit])
+        ]
+    }
+
+# Reference endpoints are tagged with the dataset version, so a repeat
+# request with a matching If-None-Match gets a 304 without any lookups.
+
 @app.get("/countries")
-def get_countries():
+def get_countries(request: Request):
+    etag = make_etag("countries", active_bundle().data_version)
+    if etag_matches(request, etag):
+        return not_modified(etag, REFERENCE_CACHE_CONTROL)
     countries = get_available_countries()
-    return {
+    return FastJSONResponse({
         "countries": countries,
         "count": len(countries)
-    }
+    }, headers=cache_headers(etag, REFERENCE_CACHE_CONTROL))
 
 @app.get("/policy-types")
-def get_policy_types():
-    return {
+def get_policy_types(request: Request):
+    etag = make_etag("policy-types", active_bundle().data_version)
+    if etag_matches(request, etag):
+        return not_modified(etag, REFERENCE_CACHE_CONTROL)
+    return FastJSONResponse({
         "policy_types": ["Carbon tax", "ETS"],
         "descriptions": {
             "Carbon tax": "Direct tax on carbon emissions ($/tonne CO2)",
             "ETS": "Emissions Trading System (cap-and-trade)"
         }
-    }
+    }, headers=cache_headers(etag, REFERENCE_CACHE_CONTROL))
 
 @app.get("/country-info/{country}")
-def get_country_info(country: str, year: int = 2024):
+def get_country_info(request: Request, country: str, year: int = 2024):
+    if year < DATASET_MIN_YEAR:
+        raise HTTPException(400, f"Data before {DATASET_MIN_YEAR} is not loaded (DATASET_MIN_YEAR)")
+    etag = make_etag("country-info", active_bundle().data_version, country, year)
+    if etag_matches(request, etag):
+        return not_modified(etag, REFERENCE_CACHE_CONTROL)
     try:
         features = get_country_features(country, year)
         co2 = get_country_total_co2(country, year)
 
-        return {
+        return FastJSONResponse({
             "country": country,
             "year": year,
             "region": features['region'],
@@ -397,6 +500,55 @@ def get_country_info(country: str, year: int = 2024):
             "fossil_fuel_pct": round(features['fossil_fuel_pct'], 1),
             "total_co2_mt": round(co2, 1),
             "co2_per_capita_tonnes": round((co2 * 1_000_000) / features['population'], 2)
-        }
+        }, headers=cache_headers(etag, REFERENCE_CACHE_CONTROL))
     except ValueError as e:
         raise HTTPException(404, f"Country data not found: {str(e)}")
+
+def _check_series_params(countries, start, end, by):
+    if not countries:
+        raise HTTPException(400, "Provide at least one country")
+    if len(countries) > MAX_SERIES_COUNTRIES:
+        raise HTTPException(400, f"At most {MAX_SERIES_COUNTRIES} countries per request")
+    if start is not None and end is not None and start > end:
+        raise HTTPException(400, "start must not be after end")
+    if by not in SERIES_METRICS:
+        raise HTTPException(400, f"by must be one of: {', '.join(SERIES_METRICS)}")
+
+@app.get("/country-series")
+def get_countries_series(
+    request: Request,
+    country: List[str] = Query(default=[]),
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    points: Optional[int] = Query(None, ge=3, le=1000),
+    by: str = "co2_mt"
+):
+    # Observed yearly values as column arrays per country; with points set,
+    # each country is downsampled (LTTB on the `by` metric) for charting.
+    _check_series_params(country, start, end, by)
+    etag = make_etag("country-series", active_bundle().data_version, country, start, end, points, by)
+    if etag_matches(request, etag):
+        return not_modified(etag, REFERENCE_CACHE_CONTROL)
+    series, skipped = country_series(country, start, end, points, by)
+    return FastJSONResponse(
+        {"series": series, "skipped": skipped},
+        headers=cache_headers(etag, REFERENCE_CACHE_CONTROL)
+    )
+
+@app.get("/country-series/{country}")
+def get_country_series(
+    request: Request,
+    country: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    points: Optional[int] = Query(None, ge=3, le=1000),
+    by: str = "co2_mt"
+):
+    _check_series_params([country], start, end, by)
+    etag = make_etag("country-series", active_bundle().data_version, [country], start, end, points, by)
+    if etag_matches(request, etag):
+        return not_modified(etag, REFERENCE_CACHE_CONTROL)
+    series, skipped = country_series([country], start, end, points, by)
+    if skipped:
+        raise HTTPException(404, f"Country data not found: {skipped[0]['reason']}")
+    return FastJSONResponse(series[0], headers=cache_headers(etag, REFERENCE_CACHE_CONTROL))
@@ -79,6 +79,24 @@ INCOME_LEVELS = {
     ]
 }
 
+EU27_COUNTRIES = [
+    'Austria', 'Belgium', 'Bulgaria', 'Croatia', 'Cyprus', 'Czechia', 'Denmark',
+    'Estonia', 'Finland', 'France', 'Germany', 'Greece', 'Hungary', 'Ireland',
+    'Italy', 'Latvia', 'Lithuania', 'Luxembourg', 'Malta', 'Netherlands', 'Poland',
+    'Portugal', 'Romania', 'Slovakia', 'Slovenia', 'Spain', 'Sweden'
+]
+
+# Named groups accepted wherever a list of countries is; EU27+ adds the EEA
+# states in the EU ETS.
+BLOCS = {
+    'EU': EU27_COUNTRIES,
+    'EU27': EU27_COUNTRIES,
+    'EU27+': EU27_COUNTRIES + ['Iceland', 'Liechtenstein', 'Norway'],
+}
+
+def get_bloc_members(bloc):
+    return BLOCS.get(bloc)
+
 def get_region_for_ml(region, income_group):
     training_regions = [
         'Europe & Central Asia',
@@ -0,0 +1,64 @@
+import os
+import threading
+from collections import OrderedDict
+from .runtime import active_bundle
+
+# Intermediate pipeline results, memoized per stage so a changed input only
+# recomputes the stages that depend on it. Keys include the bundle version,
+# so a reload never serves results from the previous models or datasets.
+STAGE_CACHE_SIZE = int(os.getenv("STAGE_CACHE_SIZE", "50000"))
+STAGES = ("country_features", "success", "revenue")
+
+stage_stats = {stage: {"hits": 0, "misses": 0} for stage in STAGES}
+_caches = {stage: OrderedDict() for stage in STAGES}
+_lock = threading.Lock()
+
+def lookup(stage: str, keys: list):
+    # Returns (versioned keys, values with None for misses, miss positions).
+    version = active_bundle().version
+    keys = [(version, *key) for key in keys]
+    cache = _caches[stage]
+    values = []
+    missing = []
+    with _lock:
+        for i, key in enumerate(keys):
+            value = cache.get(key)
+            if value is None:
+                missing.append(i)
+            else:
+                cache.move_to_end(key)
+            values.append(value)
+        stage_stats[stage]["hits"] += len(keys) - len(missing)
+        stage_stats[stage]["misses"] += len(missing)
+    return keys, values, missing
+
+def store(stage: str, keys: list, values: list):
+    # keys are the versioned keys returned by lookup.
+    cache = _caches[stage]
+    with _lock:
+        for key, value in zip(keys, values):
+            cache[key] = value
+            cache.move_to_end(key)
+        while len(cache) > STAGE_CACHE_SIZE:
+            cache.popitem(last=False)
+
+def memoize(stage: str, key: tuple, compute):
+    keys, values, missing = lookup(stage, [key])
+    if not missing:
+        return values[0]
+    value = compute()
+    store(stage, keys, [value])
+    return value
+
+def cache_stats() -> dict:
+    with _lock:
+        return {
+            stage: {**stage_stats[stage], "entries": len(_caches[stage])}
+            for stage in STAGES
+        }
+
+def clear_caches():
+    with _lock:
+        for stage in STAGES:
+            _caches[stage].clear()
+            stage_stats[stage].update(hits=0, misses=0)
@@ -0,0 +1,133 @@
+from sqlalchemy import delete, inspect, insert, select, text, update
+from sqlalchemy.schema import CreateIndex
+
+BACKFILL_BATCH_SIZE = 500
+
+# Postgres advisory lock key held for each migration transaction, so
+# processes started without the gunicorn master (several uvicorn workers,
+# several hosts) run the migrations one at a time.
+MIGRATION_LOCK_KEY = 7_310_426_034
+
+def _lock_migrations(conn):
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': MIGRATION_LOCK_KEY})
+
+def _add_missing_columns(conn, table):
+    existing = {c['name'] for c in inspect(conn).get_columns(table.name)}
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+def _create_missing_indexes(conn, table):
+    # IF NOT EXISTS rather than checkfirst: reflection skips expression indexes.
+    for index in table.indexes:
+        conn.execute(CreateIndex(index, if_not_exists=True))
+
+def _relax_legacy_results_column(conn):
+    # results used to be NOT NULL; packed rows leave it empty. SQLite cannot
+    # alter constraints in place, but tables it creates from the model are
+    # already nullable.
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text('ALTER TABLE simulations ALTER COLUMN results DROP NOT NULL'))
+
+def _create_policy_name_trigram_index(conn):
+    # Postgres serves policy_name prefix search from a trigram index; other
+    # databases fall back to the lower(policy_name) expression index.
+    if conn.dialect.name != 'postgresql':
+        return
+    try:
+        with conn.begin_nested():
+            conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+            conn.execute(text(
+                'CREATE INDEX IF NOT EXISTS ix_simulations_policy_name_trgm '
+                'ON simulations USING gin (lower(policy_name) gin_trgm_ops)'
+            ))
+    except Exception as e:
+        print(f"Trigram index not created, using expression index for search: {e}")
+
+def _backfill_simulation_summary_columns(conn):
+    from .models import Simulation
+    from .storage import results_from_columns
+
+    simulations = Simulation.__table__
+    last_id = 0
+    while True:
+        batch = conn.execute(
+            select(simulations.c.id, simulations.c.results, simulations.c.results_packed)
+            .where(simulations.c.id > last_id, simulations.c.risk_category.is_(None))
+            .order_by(simulations.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+
+        for sim in batch:
+            results = results_from_columns(sim.results, sim.results_packed)
+            conn.execute(
+                update(simulations)
+                .where(simulations.c.id == sim.id)
+                .values(
+                    risk_category=results.get('risk_category') or 'Unknown',
+                    revenue_million=results.get('revenue_million') or 0.0
+                )
+            )
+        last_id = batch[-1].id
+
+def _backfill_simulation_projections(conn):
+    # Rows saved before the projections table existed have no country column
+    # set; that doubles as the "not yet backfilled" marker.
+    from .models import Simulation, SimulationProjection
+    from .storage import results_from_columns, projection_rows
+
+    simulations = Simulation.__table__
+    last_id = 0
+    while True:
+        batch = conn.execute(
+            select(simulations.c.id, simulations.c.input_params, simulations.c.results, simulations.c.results_packed)
+            .where(simulations.c.id > last_id, simulations.c.country.is_(None))
+            .order_by(simulations.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+
+        rows = []
+        for sim in batch:
+            input_params = sim.input_params or {}
+            results = results_from_columns(sim.results, sim.results_packed)
+            rows.extend(projection_rows(sim.id, results))
+            conn.execute(
+                update(simulations)
+                .where(simulations.c.id == sim.id)
+                .values(
+                    country=input_params.get('country') or 'Unknown',
+                    policy_type=input_params.get('policy_type') or 'Unknown'
+                )
+            )
+        # Delete first so a rerun over a partly backfilled batch doesn't
+        # duplicate (simulation_id, year) rows.
+        conn.execute(delete(SimulationProjection.__table__).where(
+            SimulationProjection.__table__.c.simulation_id.in_([sim.id for sim in batch])
+        ))
+        if rows:
+            conn.execute(insert(SimulationProjection.__table__), rows)
+        last_id = batch[-1].id
+
+def run_migrations(engine):
+    from .models import Simulation, SimulationProjection, Comparison
+
+    with engine.begin() as conn:
+        _lock_migrations(conn)
+        Simulation.metadata.create_all(bind=conn)
+        for model in (Simulation, SimulationProjection, Comparison):
+            _add_missing_columns(conn, model.__table__)
+            _create_missing_indexes(conn, model.__table__)
+        _relax_legacy_results_column(conn)
+        _create_policy_name_trigram_index(conn)
+
+    with engine.begin() as conn:
+        _lock_migrations(conn)
+        _backfill_simulation_projections(conn)
+        _backfill_simulation_summary_columns(conn)
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, JSON, Text, LargeBinary, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
 from .database import Base
 
+def _utcnow():
+    return datetime.now(timezone.utc)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -31,9 +35,27 @@ class Simulation(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     policy_name = Column(String, nullable=True)
+    country = Column(String, nullable=True, index=True)
+    policy_type = Column(String, nullable=True, index=True)
+    risk_category = Column(String, nullable=True)
+    revenue_million = Column(Float, nullable=True)
     input_params = Column(JSON, nullable=False)
-    results = Column(JSON, nullable=False)
+    input_hash = Column(String(64), nullable=True, index=True)
+    results = Column(JSON, nullable=True)  # Legacy rows only; see storage.load_results
+    results_packed = Column(LargeBinary, nullable=True)  # Versioned columnar blob (storage.encode_results)
+    results_version = Column(String(64), nullable=True, index=True)  # Model/dataset stamp; see recompute.results_version
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set in Python on every insert and update (including bulk and Core
+    # updates) for sub-second resolution; part of the history ETag.
+    updated_at = Column(DateTime(timezone=True), nullable=True, default=_utcnow, onupdate=_utcnow)
+
+    __table_args__ = (
+        Index("ix_simulations_user_created", "user_id", "created_at"),
+        Index("ix_simulations_user_country", "user_id", "country"),
+        Index("ix_simulations_user_risk", "user_id", "risk_category"),
+        Index("ix_simulations_user_revenue", "user_id", "revenue_million"),
+        Index("ix_simulations_user_policy_name_lower", "user_id", func.lower(policy_name)),
+    )
 
     user = relationship("User", back_populates="simulations")
 
@@ -41,6 +63,28 @@ class Simulation(Base):
         return f"<Simulation(id={self.id}, user_id={self.user_id}, policy_name={self.policy_name})>"
 
 
+class SimulationProjection(Base):
+    __tablename__ = "simulation_projections"
+    __table_args__ = (
+        Index("ix_simulation_projections_simulation_year", "simulation_id", "year"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    simulation_id = Column(Integer, ForeignKey("simulations.id", ondelete="CASCADE"), nullable=False)
+    year = Column(Integer, nullable=False, index=True)
+    revenue_million = Column(Float, nullable=False)
+    cumulative_revenue_million = Column(Float, nullable=False)
+    co2_reduced_mt = Column(Float, nullable=False)
+    co2_reduced_cumulative_mt = Column(Float, nullable=False)
+    co2_after_reduction_mt = Column(Float, nullable=False)
+    abolishment_risk_percent = Column(Float, nullable=False)
+    risk_category = Column(String, nullable=False)
+    risk_adjusted_value_million = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<SimulationProjection(simulation_id={self.simulation_id}, year={self.year})>"
+
+
 class Comparison(Base):
     __tablename__ = "comparisons"
 
@@ -49,8 +93,8 @@ class Comparison(Base):
     comparison_name = Column(String, nullable=True)
     simulation_1_id = Column(Integer, ForeignKey("simulations.id"), nullable=True, index=True)
     simulation_2_id = Column(Integer, ForeignKey("simulations.id"), nullable=True, index=True)
-    simulation_1_data = Column(JSON, nullable=False)  # Stores full simulation data (input + results)
-    simulation_2_data = Column(JSON, nullable=False)  # Stores full simulation data (input + results)
+    simulation_1_data = Column(JSON, nullable=False)  # Inline input, or just the policy name when simulation_1_id is set
+    simulation_2_data = Column(JSON, nullable=False)  # Inline input, or just the policy name when simulation_2_id is set
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="comparisons")
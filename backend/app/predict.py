@@ -1,25 +1,30 @@
+import os
 import joblib
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from .mappings import get_region, get_income_level
-from .services import get_country_total_co2
+from .services import get_country_total_co2, co2_entity_ids, co2_totals
+from .storage import file_fingerprint
+from .runtime import active_bundle
 
 BASE_DIR = Path(__file__).parent
 MODELS_DIR = BASE_DIR.parent.parent / "ML Model"
 
-revenue_model = None
-revenue_encoders = None
-success_model = None
-success_encoders = None
+MODEL_FILES = ['revenue_model_gb.pkl', 'revenue_encoders.pkl', 'success_model_gb.pkl', 'success_encoders.pkl']
 
-def load_models():
-    global revenue_model, revenue_encoders, success_model, success_encoders
+# "r" maps the tree arrays of uncompressed pickles read-only from disk so
+# worker processes share them; compressed pickles are loaded normally.
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE") or None
 
-    revenue_model = joblib.load(MODELS_DIR / 'revenue_model_gb.pkl')
-    revenue_encoders = joblib.load(MODELS_DIR / 'revenue_encoders.pkl')
-    success_model = joblib.load(MODELS_DIR / 'success_model_gb.pkl')
-    success_encoders = joblib.load(MODELS_DIR / 'success_encoders.pkl')
+def load_models():
+    return {
+        'revenue_model': joblib.load(MODELS_DIR / 'revenue_model_gb.pkl', mmap_mode=MODEL_MMAP_MODE),
+        'revenue_encoders': joblib.load(MODELS_DIR / 'revenue_encoders.pkl'),
+        'success_model': joblib.load(MODELS_DIR / 'success_model_gb.pkl', mmap_mode=MODEL_MMAP_MODE),
+        'success_encoders': joblib.load(MODELS_DIR / 'success_encoders.pkl'),
+        'model_version': file_fingerprint([MODELS_DIR / name for name in MODEL_FILES]),
+    }
 
 def calculate_revenue_formula(carbon_price_usd, coverage_percent, country, year):
     
@@ -35,89 +40,123 @@ def calculate_revenue_formula(carbon_price_usd, coverage_percent, country, year)
     
     return max(0.01, revenue_million_usd)
 
-def predict_revenue(country, policy_type, carbon_price_usd, coverage_percent, year, fossil_fuel_pct, population, gdp):
-    from .mappings import get_region_for_ml
-    region = get_region(country)
-    income = get_income_level(country)
-    
-    ml_region = get_region_for_ml(region, income)
+def calculate_revenue_formula_batch(carbon_price_usd, coverage_percent, country, year):
+    # Same arithmetic as calculate_revenue_formula, reading every row's CO2
+    # from the precomputed table in one gather.
+    country_codes, country_names = pd.factorize(np.asarray(country, dtype=object))
+    total_co2_mt = co2_totals(co2_entity_ids(country_names)[country_codes], year)
 
-    coverage_x_gdp = coverage_percent * gdp
+    co2_covered_mt = (np.asarray(coverage_percent, dtype=float) / 100) * total_co2_mt
+    revenue_million_usd = np.maximum(0.01, np.asarray(carbon_price_usd, dtype=float) * co2_covered_mt * 0.05)
+    return np.where(np.isnan(total_co2_mt) | (total_co2_mt <= 0), 0.01, revenue_million_usd)
 
-    input_df = pd.DataFrame({
-        'Type': [policy_type],
-        'Region': [ml_region],
-        'Income group': [income],
-        'Year': [year],
-        'Carbon_Price_USD': [carbon_price_usd],
-        'Actual_Coverage_%': [coverage_percent],
-        'Coverage_x_GDP': [coverage_x_gdp],
-        'Fossil_Fuel_Dependency_%': [fossil_fuel_pct],
-        'Population_Log': [np.log(population)],
-        'GDP': [gdp]
-    })
+CATEGORICAL_FEATURES = ['Type', 'Region', 'Income group']
 
-    try:
-        input_df['Type'] = revenue_encoders['Type'].transform(input_df['Type'])
-        input_df['Region'] = revenue_encoders['Region'].transform(input_df['Region'])
-        input_df['Income group'] = revenue_encoders['Income group'].transform(input_df['Income group'])
-
-        revenue_million_usd = revenue_model.predict(input_df)[0]
-        
-        if pd.isna(revenue_million_usd) or revenue_million_usd <= 0:
-            revenue_million_usd = calculate_revenue_formula(carbon_price_usd, coverage_percent, country, year)
-
-        return revenue_million_usd
-    except (ValueError, KeyError) as e:
-        return calculate_revenue_formula(carbon_price_usd, coverage_percent, country, year)
-
-def predict_success(country, policy_type, coverage_percent, year, fossil_fuel_pct, gdp):
-    from .context import COUNTRIES_WITH_HISTORICAL_DATA
+def _ml_categories(countries):
     from .mappings import get_region_for_ml
-
-    region = get_region(country)
-    income = get_income_level(country)
-    
-    ml_region = get_region_for_ml(region, income)
-
-    if country not in COUNTRIES_WITH_HISTORICAL_DATA:
-        return 50.0, "At Risk", "Low"
+    categories = {}
+    for country in set(countries):
+        income = get_income_level(country)
+        categories[country] = (get_region_for_ml(get_region(country), income), income)
+    return categories
+
+def _encode_known_rows(input_df, encoders):
+    known = np.ones(len(input_df), dtype=bool)
+    for column in CATEGORICAL_FEATURES:
+        known &= input_df[column].isin(encoders[column].classes_).to_numpy()
+    encoded = input_df[known].copy()
+    for column in CATEGORICAL_FEATURES:
+        encoded[column] = encoders[column].transform(encoded[column])
+    return known, encoded
+
+def predict_revenue_batch(country, policy_type, carbon_price_usd, coverage_percent, year, fossil_fuel_pct, population, gdp):
+    bundle = active_bundle()
+    country = list(country)
+    categories = _ml_categories(country)
+    carbon_price_usd = np.asarray(carbon_price_usd, dtype=float)
+    coverage_percent = np.asarray(coverage_percent, dtype=float)
+    year = np.asarray(year)
+    gdp = np.asarray(gdp, dtype=float)
 
     input_df = pd.DataFrame({
-        'Type': [policy_type],
-        'Region': [ml_region],
-        'Income group': [income],
-        'Year': [year],
-        'Fossil_Fuel_Dependency_%': [fossil_fuel_pct],
-        'GDP': [gdp]
+        'Type': list(policy_type),
+        'Region': [categories[c][0] for c in country],
+        'Income group': [categories[c][1] for c in country],
+        'Year': year,
+        'Carbon_Price_USD': carbon_price_usd,
+        'Actual_Coverage_%': coverage_percent,
+        'Coverage_x_GDP': coverage_percent * gdp,
+        'Fossil_Fuel_Dependency_%': np.asarray(fossil_fuel_pct, dtype=float),
+        'Population_Log': np.log(np.asarray(population, dtype=float)),
+        'GDP': gdp
     })
 
+    revenue_million_usd = np.full(len(country), np.nan)
     try:
-        input_df['Type'] = success_encoders['Type'].transform(input_df['Type'])
-        input_df['Region'] = success_encoders['Region'].transform(input_df['Region'])
-        input_df['Income group'] = success_encoders['Income group'].transform(input_df['Income group'])
-
-        abolishment_prob = success_model.predict_proba(input_df)[0][0]
+        known, encoded = _encode_known_rows(input_df, bundle.revenue_encoders)
+        if known.any():
+            revenue_million_usd[known] = bundle.revenue_model.predict(encoded)
     except (ValueError, KeyError) as e:
-        abolishment_prob = 0.50
-    
-    if pd.isna(abolishment_prob):
-        abolishment_prob = 0.50
-    elif abolishment_prob < 0:
-        abolishment_prob = 0.0
-    elif abolishment_prob > 1:
-        abolishment_prob = 1.0
+        pass
+
+    needs_formula = np.isnan(revenue_million_usd) | (revenue_million_usd <= 0)
+    if needs_formula.any():
+        rows = np.flatnonzero(needs_formula)
+        revenue_million_usd[rows] = calculate_revenue_formula_batch(
+            carbon_price_usd[rows], coverage_percent[rows], [country[i] for i in rows], year[rows]
+        )
 
+    return revenue_million_usd
+
+def predict_revenue(country, policy_type, carbon_price_usd, coverage_percent, year, fossil_fuel_pct, population, gdp):
+    return float(predict_revenue_batch(
+        [country], [policy_type], [carbon_price_usd], [coverage_percent], [year], [fossil_fuel_pct], [population], [gdp]
+    )[0])
+
+def predict_success_batch(country, policy_type, year, fossil_fuel_pct, gdp):
+    # Returns the abolishment probability per row and whether each country has
+    # policy history; rows without history get 0.5, as in predict_success.
+    bundle = active_bundle()
+    country = list(country)
+    categories = _ml_categories(country)
+    has_history = np.array([c in bundle.countries_with_history for c in country], dtype=bool)
+    abolishment_prob = np.full(len(country), 0.50)
+
+    if has_history.any():
+        input_df = pd.DataFrame({
+            'Type': list(policy_type),
+            'Region': [categories[c][0] for c in country],
+            'Income group': [categories[c][1] for c in country],
+            'Year': np.asarray(year),
+            'Fossil_Fuel_Dependency_%': np.asarray(fossil_fuel_pct, dtype=float),
+            'GDP': np.asarray(gdp, dtype=float)
+        })[has_history]
+
+        try:
+            known, encoded = _encode_known_rows(input_df, bundle.success_encoders)
+            if known.any():
+                rows = np.flatnonzero(has_history)[known]
+                abolishment_prob[rows] = bundle.success_model.predict_proba(encoded)[:, 0]
+        except (ValueError, KeyError) as e:
+            pass
+
+    abolishment_prob = np.where(np.isnan(abolishment_prob), 0.50, np.clip(abolishment_prob, 0.0, 1.0))
+    return abolishment_prob, has_history
+
+def risk_category_for_probability(abolishment_prob):
     if abolishment_prob <= 0.35:
-        risk_category = "Low Risk"
-        confidence = "High"
+        return "Low Risk", "High"
     elif abolishment_prob >= 0.65:
-        risk_category = "High Risk"
-        confidence = "High"
-    else:
-        risk_category = "At Risk"
-        confidence = "Medium"
+        return "High Risk", "High"
+    return "At Risk", "Medium"
+
+def predict_success(country, policy_type, coverage_percent, year, fossil_fuel_pct, gdp):
+    abolishment_prob, has_history = predict_success_batch([country], [policy_type], [year], [fossil_fuel_pct], [gdp])
+
+    if not has_history[0]:
+        return 50.0, "At Risk", "Low"
 
-    abolishment_risk_percent = abolishment_prob * 100
+    risk_category, confidence = risk_category_for_probability(abolishment_prob[0])
+    abolishment_risk_percent = float(abolishment_prob[0]) * 100
     
     return abolishment_risk_percent, risk_category, confidence
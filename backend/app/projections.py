@@ -0,0 +1,493 @@
+import numpy as np
+from typing import List, Optional
+from .schemas import PredictionRequest, PredictionResponse, YearProjection
+from .predict import predict_revenue_batch, predict_success_batch, risk_category_for_probability
+from .calculations import (
+    calculate_co2_impact, calculate_co2_impact_array, co2_impact_record, co2_reduced_array,
+    calculate_equivalencies, calculate_equivalencies_array, equivalencies_record,
+)
+from .services import co2_entity_ids, co2_totals, gdp_growth_profiles, gdp_growth_multiplier
+from .context import generate_context
+from .memo import lookup, store
+
+# Fallback for countries without real GDP growth data (see
+# services.GDP_GROWTH_WINDOW).
+GDP_GROWTH_RATE = 0.03
+POPULATION_GROWTH_RATE = 0.01
+FOSSIL_FUEL_DECLINE_RATE = 0.005
+MIN_REVENUE_GROWTH_RATE = 0.015
+MAX_REVENUE_MULTIPLIER = 3.0
+RISK_ESCALATION_RATE = 0.005
+MAX_PROJECTION_YEARS = 20
+
+# Spread of the Monte Carlo drivers around the point-estimate rates above.
+# Growth rates are drawn once per scenario; the carbon price follows a
+# lognormal random walk from the requested starting price.
+GDP_GROWTH_SD = 0.015
+POPULATION_GROWTH_SD = 0.005
+FOSSIL_FUEL_DECLINE_SD = 0.0025
+CARBON_PRICE_DRIFT = 0.0
+CARBON_PRICE_VOLATILITY = 0.10
+UNCERTAINTY_PERCENTILES = (10, 50, 90)
+
+def _normalize_context(context, country):
+    if not context.get('recommendation') or not isinstance(context['recommendation'], str):
+        context['recommendation'] = 'Policy assessment available.'
+    if not context.get('similar_policies') or not isinstance(context['similar_policies'], list) or len(context['similar_policies']) == 0:
+        context['similar_policies'] = ['Historical policy data analysis available.']
+    if not context.get('key_risks') or not isinstance(context['key_risks'], list) or len(context['key_risks']) == 0:
+        context['key_risks'] = ['Standard implementation considerations apply.']
+    if not context.get('success_context') or not context['success_context'].get('context_message') or not isinstance(context['success_context']['context_message'], str):
+        context['success_context'] = {
+            'context_message': f'Risk assessment for {country} based on regional patterns and economic factors.',
+            'recommendation': context.get('recommendation', 'Policy assessment available.'),
+            'has_historical_data': False,
+            'confidence': 'Medium'
+        }
+    return context
+
+def _co2_impact_or_empty(co2_impact, coverage_percent, carbon_price_usd):
+    if co2_impact is None:
+        co2_impact = {
+            'total_country_co2_mt': 0.0,
+            'co2_covered_mt': 0.0,
+            'co2_covered_percent': coverage_percent,
+            'co2_uncovered_mt': 0.0,
+            'co2_uncovered_percent': 100 - coverage_percent,
+            'co2_potentially_reduced_mt': 0.0,
+            'co2_covered_per_capita_tonnes': 0.0,
+            'reduction_rate_used': 0.0,
+            'carbon_price_usd': carbon_price_usd,
+        }
+    return co2_impact
+
+def carbon_price_path(request: PredictionRequest, n_years: int) -> np.ndarray:
+    # Price for each projection year; year 0 is always carbon_price_usd.
+    offset = np.arange(n_years)
+    schedule = request.price_schedule
+    if schedule is None:
+        path = np.full(n_years, request.carbon_price_usd, dtype=float)
+    elif schedule.type == "linear":
+        path = request.carbon_price_usd + schedule.increment_usd * offset
+    elif schedule.type == "percent":
+        path = request.carbon_price_usd * (1 + schedule.escalation_percent / 100) ** offset
+    else:
+        later = list(schedule.prices[:n_years - 1]) or [request.carbon_price_usd]
+        later += [later[-1]] * (n_years - 1 - len(later))
+        path = np.array([request.carbon_price_usd] + later[:n_years - 1], dtype=float)
+    return np.maximum(path, 0.0)
+
+def gdp_growth_rates(countries):
+    # Per-country (rate, slope) from the bundle's growth table, with the flat
+    # GDP_GROWTH_RATE for countries it doesn't cover.
+    rate, trend = gdp_growth_profiles(countries)
+    return np.where(np.isnan(rate), GDP_GROWTH_RATE, rate), trend
+
+def build_projection_grid(requests: List[PredictionRequest], country_features: List[dict]) -> dict:
+    # One row per (scenario, projection year), flattened in scenario order so
+    # every model call covers all scenarios at once.
+    n_years = [max(1, min(MAX_PROJECTION_YEARS, r.projection_years)) for r in requests]
+    scenario = np.repeat(np.arange(len(requests)), n_years)
+    carbon_price_usd = np.concatenate([carbon_price_path(r, n) for r, n in zip(requests, n_years)])
+    offset = np.concatenate([np.arange(n) for n in n_years])
+
+    base_fossil = np.array([f['fossil_fuel_pct'] for f in country_features], dtype=float)[scenario]
+    base_population = np.array([f['population'] for f in country_features], dtype=float)[scenario]
+    base_gdp = np.array([f['gdp'] for f in country_features], dtype=float)[scenario]
+    gdp_rate, gdp_trend = gdp_growth_rates([r.country for r in requests])
+
+    return {
+        'n_years': n_years,
+        'scenario': scenario,
+        'offset': offset,
+        'country': [requests[i].country for i in scenario],
+        'policy_type': [requests[i].policy_type for i in scenario],
+        'carbon_price_usd': carbon_price_usd,
+        'coverage_percent': np.array([r.coverage_percent for r in requests], dtype=float)[scenario],
+        'year': np.array([r.year for r in requests])[scenario] + offset,
+        'fossil_fuel_pct': np.where(offset == 0, base_fossil, np.maximum(0, base_fossil - (FOSSIL_FUEL_DECLINE_RATE * offset * 100))),
+        'population': base_population * ((1 + POPULATION_GROWTH_RATE) ** offset),
+        'gdp': base_gdp * gdp_growth_multiplier(gdp_rate[scenario], gdp_trend[scenario], offset),
+    }
+
+def _memoized_rows(stage, columns, predict):
+    # Runs predict only on the rows whose inputs aren't cached yet; a longer
+    # horizon for the same scenario reuses its earlier years, and the success
+    # stage is shared by every price and coverage.
+    keys, values, missing = lookup(stage, list(zip(*(np.asarray(c).tolist() for c in columns))))
+    if missing:
+        computed = predict(*(np.asarray(c)[missing] for c in columns))
+        computed = list(zip(*(np.asarray(v).tolist() for v in computed)))
+        store(stage, [keys[i] for i in missing], computed)
+        for i, value in zip(missing, computed):
+            values[i] = value
+    return [np.array(v) for v in zip(*values)]
+
+def evaluate_grid(grid: dict):
+    (revenue,) = _memoized_rows('revenue', [
+        grid['country'], grid['policy_type'], grid['carbon_price_usd'], grid['coverage_percent'],
+        grid['year'], grid['fossil_fuel_pct'], grid['population'], grid['gdp']
+    ], lambda *rows: (predict_revenue_batch(*rows),))
+    abolishment_prob, has_history = _memoized_rows('success', [
+        grid['country'], grid['policy_type'], grid['year'], grid['fossil_fuel_pct'], grid['gdp']
+    ], predict_success_batch)
+    return revenue, abolishment_prob, has_history.astype(bool)
+
+def base_result(request, revenue0, abolishment_prob0, has_history, co2_impact=None) -> dict:
+    # Year-one numbers; everything else in the response builds on these.
+    # co2_impact, when given, is a calculate_co2_impact result (or None).
+    predicted_revenue = float(revenue0)
+    if co2_impact is None:
+        co2_impact = calculate_co2_impact(request.coverage_percent, request.country, request.year, request.carbon_price_usd)
+    co2_impact = _co2_impact_or_empty(co2_impact, request.coverage_percent, request.carbon_price_usd)
+
+    if has_history:
+        risk_category, _ = risk_category_for_probability(abolishment_prob0)
+    else:
+        risk_category = "At Risk"
+    abolishment_risk = float(abolishment_prob0) * 100
+
+    if risk_category == "Low Risk":
+        risk_adjusted_value = predicted_revenue
+    else:
+        success_probability = 1 - (abolishment_risk / 100)
+        risk_adjusted_value = max(0.0, predicted_revenue * success_probability)
+    risk_adjusted_value = max(0.0, risk_adjusted_value)
+
+    return {
+        'predicted_revenue': predicted_revenue,
+        'abolishment_risk': abolishment_risk,
+        'risk_category': risk_category,
+        'risk_adjusted_value': risk_adjusted_value,
+        'co2_impact': co2_impact,
+    }
+
+def headline_fields(base: dict) -> dict:
+    co2_impact = base['co2_impact']
+    return {
+        'revenue_million': round(base['predicted_revenue'], 2),
+        'abolishment_risk_percent': round(base['abolishment_risk'], 1),
+        'risk_category': base['risk_category'],
+        'total_country_co2_mt': co2_impact['total_country_co2_mt'],
+        'co2_covered_mt': co2_impact['co2_covered_mt'],
+        'co2_reduced_mt': co2_impact['co2_potentially_reduced_mt'],
+        'co2_covered_per_capita_tonnes': co2_impact['co2_covered_per_capita_tonnes'],
+        'risk_adjusted_value_million': max(0.0, round(base['risk_adjusted_value'], 2)),
+    }
+
+def context_args(request, country_features, base: dict) -> tuple:
+    # Everything generate_context reads; equal tuples give the same context.
+    return (
+        request.country,
+        request.policy_type,
+        request.carbon_price_usd,
+        request.coverage_percent,
+        base['predicted_revenue'],
+        base['abolishment_risk'],
+        base['risk_category'],
+        country_features['region']
+    )
+
+def resolve_context(args: tuple) -> dict:
+    return _normalize_context(generate_context(*args), args[0])
+
+def detail_fields(request, country_features, base: dict, equivalencies=None, context=None) -> dict:
+    if equivalencies is None:
+        equivalencies = calculate_equivalencies(base['co2_impact']['co2_potentially_reduced_mt'])
+    if context is None:
+        context = resolve_context(context_args(request, country_features, base))
+    return {
+        'cars_off_road_equivalent': equivalencies['cars_off_road_1year'],
+        'trees_planted_equivalent': equivalencies['trees_planted_1year'],
+        'coal_plants_closed_equivalent': equivalencies['coal_plants_closed'],
+        'homes_powered_equivalent': equivalencies['homes_powered_clean_1year'],
+        'equivalencies_source': equivalencies['source_context'],
+        'recommendation': context['recommendation'],
+        'similar_policies': context['similar_policies'],
+        'key_risks': context['key_risks'],
+        'context_explanation': context['success_context']['context_message'],
+    }
+
+def iter_projections(request, base: dict, revenue, abolishment_prob, carbon_price, total_co2_mt=None):
+    # Yields each projection year as soon as it is computed. total_co2_mt,
+    # when given, holds the country's emissions from the start year on.
+    co2_impact = base['co2_impact']
+    predicted_revenue = base['predicted_revenue']
+
+    # CO2 for the later years in one array pass over the price trajectory;
+    # rounding matches calculate_co2_impact.
+    if total_co2_mt is None:
+        total_co2_mt = co2_totals(co2_entity_ids([request.country]), request.year + np.arange(len(revenue)))
+    future_total_co2_mt = total_co2_mt[:len(revenue)]
+    future_reduced_mt = co2_reduced_array(request.coverage_percent, future_total_co2_mt, carbon_price)
+
+    cumulative_co2_reduced = 0.0
+    cumulative_revenue = 0.0
+    base_year_co2 = co2_impact['total_country_co2_mt']
+    previous_revenue = predicted_revenue
+
+    for year_offset in range(len(revenue)):
+        future_year = request.year + year_offset
+
+        if year_offset == 0:
+            future_revenue = predicted_revenue
+            future_co2 = co2_impact
+        else:
+            future_revenue = float(revenue[year_offset])
+
+            min_expected_revenue = previous_revenue * (1 + MIN_REVENUE_GROWTH_RATE)
+            if future_revenue < min_expected_revenue:
+                future_revenue = min_expected_revenue
+
+            if future_revenue > previous_revenue * MAX_REVENUE_MULTIPLIER:
+                future_revenue = previous_revenue * MAX_REVENUE_MULTIPLIER
+
+            if future_total_co2_mt[year_offset] <= 0:
+                future_co2 = {'total_country_co2_mt': 0.0, 'co2_potentially_reduced_mt': 0.0}
+            else:
+                future_co2 = {
+                    'total_country_co2_mt': round(future_total_co2_mt[year_offset], 1),
+                    'co2_potentially_reduced_mt': round(float(future_reduced_mt[year_offset]), 3),
+                }
+
+        previous_revenue = future_revenue
+
+        future_abolishment = float(abolishment_prob[year_offset]) * 100
+        time_escalated_risk = min(100.0, future_abolishment + (RISK_ESCALATION_RATE * 100 * year_offset))
+
+        if time_escalated_risk < 35:
+            escalated_risk_category = "Low Risk"
+        elif time_escalated_risk > 65:
+            escalated_risk_category = "High Risk"
+        else:
+            escalated_risk_category = "At Risk"
+
+        if escalated_risk_category == "Low Risk":
+            future_risk_adjusted_value = future_revenue
+        else:
+            success_probability = 1 - (time_escalated_risk / 100)
+            future_risk_adjusted_value = max(0.0, future_revenue * success_probability)
+
+        annual_co2_reduced = max(0.0, round(future_co2['co2_potentially_reduced_mt'], 3))
+        cumulative_co2_reduced += annual_co2_reduced
+        cumulative_revenue += future_revenue
+
+        future_total_co2 = max(0.0, future_co2['total_country_co2_mt'] if future_co2 else base_year_co2)
+        co2_after_reduction = max(0.0, future_total_co2 - annual_co2_reduced)
+        co2_reduced_from_base = max(0.0, cumulative_co2_reduced)
+
+        yield {
+            'year': int(future_year),
+            'carbon_price_usd': round(float(carbon_price[year_offset]), 2),
+            'revenue_million': max(0.0, round(future_revenue, 2)),
+            'co2_reduced_mt': max(0.0, annual_co2_reduced),
+            'co2_reduced_cumulative_mt': max(0.0, round(cumulative_co2_reduced, 3)),
+            'co2_after_reduction_mt': max(0.0, round(co2_after_reduction, 2)),
+            'co2_reduced_from_base_mt': max(0.0, round(co2_reduced_from_base, 3)),
+            'abolishment_risk_percent': max(0.0, min(100.0, round(time_escalated_risk, 1))),
+            'risk_category': escalated_risk_category,
+            'risk_adjusted_value_million': max(0.0, round(future_risk_adjusted_value, 2)),
+            'cumulative_revenue_million': max(0.0, round(cumulative_revenue, 2))
+        }
+
+def _float_fields(model) -> tuple:
+    return tuple(name for name, field in model.model_fields.items() if field.annotation in (float, Optional[float]))
+
+RESPONSE_FIELDS = tuple(PredictionResponse.model_fields)
+RESPONSE_FLOAT_FIELDS = _float_fields(PredictionResponse)
+YEAR_FIELDS = tuple(YearProjection.model_fields)
+YEAR_FLOAT_FIELDS = _float_fields(YearProjection)
+
+def _year_result(projection: dict) -> dict:
+    row = {name: projection[name] for name in YEAR_FIELDS}
+    for name in YEAR_FLOAT_FIELDS:
+        if row[name] is not None:
+            row[name] = float(row[name])
+    return row
+
+def prediction_result(headline: dict, details: dict, projections) -> dict:
+    # The dict PredictionResponse(...).dict() would give, built without
+    # validation: fields in schema order, NumPy scalars and ints in float
+    # fields converted to float.
+    result = {**headline, **details}
+    result = {name: result[name] for name in RESPONSE_FIELDS if name != 'projections'}
+    for name in RESPONSE_FLOAT_FIELDS:
+        result[name] = float(result[name])
+    result['projections'] = [_year_result(p) for p in projections]
+    return result
+
+def trusted_response(result: dict) -> PredictionResponse:
+    # Wraps a prediction_result without validating it again.
+    return PredictionResponse.model_construct(**{
+        **result, 'projections': [YearProjection.model_construct(**p) for p in result['projections']]
+    })
+
+def _build_result(request, country_features, revenue, abolishment_prob, has_history, carbon_price,
+                  co2_impact=None, equivalencies=None) -> dict:
+    base = base_result(request, revenue[0], abolishment_prob[0], has_history, co2_impact)
+    return prediction_result(
+        headline_fields(base),
+        detail_fields(request, country_features, base, equivalencies),
+        iter_projections(request, base, revenue, abolishment_prob, carbon_price)
+    )
+
+def run_predictions(requests: List[PredictionRequest], country_features: List[dict]) -> List[PredictionResponse]:
+    return [trusted_response(result) for result in run_prediction_results(requests, country_features)]
+
+def run_prediction_results(requests: List[PredictionRequest], country_features: List[dict]) -> List[dict]:
+    # run_predictions as plain prediction_result dicts, for responses that
+    # are serialized directly.
+    if not requests:
+        return []
+
+    grid = build_projection_grid(requests, country_features)
+    revenue, abolishment_prob, has_history = evaluate_grid(grid)
+
+    # Start-year CO2 impact and equivalencies for every scenario in one
+    # array pass; only the per-response dicts are built one at a time.
+    co2_impacts = [
+        _co2_impact_or_empty(co2_impact_record(impact, r.coverage_percent, r.carbon_price_usd), r.coverage_percent, r.carbon_price_usd)
+        for r, impact in zip(requests, calculate_co2_impact_array(
+            [r.coverage_percent for r in requests],
+            co2_totals(co2_entity_ids([r.country for r in requests]), [r.year for r in requests]),
+            [r.carbon_price_usd for r in requests],
+            [f['population'] for f in country_features]
+        ))
+    ]
+    equivalencies = calculate_equivalencies_array([c['co2_potentially_reduced_mt'] for c in co2_impacts])
+
+    results = []
+    start = 0
+    for i, (request, features, n) in enumerate(zip(requests, country_features, grid['n_years'])):
+        rows = slice(start, start + n)
+        results.append(_build_result(
+            request, features, revenue[rows], abolishment_prob[rows], bool(has_history[start]), grid['carbon_price_usd'][rows],
+            co2_impacts[i], equivalencies_record(equivalencies[i])
+        ))
+        start += n
+    return results
+
+AGGREGATE_YEAR_FIELDS = (
+    'revenue_million', 'cumulative_revenue_million', 'co2_reduced_mt',
+    'co2_reduced_cumulative_mt', 'co2_after_reduction_mt', 'risk_adjusted_value_million',
+)
+
+def aggregate_totals(responses: List[PredictionResponse]) -> dict:
+    # Sums member results; every member shares the start year and horizon.
+    revenue = sum(r.revenue_million for r in responses)
+    weighted_risk = sum(r.abolishment_risk_percent * r.revenue_million for r in responses)
+    projections = []
+    for year_rows in zip(*(r.projections for r in responses)):
+        projections.append({
+            'year': year_rows[0].year,
+            **{field: round(sum(getattr(p, field) for p in year_rows), 3) for field in AGGREGATE_YEAR_FIELDS}
+        })
+    return {
+        'revenue_million': round(revenue, 2),
+        'risk_adjusted_value_million': round(sum(r.risk_adjusted_value_million for r in responses), 2),
+        'abolishment_risk_percent': round(weighted_risk / revenue, 1) if revenue > 0 else 0.0,
+        'total_country_co2_mt': round(sum(r.total_country_co2_mt for r in responses), 1),
+        'co2_covered_mt': round(sum(r.co2_covered_mt for r in responses), 1),
+        'co2_reduced_mt': round(sum(r.co2_reduced_mt for r in responses), 3),
+        'projections': projections,
+    }
+
+def iter_prediction_events(request: PredictionRequest, country_features: dict):
+    # The /predict/all response in pieces: the headline from the start-year
+    # row alone, so it never waits on the projection horizon, then each
+    # projection year, then context and equivalencies.
+    first_year = PredictionRequest(**{**request.dict(), 'projection_years': 1})
+    grid = build_projection_grid([first_year], [country_features])
+    revenue, abolishment_prob, has_history = evaluate_grid(grid)
+    base = base_result(request, revenue[0], abolishment_prob[0], bool(has_history[0]))
+    yield 'headline', headline_fields(base)
+
+    grid = build_projection_grid([request], [country_features])
+    revenue, abolishment_prob, _ = evaluate_grid(grid)
+    for projection in iter_projections(request, base, revenue, abolishment_prob, grid['carbon_price_usd']):
+        yield 'projection', projection
+    yield 'details', detail_fields(request, country_features, base)
+
+def clamp_revenue_paths(revenue: np.ndarray) -> np.ndarray:
+    # The year-over-year growth floor and ceiling from iter_projections, applied
+    # in place to a (scenario, year) array.
+    for t in range(1, revenue.shape[1]):
+        revenue[:, t] = np.minimum(
+            np.maximum(revenue[:, t], revenue[:, t - 1] * (1 + MIN_REVENUE_GROWTH_RATE)),
+            revenue[:, t - 1] * MAX_REVENUE_MULTIPLIER
+        )
+    return revenue
+
+def _sample_drivers(request, samples, n_years, rng):
+    offset = np.arange(n_years)
+    gdp_rate, gdp_trend = gdp_growth_rates([request.country])
+    gdp_growth = rng.normal(gdp_rate[0], GDP_GROWTH_SD, samples)
+    population_growth = rng.normal(POPULATION_GROWTH_RATE, POPULATION_GROWTH_SD, samples)
+    fossil_decline = np.maximum(0.0, rng.normal(FOSSIL_FUEL_DECLINE_RATE, FOSSIL_FUEL_DECLINE_SD, samples))
+
+    shocks = rng.normal(CARBON_PRICE_DRIFT, CARBON_PRICE_VOLATILITY, (samples, n_years))
+    shocks[:, 0] = 0.0
+    # Random-walk shocks around the scheduled path (constant without a schedule).
+    carbon_price = carbon_price_path(request, n_years) * np.exp(np.cumsum(shocks, axis=1))
+
+    return offset, gdp_growth, gdp_trend[0], population_growth, fossil_decline, carbon_price
+
+def run_uncertainty(request: PredictionRequest, country_features: dict, samples: int, seed=None) -> list:
+    # Every (scenario, year) row goes through each model in a single call;
+    # the only Python loop is the year-over-year revenue clamp, vectorized
+    # across scenarios.
+    rng = np.random.default_rng(seed)
+    n_years = max(1, min(MAX_PROJECTION_YEARS, request.projection_years))
+    offset, gdp_growth, gdp_trend, population_growth, fossil_decline, carbon_price = _sample_drivers(request, samples, n_years, rng)
+
+    fossil = np.where(
+        offset == 0,
+        country_features['fossil_fuel_pct'],
+        np.maximum(0, country_features['fossil_fuel_pct'] - (fossil_decline[:, None] * offset * 100))
+    )
+    population = country_features['population'] * ((1 + population_growth[:, None]) ** offset)
+    gdp = country_features['gdp'] * gdp_growth_multiplier(gdp_growth[:, None], gdp_trend, offset)
+    years = np.broadcast_to(request.year + offset, (samples, n_years))
+    rows = samples * n_years
+
+    revenue = predict_revenue_batch(
+        [request.country] * rows, [request.policy_type] * rows, carbon_price.ravel(),
+        np.full(rows, request.coverage_percent), years.ravel(), fossil.ravel(), population.ravel(), gdp.ravel()
+    ).reshape(samples, n_years)
+    abolishment_prob, _ = predict_success_batch(
+        [request.country] * rows, [request.policy_type] * rows, years.ravel(), fossil.ravel(), gdp.ravel()
+    )
+    abolishment_prob = abolishment_prob.reshape(samples, n_years)
+
+    clamp_revenue_paths(revenue)
+
+    escalated_risk = np.minimum(100.0, abolishment_prob * 100 + RISK_ESCALATION_RATE * 100 * offset)
+    risk_adjusted = np.where(escalated_risk < 35, revenue, np.maximum(0.0, revenue * (1 - escalated_risk / 100)))
+
+    try:
+        total_co2 = np.fmax(co2_totals(co2_entity_ids([request.country]), request.year + np.arange(n_years)), 0.0)
+    except ValueError:
+        total_co2 = np.zeros(n_years)
+    co2_reduced = np.where(total_co2 > 0, co2_reduced_array(request.coverage_percent, total_co2, carbon_price), 0.0)
+
+    series = {
+        'carbon_price_usd': carbon_price,
+        'revenue_million': revenue,
+        'cumulative_revenue_million': np.cumsum(revenue, axis=1),
+        'co2_reduced_mt': co2_reduced,
+        'co2_reduced_cumulative_mt': np.cumsum(co2_reduced, axis=1),
+        'abolishment_risk_percent': escalated_risk,
+        'risk_adjusted_value_million': risk_adjusted,
+    }
+    bands = {name: np.percentile(values, UNCERTAINTY_PERCENTILES, axis=0) for name, values in series.items()}
+
+    return [
+        {
+            'year': int(request.year + t),
+            **{
+                name: {f"p{q}": round(float(band[i, t]), 3) for i, q in enumerate(UNCERTAINTY_PERCENTILES)}
+                for name, band in bands.items()
+            }
+        }
+        for t in range(n_years)
+    ]
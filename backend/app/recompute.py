@@ -0,0 +1,182 @@
+import threading
+from typing import Optional
+from datetime import datetime, timezone
+from pydantic import ValidationError
+from sqlalchemy import bindparam, delete, func, insert, or_, select, update
+from .database import SessionLocal
+from .models import Simulation, SimulationProjection
+from .schemas import PredictionRequest
+from .services import get_country_features, countries_with_co2_data
+from .projections import run_prediction_results
+from .storage import encode_results, projection_rows
+from .runtime import active_bundle, use_bundle
+
+RECOMPUTE_BATCH_SIZE = 50
+RECOMPUTE_PAUSE_SECONDS = 0.5
+
+_lock = threading.Lock()
+_stop = threading.Event()
+_thread = None
+
+recompute_status = {
+    "state": "idle",
+    "version": None,
+    "total": 0,
+    "processed": 0,
+    "updated": 0,
+    "failed": 0,
+    "last_id": 0,
+    "started_at": None,
+    "finished_at": None,
+    "error": None,
+}
+
+def results_version():
+    # Stamp stored with each simulation; changes whenever a model file, a
+    # dataset CSV or the training data behind the context text changes.
+    return active_bundle().version
+
+def _stale_filter(version):
+    return or_(Simulation.results_version.is_(None), Simulation.results_version != version)
+
+def _evaluate_chunk(chunk):
+    requests = []
+    features = []
+    evaluated = []
+    feature_cache = {}
+    for sim in chunk:
+        try:
+            request = PredictionRequest(**sim.input_params)
+            key = (request.country, request.year)
+            if key not in feature_cache:
+                feature_cache[key] = get_country_features(request.country, request.year)
+        except (ValidationError, TypeError, ValueError) as e:
+            continue
+        requests.append(request)
+        features.append(feature_cache[key])
+        evaluated.append(sim.id)
+
+    # Rows for a country with no CO2 data would fail the whole batch (as on
+    # /predict/aggregate); they are left stale and counted as failed.
+    with_co2 = countries_with_co2_data({r.country for r in requests})
+    kept = [i for i, r in enumerate(requests) if r.country in with_co2]
+    requests = [requests[i] for i in kept]
+    features = [features[i] for i in kept]
+    evaluated = [evaluated[i] for i in kept]
+
+    try:
+        return list(zip(evaluated, run_prediction_results(requests, features)))
+    except Exception:
+        # One bad row must not fail the chunk (and every restart after it):
+        # evaluate the rows one at a time and skip the ones that fail.
+        results = []
+        for sim_id, request, row_features in zip(evaluated, requests, features):
+            try:
+                results.extend((sim_id, r) for r in run_prediction_results([request], [row_features]))
+            except Exception as e:
+                print(f"Simulation {sim_id} recompute failed: {e}")
+        return results
+
+def _write_chunk(db, version, results):
+    simulations = Simulation.__table__
+    db.execute(
+        update(simulations).where(simulations.c.id == bindparam('sim_id')),
+        [
+            {
+                'sim_id': sim_id,
+                'results': None,
+                'results_packed': encode_results(results_dict),
+                'risk_category': results_dict['risk_category'],
+                'revenue_million': results_dict['revenue_million'],
+                'results_version': version,
+            }
+            for sim_id, results_dict in results
+        ]
+    )
+    ids = [sim_id for sim_id, _ in results]
+    db.execute(delete(SimulationProjection).where(SimulationProjection.simulation_id.in_(ids)))
+    rows = []
+    for sim_id, results_dict in results:
+        rows.extend(projection_rows(sim_id, results_dict))
+    if rows:
+        db.execute(insert(SimulationProjection), rows)
+
+def _run(bundle):
+    version = bundle.version
+    db = SessionLocal()
+    try:
+        recompute_status["total"] = db.scalar(
+            select(func.count()).select_from(Simulation).where(_stale_filter(version))
+        )
+        last_id = 0
+        while not _stop.is_set():
+            # Locked per chunk so a concurrent delete waits for the rewrite;
+            # skip_locked lets several workers split the backlog on Postgres.
+            chunk = db.execute(
+                select(Simulation.id, Simulation.input_params)
+                .where(Simulation.id > last_id, _stale_filter(version))
+                .order_by(Simulation.id)
+                .limit(RECOMPUTE_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not chunk:
+                break
+
+            with use_bundle(bundle):
+                results = _evaluate_chunk(chunk)
+            if results:
+                _write_chunk(db, version, results)
+            db.commit()
+
+            last_id = chunk[-1].id
+            recompute_status["last_id"] = last_id
+            recompute_status["processed"] += len(chunk)
+            recompute_status["updated"] += len(results)
+            recompute_status["failed"] += len(chunk) - len(results)
+            _stop.wait(RECOMPUTE_PAUSE_SECONDS)
+
+        recompute_status["state"] = "stopped" if _stop.is_set() else "completed"
+    except Exception as e:
+        db.rollback()
+        recompute_status["state"] = "failed"
+        recompute_status["error"] = str(e)
+        print(f"Simulation recompute failed: {e}")
+    finally:
+        db.close()
+        recompute_status["finished_at"] = datetime.now(timezone.utc).isoformat()
+
+def start_recompute(bundle=None):
+    # Rows are selected by stale stamp, so a job that was stopped or crashed
+    # resumes where it left off the next time it is started.
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+        bundle = bundle or active_bundle()
+        _stop.clear()
+        recompute_status.update({
+            "state": "running",
+            "version": bundle.version,
+            "total": 0,
+            "processed": 0,
+            "updated": 0,
+            "failed": 0,
+            "last_id": 0,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None,
+            "error": None,
+        })
+        _thread = threading.Thread(target=_run, args=(bundle,), name="simulation-recompute", daemon=True)
+        _thread.start()
+        return True
+
+def restart_recompute(bundle=None):
+    # Called after a runtime reload: a job still stamping the old version is
+    # stopped and a new one picks up everything that is now stale.
+    stop_recompute(timeout=None)
+    return start_recompute(bundle)
+
+def stop_recompute(timeout: Optional[float] = 5.0):
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout)
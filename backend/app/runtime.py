@@ -0,0 +1,136 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import NamedTuple, Any, FrozenSet, Tuple
+
+class RuntimeBundle(NamedTuple):
+    # Everything a prediction reads. A bundle is never mutated: reloads build a
+    # new one and swap the module reference, so a request sees either the old
+    # models, encoders and datasets together or the new ones together. Caches
+    # derived from bundle contents should be keyed on version.
+    version: str
+    revenue_model: Any
+    revenue_encoders: Any
+    success_model: Any
+    success_encoders: Any
+    model_version: str
+    energy_data: Any
+    gdp_data: Any
+    population_data: Any
+    co2_data: Any
+    co2_table: Any
+    available_countries: Tuple[str, ...]
+    series_table: Any
+    gdp_growth_table: Any
+    data_version: str
+    training_data: Any
+    countries_with_history: FrozenSet[str]
+    training_data_version: str
+
+_current = None
+_reload_thread = None
+_build_lock = threading.Lock()
+_pinned = contextvars.ContextVar("runtime_bundle", default=None)
+
+reload_status = {
+    "state": "idle",
+    "version": None,
+    "previous_version": None,
+    "started_at": None,
+    "finished_at": None,
+    "error": None,
+}
+
+def build_bundle() -> RuntimeBundle:
+    from .predict import load_models
+    from .services import load_all_data
+    from .context import load_training_data
+
+    models = load_models()
+    data = load_all_data()
+    training = load_training_data()
+    version = f"{models['model_version']}-{data['data_version']}-{training['training_data_version']}"
+    return RuntimeBundle(version=version, **models, **data, **training)
+
+def load_bundle() -> RuntimeBundle:
+    global _current
+    with _build_lock:
+        _current = build_bundle()
+    return _current
+
+def active_bundle() -> RuntimeBundle:
+    global _current
+    bundle = _pinned.get()
+    if bundle is not None:
+        return bundle
+    bundle = _current
+    if bundle is None:
+        with _build_lock:
+            if _current is None:
+                _current = build_bundle()
+            bundle = _current
+    return bundle
+
+@contextmanager
+def use_bundle(bundle: RuntimeBundle):
+    token = _pinned.set(bundle)
+    try:
+        yield bundle
+    finally:
+        _pinned.reset(token)
+
+class PinRuntimeBundleMiddleware:
+    # Pins the bundle that is current when a request arrives for the whole
+    # request, including threadpool endpoints and streamed response bodies.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = _pinned.set(active_bundle())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _pinned.reset(token)
+
+def _reload(on_swap):
+    global _current
+    try:
+        bundle = build_bundle()
+        with _build_lock:
+            previous = _current
+            _current = bundle
+        reload_status.update({
+            "state": "completed",
+            "version": bundle.version,
+            "previous_version": previous.version if previous is not None else None,
+        })
+        if on_swap is not None and (previous is None or previous.version != bundle.version):
+            on_swap(bundle)
+    except Exception as e:
+        reload_status.update({"state": "failed", "error": str(e)})
+        print(f"Runtime reload failed, keeping version {_current.version if _current else None}: {e}")
+    finally:
+        reload_status["finished_at"] = datetime.now(timezone.utc).isoformat()
+
+def start_reload(on_swap=None) -> bool:
+    # Builds the new bundle on a background thread; requests keep using the
+    # current one until the single reference assignment in _reload.
+    global _reload_thread
+    with _build_lock:
+        if _reload_thread is not None and _reload_thread.is_alive():
+            return False
+        reload_status.update({
+            "state": "running",
+            "version": None,
+            "previous_version": _current.version if _current is not None else None,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None,
+            "error": None,
+        })
+        _reload_thread = threading.Thread(target=_reload, args=(on_swap,), name="runtime-reload", daemon=True)
+        _reload_thread.start()
+        return True
@@ -1,7 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 
+class PriceSchedule(BaseModel):
+    type: Literal["linear", "percent", "explicit"] = Field(..., description="How the price moves after the start year")
+    increment_usd: float = Field(0, ge=-1000, le=1000, description="linear: USD added to the price each year")
+    escalation_percent: float = Field(0, gt=-100, le=100, description="percent: price growth per year (%)")
+    prices: List[float] = Field([], max_length=50, description="explicit: prices for the years after the start year; the last one is held")
+
 class PredictionRequest(BaseModel):
     country: str = Field(..., description="Country name")
     policy_type: str = Field(..., description="Carbon tax or ETS")
@@ -9,9 +15,68 @@ class PredictionRequest(BaseModel):
     coverage_percent: float = Field(..., ge=10, le=90, description="Emission coverage percentage")
     year: int = Field(2025, ge=2000, le=2050, description="Policy start year")
     projection_years: int = Field(5, ge=1, le=20, description="Number of years to project (1-20)")
+    price_schedule: Optional[PriceSchedule] = Field(None, description="Carbon price trajectory from carbon_price_usd; constant when omitted")
+
+class BatchPredictionRequest(BaseModel):
+    requests: List[PredictionRequest] = Field(..., min_length=1, max_length=500, description="Policies to evaluate")
+
+class UncertaintyRequest(PredictionRequest):
+    samples: int = Field(1000, ge=10, le=5000, description="Number of Monte Carlo scenarios to sample")
+    seed: Optional[int] = Field(None, description="Random seed for reproducible bands")
+
+class PercentileBand(BaseModel):
+    p10: float
+    p50: float
+    p90: float
+
+class YearProjectionBand(BaseModel):
+    year: int
+    carbon_price_usd: PercentileBand
+    revenue_million: PercentileBand
+    cumulative_revenue_million: PercentileBand
+    co2_reduced_mt: PercentileBand
+    co2_reduced_cumulative_mt: PercentileBand
+    abolishment_risk_percent: PercentileBand
+    risk_adjusted_value_million: PercentileBand
+
+class UncertaintyResponse(BaseModel):
+    samples: int
+    seed: Optional[int]
+    projections: List[YearProjectionBand] = Field(..., description="P10/P50/P90 bands per projection year")
+
+class SolveRequest(BaseModel):
+    country: str = Field(..., description="Country name")
+    policy_type: str = Field(..., description="Carbon tax or ETS")
+    year: int = Field(2025, ge=2000, le=2050, description="Policy start year")
+    projection_years: int = Field(5, ge=1, le=20, description="Number of years to project (1-20)")
+    target_metric: Literal["revenue_million", "cumulative_revenue_million", "co2_reduced_mt", "co2_reduced_cumulative_mt"]
+    target_value: float = Field(..., gt=0, description="Value the target metric must reach")
+    max_risk_percent: Optional[float] = Field(None, ge=0, le=100, description="Highest acceptable abolishment risk (%)")
+    price_min_usd: float = Field(1, gt=0, description="Lowest carbon price to consider")
+    price_max_usd: float = Field(300, gt=0, le=10000, description="Highest carbon price to consider")
+    coverage_min_percent: float = Field(10, ge=10, le=90)
+    coverage_max_percent: float = Field(90, ge=10, le=90)
+    price_tolerance_usd: float = Field(0.01, ge=0.001, le=10, description="Bisection stops once the price bracket is this narrow")
+
+class SolvePoint(BaseModel):
+    carbon_price_usd: float
+    coverage_percent: float
+    value: float = Field(..., description="Target metric at this point")
+
+class SolveResponse(BaseModel):
+    feasible: bool
+    target_metric: str
+    target_value: float
+    abolishment_risk_percent: float
+    optimal: Optional[SolvePoint] = Field(None, description="Lowest carbon price reaching the target")
+    frontier: List[SolvePoint] = Field(..., description="Lowest carbon price reaching the target at each coverage level searched")
+    message: Optional[str] = Field(None, description="Why no price and coverage reach the target; null when feasible")
+    evaluations: int = Field(..., description="Price/coverage points evaluated")
+    model_rows: int = Field(..., description="Rows sent to the revenue model")
 
 class YearProjection(BaseModel):
     year: int
+    carbon_price_usd: Optional[float] = Field(None, description="Carbon price in effect this year (USD per tonne CO2)")
     revenue_million: float
     cumulative_revenue_million: float = Field(..., description="Cumulative revenue from Year 1 to this year (Million USD)")
     co2_reduced_mt: float = Field(..., description="Annual CO2 reduction for this year (Million tonnes)")
@@ -48,6 +113,47 @@ class PredictionResponse(BaseModel):
 
     projections: List[YearProjection] = Field(..., description="Year-by-year projections")
 
+class AggregateRequest(BaseModel):
+    countries: List[str] = Field([], max_length=60, description="Member countries")
+    bloc: Optional[str] = Field(None, description="Named group of countries, e.g. EU27; combined with countries")
+    policy_type: str = Field(..., description="Carbon tax or ETS")
+    carbon_price_usd: float = Field(..., gt=0, description="Carbon price in USD per tonne CO2")
+    coverage_percent: float = Field(..., ge=10, le=90, description="Emission coverage percentage")
+    year: int = Field(2025, ge=2000, le=2050, description="Policy start year")
+    projection_years: int = Field(5, ge=1, le=20, description="Number of years to project (1-20)")
+    price_schedule: Optional[PriceSchedule] = Field(None, description="Carbon price trajectory from carbon_price_usd; constant when omitted")
+
+class AggregateMember(BaseModel):
+    country: str
+    prediction: PredictionResponse
+
+class AggregateSkipped(BaseModel):
+    country: str
+    reason: str
+
+class AggregateYearTotals(BaseModel):
+    year: int
+    revenue_million: float
+    cumulative_revenue_million: float
+    co2_reduced_mt: float
+    co2_reduced_cumulative_mt: float
+    co2_after_reduction_mt: float
+    risk_adjusted_value_million: float
+
+class AggregateTotals(BaseModel):
+    revenue_million: float
+    risk_adjusted_value_million: float
+    abolishment_risk_percent: float = Field(..., description="Revenue-weighted mean abolishment risk of the members (%)")
+    total_country_co2_mt: float
+    co2_covered_mt: float
+    co2_reduced_mt: float
+    projections: List[AggregateYearTotals]
+
+class AggregateResponse(BaseModel):
+    members: List[AggregateMember]
+    skipped: List[AggregateSkipped] = Field(..., description="Requested countries left out for missing data")
+    totals: AggregateTotals
+
 class SimulationSummary(BaseModel):
     id: int
     policy_name: Optional[str]
@@ -0,0 +1,65 @@
+import numpy as np
+from .runtime import active_bundle
+from .services import SERIES_METRICS
+
+MAX_SERIES_COUNTRIES = 60
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets: keeps the first and last points and,
+    # from each of threshold - 2 equal buckets in between, the point forming
+    # the largest triangle with the previous pick and the next bucket's mean.
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.floor(np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    picked = np.empty(threshold, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        picked[bucket + 1] = a
+    return picked
+
+def _downsample(values: dict, years: np.ndarray, points: int, by: str) -> np.ndarray:
+    # Rows to keep: LTTB over the years where the `by` metric is present,
+    # evenly spaced rows when it has no values at all.
+    present = np.flatnonzero(~np.isnan(values[by]))
+    if not len(present):
+        return np.unique(np.linspace(0, len(years) - 1, min(points, len(years))).round().astype(np.int64))
+    return present[lttb_indices(years[present].astype(np.float64), values[by][present], points)]
+
+def _column(metric: str, values: np.ndarray):
+    if metric == 'population':
+        # Whole numbers, null where missing.
+        return np.where(np.isnan(values), None, np.nan_to_num(values).astype(np.int64)).tolist()
+    return values
+
+def country_series(countries, start: int = None, end: int = None, points: int = None, by: str = 'co2_mt'):
+    # Observed CO2, GDP, population and fossil share for each country over
+    # [start, end] as column arrays sliced from the bundle's series table,
+    # optionally downsampled to `points` per country. Returns (series,
+    # skipped) like the aggregate members/skipped lists.
+    table = active_bundle().series_table
+    start = table['first_year'] if start is None else max(start, table['first_year'])
+    end = table['last_year'] if end is None else min(end, table['last_year'])
+    end = max(end, start - 1)
+    years = np.arange(start, end + 1)
+    offsets = slice(start - table['first_year'], end - table['first_year'] + 1)
+
+    series, skipped = [], []
+    for country in dict.fromkeys(countries):
+        entity_id = table['entity_ids'].get(country)
+        if entity_id is None:
+            skipped.append({'country': country, 'reason': f"No data found for {country}"})
+            continue
+        values = {metric: table[metric][entity_id, offsets] for metric in SERIES_METRICS}
+        rows = slice(None) if points is None else _downsample(values, years, points, by)
+        entry = {'country': country, 'year': years[rows]}
+        entry.update((metric, _column(metric, values[metric][rows])) for metric in SERIES_METRICS)
+        series.append(entry)
+    return series, skipped
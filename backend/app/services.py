@@ -1,24 +1,199 @@
+import hashlib
+import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from .mappings import get_region, get_income_level
+from .storage import file_fingerprint
+from .runtime import active_bundle
+from .memo import memoize
 
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR.parent.parent / "dataset"
 
-energy_data = None
-gdp_data = None
-population_data = None
-co2_data = None
+ENERGY_FILE = DATA_DIR / "energy mix dataset" / "per-capita-energy-stacked.csv"
+GDP_FILE = DATA_DIR / "gdp data" / "gdp-penn-world-table.csv"
+POPULATION_FILE = DATA_DIR / "population dataset" / "population.csv"
+CO2_FILE = DATA_DIR / "annual_co2_per_country" / "annual-co2-emissions-per-country.csv"
+GDP_GROWTH_FILE = DATA_DIR / "gdp data" / "real-gdp-growth.csv"
+
+# Columns each lookup below reads; everything else in the OWID files (Code,
+# unused energy sources) is dropped at load time.
+# The fossil_fuel_pct feature reads these names, which are not in
+# per-capita-energy-stacked.csv, so predictions run on its 70.0 fallback.
+# Left as is here: correcting the model input is a change of its own.
+FEATURE_ENERGY_COLUMNS = [
+    'Coal (kWh per capita)', 'Oil (kWh per capita)', 'Gas (kWh per capita)',
+    'Primary energy (kWh per capita)', 'Total (kWh per capita)', 'Total energy (kWh per capita)',
+    'Nuclear (kWh per capita)', 'Hydro (kWh per capita)', 'Wind (kWh per capita)',
+    'Solar (kWh per capita)', 'Other renewables (kWh per capita)',
+]
+# The file's real per-source columns, for the fossil share in the series
+# table: coal + oil + gas over every source, as in the training data
+# preparation.
+SERIES_FOSSIL_COLUMNS = ['Coal per capita (kWh)', 'Oil per capita (kWh)', 'Gas per capita (kWh)']
+SERIES_ENERGY_COLUMNS = SERIES_FOSSIL_COLUMNS + [
+    'Nuclear per capita (kWh - equivalent)', 'Hydro per capita (kWh - equivalent)',
+    'Wind per capita (kWh - equivalent)', 'Solar per capita (kWh - equivalent)',
+    'Other renewables per capita (kWh - equivalent)',
+]
+ENERGY_COLUMNS = FEATURE_ENERGY_COLUMNS + SERIES_ENERGY_COLUMNS
+GDP_COLUMNS = ['GDP (output, multiple price benchmarks)']
+POPULATION_COLUMNS = ['all years']
+CO2_COLUMNS = ['Annual CO₂ emissions']
+GDP_GROWTH_COLUMNS = ['Gross domestic product, constant prices - Percent change - Observations']
+
+# When set, rows before this year are dropped to save memory. Off by
+# default: /country-info and /country-series serve earlier years, which
+# /country-info then rejects. Predictions start in 2000 at the earliest,
+# so a value up to 2000 never changes a prediction.
+DATASET_MIN_YEAR = int(os.getenv("DATASET_MIN_YEAR", "0"))
+
+# Years covered by the precomputed CO2 table, and the annual growth applied
+# past each entity's latest reported year.
+CO2_TABLE_FIRST_YEAR = 1750
+CO2_TABLE_LAST_YEAR = 2100
+CO2_GROWTH_RATE = 0.007
+
+# When set, each CSV is converted once to an uncompressed Arrow file in this
+# directory and memory-mapped; numeric columns then live in the page cache
+# and are shared by every worker process instead of copied into each heap.
+DATASET_CACHE_DIR = os.getenv("DATASET_CACHE_DIR")
+
+# Per-country real GDP growth for projections: the mean of each country's
+# last GDP_GROWTH_WINDOW observed years (0 turns the table off, so every
+# country uses the flat projections.GDP_GROWTH_RATE). With GDP_GROWTH_TREND
+# the least-squares slope over the same years is extrapolated as well.
+# Annual rates are clipped to [GDP_GROWTH_MIN, GDP_GROWTH_MAX].
+GDP_GROWTH_WINDOW = int(os.getenv("GDP_GROWTH_WINDOW", "10"))
+GDP_GROWTH_TREND = os.getenv("GDP_GROWTH_TREND", "false").lower() == "true"
+GDP_GROWTH_MIN = -0.05
+GDP_GROWTH_MAX = 0.10
+
+def _compact_numeric(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_numeric(values, downcast='integer')
+    narrowed = values.astype('float32')
+    if np.array_equal(narrowed.to_numpy(dtype='float64'), values.to_numpy(), equal_nan=True):
+        return narrowed
+    return values
+
+def read_lean_csv(path: Path, value_columns: list, min_year: int = DATASET_MIN_YEAR) -> pd.DataFrame:
+    # Entity becomes a categorical (one small int code per row instead of a
+    # Python string), Year and integer values are downcast, and float values
+    # become float32 only where that is lossless.
+    wanted = {'Entity', 'Year', *value_columns}
+    df = pd.read_csv(path, usecols=lambda column: column in wanted)
+    if min_year:
+        df = df[df['Year'] >= min_year]
+    df = df.reset_index(drop=True)
+    df['Entity'] = df['Entity'].astype('category').cat.remove_unused_categories()
+    for column in df.columns:
+        if column != 'Entity':
+            df[column] = _compact_numeric(df[column])
+    return df
+
+def _columns_key(columns) -> str:
+    return hashlib.sha256('\0'.join(columns).encode('utf-8')).hexdigest()[:8]
+
+def _read_dataset(path: Path, value_columns: list) -> pd.DataFrame:
+    if not DATASET_CACHE_DIR:
+        return read_lean_csv(path, value_columns)
+
+    import pyarrow.feather as feather
+
+    cache = Path(DATASET_CACHE_DIR) / f"{path.stem}-{file_fingerprint([path])}-{_columns_key(value_columns)}-{DATASET_MIN_YEAR}.arrow"
+    if not cache.exists():
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+        feather.write_feather(read_lean_csv(path, value_columns), tmp, compression='uncompressed')
+        os.replace(tmp, cache)
+    return feather.read_table(cache, memory_map=True).to_pandas(split_blocks=True)
 
 def load_all_data():
-    global energy_data, gdp_data, population_data, co2_data
+    frames = {
+        'energy_data': _read_dataset(ENERGY_FILE, ENERGY_COLUMNS),
+        'gdp_data': _read_dataset(GDP_FILE, GDP_COLUMNS),
+        'population_data': _read_dataset(POPULATION_FILE, POPULATION_COLUMNS),
+        'co2_data': _read_dataset(CO2_FILE, CO2_COLUMNS),
+    }
+    return {
+        **frames,
+        'co2_table': build_co2_table(frames['co2_data']),
+        'available_countries': build_available_countries(**frames),
+        'series_table': build_series_table(**frames),
+        'gdp_growth_table': build_gdp_growth_table(_read_dataset(GDP_GROWTH_FILE, GDP_GROWTH_COLUMNS)),
+        'data_version': file_fingerprint([ENERGY_FILE, GDP_FILE, POPULATION_FILE, CO2_FILE, GDP_GROWTH_FILE]),
+    }
+
+# Names the GDP table may use instead; only tried for the exact year.
+GDP_ALTERNATE_NAMES = {
+    'United States': 'United States of America',
+    'Russia': 'Russian Federation',
+    'South Korea': 'Republic of Korea',
+    'Iran': 'Islamic Republic of Iran',
+}
+
+def _row_index_by_entity(frame: pd.DataFrame, countries, year: int, latest: bool = True) -> dict:
+    # Index of the row each scalar lookup picks for every country in one
+    # pass: the requested year, else (if latest) the most recent year.
+    subset = frame[frame['Entity'].isin(list(countries))]
+    picked = {}
+    if latest:
+        recent = subset.sort_values('Year', ascending=False).drop_duplicates('Entity')
+        picked.update(zip(recent['Entity'], recent.index))
+    exact = subset[subset['Year'] == year].drop_duplicates('Entity')
+    picked.update(zip(exact['Entity'], exact.index))
+    return picked
+
+def get_countries_features(countries, year: int):
+    # get_country_features for many countries with one filter per dataset.
+    # Returns (features by country, error message by country).
+    bundle = active_bundle()
+    countries = list(dict.fromkeys(countries))
+    energy_rows = _row_index_by_entity(bundle.energy_data, countries, year)
+    population_rows = _row_index_by_entity(bundle.population_data, countries, year)
+    gdp_rows = _row_index_by_entity(bundle.gdp_data, countries, year)
+    alternate_gdp_rows = _row_index_by_entity(
+        bundle.gdp_data, [GDP_ALTERNATE_NAMES[c] for c in countries if c in GDP_ALTERNATE_NAMES], year, latest=False
+    )
+
+    features = {}
+    errors = {}
+    for country in countries:
+        if country in population_rows:
+            population = int(bundle.population_data.at[population_rows[country], 'all years'])
+        else:
+            errors[country] = f"Population data not found for {country}"
+            continue
+
+        gdp_row = gdp_rows.get(country, alternate_gdp_rows.get(GDP_ALTERNATE_NAMES.get(country)))
+        if gdp_row is None:
+            errors[country] = f"GDP data not found for {country}"
+            continue
+
+        if country in energy_rows:
+            fossil_fuel_pct = _fossil_fuel_pct_from_row(bundle.energy_data.loc[energy_rows[country]])
+        else:
+            fossil_fuel_pct = 70.0
+
+        features[country] = {
+            'region': get_region(country),
+            'income_group': get_income_level(country),
+            'fossil_fuel_pct': fossil_fuel_pct,
+            'population': population,
+            'gdp': _gdp_million(bundle.gdp_data.at[gdp_row, 'GDP (output, multiple price benchmarks)'])
+        }
+    return features, errors
 
-    energy_data = pd.read_csv(DATA_DIR / "energy mix dataset" / "per-capita-energy-stacked.csv")
-    gdp_data = pd.read_csv(DATA_DIR / "gdp data" / "gdp-penn-world-table.csv")
-    population_data = pd.read_csv(DATA_DIR / "population dataset" / "population.csv")
-    co2_data = pd.read_csv(DATA_DIR / "annual_co2_per_country" / "annual-co2-emissions-per-country.csv")
+def countries_with_co2_data(countries) -> set:
+    co2_data = active_bundle().co2_data
+    return set(co2_data.loc[co2_data['Entity'].isin(list(countries)), 'Entity'].unique())
 
 def get_country_features(country: str, year: int):
+    return dict(memoize('country_features', (country, year), lambda: _country_features(country, year)))
+
+def _country_features(country: str, year: int):
     region = get_region(country)
     income_group = get_income_level(country)
     fossil_fuel_pct = get_country_fossil_fuel_pct(country, year)
@@ -34,6 +209,7 @@ def get_country_features(country: str, year: int):
     }
 
 def get_country_fossil_fuel_pct(country: str, year: int) -> float:
+    energy_data = active_bundle().energy_data
     data = energy_data[(energy_data['Entity'] == country) & (energy_data['Year'] == year)]
 
     if data.empty:
@@ -44,8 +220,9 @@ def get_country_fossil_fuel_pct(country: str, year: int) -> float:
     if data.empty:
         return 70.0
 
-    row = data.iloc[0]
+    return _fossil_fuel_pct_from_row(data.iloc[0])
 
+def _fossil_fuel_pct_from_row(row) -> float:
     coal = row.get('Coal (kWh per capita)', 0) or 0
     oil = row.get('Oil (kWh per capita)', 0) or 0
     gas = row.get('Gas (kWh per capita)', 0) or 0
@@ -72,6 +249,7 @@ def get_country_fossil_fuel_pct(country: str, year: int) -> float:
     return round(fossil_pct, 2)
 
 def get_country_gdp(country: str, year: int) -> float:
+    gdp_data = active_bundle().gdp_data
     data = gdp_data[(gdp_data['Entity'] == country) & (gdp_data['Year'] == year)]
 
     if data.empty:
@@ -80,26 +258,21 @@ def get_country_gdp(country: str, year: int) -> float:
             data = country_data.sort_values('Year', ascending=False).head(1)
 
     if data.empty:
-        alternate_names = {
-            'United States': 'United States of America',
-            'Russia': 'Russian Federation',
-            'South Korea': 'Republic of Korea',
-            'Iran': 'Islamic Republic of Iran',
-        }
-
-        if country in alternate_names:
-            alt_country = alternate_names[country]
+        if country in GDP_ALTERNATE_NAMES:
+            alt_country = GDP_ALTERNATE_NAMES[country]
             data = gdp_data[(gdp_data['Entity'] == alt_country) & (gdp_data['Year'] == year)]
 
     if data.empty:
         raise ValueError(f"GDP data not found for {country}")
 
-    gdp_intl = data['GDP (output, multiple price benchmarks)'].values[0]
-    gdp_million = gdp_intl / 1_000_000
+    return _gdp_million(data['GDP (output, multiple price benchmarks)'].values[0])
 
+def _gdp_million(gdp_intl) -> float:
+    gdp_million = gdp_intl / 1_000_000
     return round(gdp_million, 2)
 
 def get_country_population(country: str, year: int) -> int:
+    population_data = active_bundle().population_data
     data = population_data[(population_data['Entity'] == country) & (population_data['Year'] == year)]
 
     if data.empty:
@@ -113,7 +286,67 @@ def get_country_population(country: str, year: int) -> int:
     population = int(data['all years'].values[0])
     return population
 
+def build_co2_table(co2_data: pd.DataFrame) -> dict:
+    # Entity x year array of CO2 totals (million tonnes), built once per
+    # bundle. Each cell holds what the scalar lookup returns: the observed
+    # value for that year, else the latest observed value, grown by
+    # CO2_GROWTH_RATE a year past the latest year.
+    codes, entities = pd.factorize(co2_data['Entity'])
+    years = co2_data['Year'].to_numpy(dtype=np.int64)
+    values = co2_data['Annual CO₂ emissions'].to_numpy(dtype=np.float64)
+
+    # Latest row per entity; the first row wins among duplicate years.
+    order = np.lexsort((-np.arange(len(years)), years, codes))
+    last = order[np.r_[codes[order][1:] != codes[order][:-1], True]] if len(order) else order
+    latest_value = values[last]
+
+    offsets = np.arange(CO2_TABLE_FIRST_YEAR, CO2_TABLE_LAST_YEAR + 1)[None, :] - years[last][:, None]
+    table = np.where(
+        offsets > 0,
+        latest_value[:, None] * (1 + CO2_GROWTH_RATE) ** offsets,
+        np.broadcast_to(latest_value[:, None], offsets.shape)
+    )
+    observed = np.flatnonzero((years >= CO2_TABLE_FIRST_YEAR) & (years <= CO2_TABLE_LAST_YEAR))[::-1]
+    table[codes[observed], years[observed] - CO2_TABLE_FIRST_YEAR] = values[observed]
+
+    return {
+        'entity_ids': {str(entity): i for i, entity in enumerate(entities)},
+        'values': table / 1_000_000,
+    }
+
+def co2_entity_ids(countries) -> np.ndarray:
+    # Row of each country in the CO2 table; ValueError for a country with no
+    # CO2 data, as the scalar lookup raises.
+    entity_ids = active_bundle().co2_table['entity_ids']
+    ids = []
+    for country in countries:
+        if country not in entity_ids:
+            raise ValueError(f"CO2 data not found for {country}")
+        ids.append(entity_ids[country])
+    return np.array(ids, dtype=np.int64)
+
+def co2_totals(entity_ids, years) -> np.ndarray:
+    # Vectorized get_country_total_co2: entity ids and years broadcast
+    # together. Years outside the table fall back to the scalar lookup.
+    table = active_bundle().co2_table
+    entity_ids, years = np.broadcast_arrays(np.asarray(entity_ids, dtype=np.int64), np.asarray(years, dtype=np.int64))
+    offsets = years - CO2_TABLE_FIRST_YEAR
+    inside = (offsets >= 0) & (years <= CO2_TABLE_LAST_YEAR)
+    totals = table['values'][entity_ids, np.where(inside, offsets, 0)]
+    if not inside.all():
+        names = {i: name for name, i in table['entity_ids'].items()}
+        for index in zip(*np.nonzero(~inside)):
+            totals[index] = _country_total_co2(names[entity_ids[index]], int(years[index]))
+    return totals
+
 def get_country_total_co2(country: str, year: int) -> float:
+    if not CO2_TABLE_FIRST_YEAR <= year <= CO2_TABLE_LAST_YEAR:
+        return _country_total_co2(country, year)
+    entity_id = co2_entity_ids([country])[0]
+    return active_bundle().co2_table['values'][entity_id, year - CO2_TABLE_FIRST_YEAR]
+
+def _country_total_co2(country: str, year: int) -> float:
+    co2_data = active_bundle().co2_data
     data = co2_data[(co2_data['Entity'] == country) & (co2_data['Year'] == year)]
 
     if data.empty:
@@ -124,7 +357,7 @@ def get_country_total_co2(country: str, year: int) -> float:
 
             if year > baseline_year:
                 year_offset = year - baseline_year
-                growth_rate = 0.007
+                growth_rate = CO2_GROWTH_RATE
                 projection_multiplier = (1 + growth_rate) ** year_offset
                 co2_tonnes = data['Annual CO₂ emissions'].values[0] * projection_multiplier
             else:
@@ -137,10 +370,8 @@ def get_country_total_co2(country: str, year: int) -> float:
     co2_million_tonnes = co2_tonnes / 1_000_000
     return co2_million_tonnes
 
-def get_available_countries():
-    if energy_data is None:
-        load_all_data()
-
+def build_available_countries(energy_data, gdp_data, population_data, co2_data) -> tuple:
+    # Countries present in all four datasets, computed once per bundle.
     energy_countries = set(energy_data['Entity'].unique())
     gdp_countries = set(gdp_data['Entity'].unique())
     population_countries = set(population_data['Entity'].unique())
@@ -148,4 +379,122 @@ def get_available_countries():
 
     complete_countries = energy_countries & gdp_countries & population_countries & co2_countries
 
-    return sorted(list(complete_countries))
+    return tuple(sorted(complete_countries))
+
+def get_available_countries():
+    return list(active_bundle().available_countries)
+
+SERIES_METRICS = ('co2_mt', 'gdp_million', 'population', 'fossil_fuel_pct')
+
+def _series_fossil_fuel_pct_column(energy_data: pd.DataFrame) -> np.ndarray:
+    # Fossil share for every row, in float64, from the file's real columns
+    # (missing sources count as zero). Unlike the prediction feature it
+    # varies by country and year; a total-energy column, when the file has
+    # one, is still preferred over the sum of sources.
+    def column(name):
+        if name in energy_data.columns:
+            return np.nan_to_num(energy_data[name].to_numpy(dtype=np.float64))
+        return np.zeros(len(energy_data))
+
+    fossil = sum(column(col) for col in SERIES_FOSSIL_COLUMNS)
+    total_cols = ['Primary energy (kWh per capita)', 'Total (kWh per capita)', 'Total energy (kWh per capita)']
+    present = [col for col in total_cols if col in energy_data.columns]
+    total = column(present[0]) if present else np.zeros(len(energy_data))
+    components = fossil + sum(column(col) for col in SERIES_ENERGY_COLUMNS if col not in SERIES_FOSSIL_COLUMNS)
+    total = np.where(total == 0, components, total)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total == 0, 70.0, np.round(fossil / total * 100, 2))
+
+def build_series_table(energy_data, gdp_data, population_data, co2_data) -> dict:
+    # Entity x year arrays of the observed values behind the features, one
+    # per SERIES_METRICS entry, NaN where a dataset has no row. Built once
+    # per bundle so a series is a slice rather than a lookup per year. Years
+    # start no earlier than CO2_TABLE_FIRST_YEAR.
+    frames = {
+        'co2_mt': (co2_data, co2_data['Annual CO₂ emissions'].to_numpy(dtype=np.float64) / 1_000_000),
+        'gdp_million': (gdp_data, np.round(gdp_data['GDP (output, multiple price benchmarks)'].to_numpy(dtype=np.float64) / 1_000_000, 2)),
+        'population': (population_data, population_data['all years'].to_numpy(dtype=np.float64)),
+        'fossil_fuel_pct': (energy_data, _series_fossil_fuel_pct_column(energy_data)),
+    }
+    entities = sorted({str(e) for frame, _ in frames.values() for e in frame['Entity'].unique()})
+    entity_ids = {entity: i for i, entity in enumerate(entities)}
+    first_year = max(CO2_TABLE_FIRST_YEAR, min(int(frame['Year'].min()) for frame, _ in frames.values()))
+    last_year = max(int(frame['Year'].max()) for frame, _ in frames.values())
+
+    table = {'entity_ids': entity_ids, 'first_year': first_year, 'last_year': last_year}
+    for metric, (frame, values) in frames.items():
+        codes, names = pd.factorize(frame['Entity'])
+        rows = np.array([entity_ids[str(name)] for name in names], dtype=np.int64)[codes]
+        years = frame['Year'].to_numpy(dtype=np.int64)
+        # Reverse order so the first row wins among duplicate years, as in
+        # the scalar lookups.
+        observed = np.flatnonzero((years >= first_year) & (years <= last_year))[::-1]
+        dense = np.full((len(entities), last_year - first_year + 1), np.nan)
+        dense[rows[observed], years[observed] - first_year] = values[observed]
+        table[metric] = dense
+
+    gdp = table['gdp_million']
+    for country, alternate in GDP_ALTERNATE_NAMES.items():
+        if country in entity_ids and alternate in entity_ids:
+            own, alt = gdp[entity_ids[country]], gdp[entity_ids[alternate]]
+            gdp[entity_ids[country]] = np.where(np.isnan(own), alt, own)
+    return table
+
+def build_gdp_growth_table(growth_data: pd.DataFrame, window: int = GDP_GROWTH_WINDOW, trend: bool = GDP_GROWTH_TREND) -> dict:
+    # One (rate, slope) pair per entity, as fractions, from its most recent
+    # `window` observed years; built once per bundle.
+    observed = growth_data.dropna(subset=GDP_GROWTH_COLUMNS)
+    if window <= 0 or observed.empty:
+        return {'entity_ids': {}, 'rate': np.full(1, np.nan), 'trend': np.zeros(1)}
+    codes, entities = pd.factorize(observed['Entity'])
+    years = observed['Year'].to_numpy(dtype=np.float64)
+    values = observed[GDP_GROWTH_COLUMNS[0]].to_numpy(dtype=np.float64) / 100
+
+    # Rank rows within each entity from the latest year back; keep the first
+    # `window` of them.
+    order = np.lexsort((-years, codes))
+    starts = np.r_[0, np.flatnonzero(codes[order][1:] != codes[order][:-1]) + 1]
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    recent = order[rank < window]
+    ids, x, y = codes[recent], years[recent], values[recent]
+
+    n = np.bincount(ids, minlength=len(entities))
+    mean_x = np.bincount(ids, x, len(entities)) / n
+    mean_y = np.bincount(ids, y, len(entities)) / n
+    slope = np.zeros(len(entities))
+    if trend:
+        dx = x - mean_x[ids]
+        sxx = np.bincount(ids, dx * dx, len(entities))
+        sxy = np.bincount(ids, dx * (y - mean_y[ids]), len(entities))
+        slope = np.divide(sxy, sxx, out=np.zeros(len(entities)), where=sxx > 0)
+        # Anchor the line at the latest observed year, where projections
+        # pick it up.
+        first = np.r_[0, np.flatnonzero(ids[1:] != ids[:-1]) + 1]
+        latest_x = np.empty(len(entities))
+        latest_x[ids[first]] = x[first]
+        mean_y = mean_y + slope * (latest_x - mean_x)
+
+    # A trailing NaN rate (and zero slope) is the row for unknown countries.
+    return {
+        'entity_ids': {str(entity): i for i, entity in enumerate(entities)},
+        'rate': np.append(np.clip(mean_y, GDP_GROWTH_MIN, GDP_GROWTH_MAX), np.nan),
+        'trend': np.append(slope, 0.0),
+    }
+
+def gdp_growth_profiles(countries):
+    # (rate, slope) arrays for each country; NaN rate for a country the
+    # growth table doesn't cover.
+    table = active_bundle().gdp_growth_table
+    ids = [table['entity_ids'].get(c, -1) for c in countries]
+    return table['rate'][ids], table['trend'][ids]
+
+def gdp_growth_multiplier(rate, trend, offset) -> np.ndarray:
+    # Cumulative GDP growth after `offset` years at rate + trend * year,
+    # each year's rate clipped; (1 + rate) ** offset when there is no trend.
+    if not np.any(trend):
+        return (1 + rate) ** offset
+    rate, trend, offset = np.broadcast_arrays(np.asarray(rate, dtype=np.float64), np.asarray(trend, dtype=np.float64), np.asarray(offset))
+    steps = np.arange(max(int(offset.max()), 1))
+    factors = 1 + np.clip(rate[..., None] + trend[..., None] * steps, GDP_GROWTH_MIN, GDP_GROWTH_MAX)
+    cumulative = np.concatenate([np.ones(rate.shape + (1,)), np.cumprod(factors, axis=-1)], axis=-1)
+    return np.take_along_axis(cumulative, offset[..., None], axis=-1)[..., 0]
@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body, Form, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Form, Body, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_, func, insert, select
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.exc import OperationalError
-from typing import List
-from .database import get_db
-from .models import Simulation, User, Comparison
+from typing import List, Optional
+from .database import get_db, SessionLocal
+from .models import Simulation, User, Comparison, SimulationProjection
 from .schemas import SimulationSummary, SimulationDetail, CompareSimulationsRequest, PredictionRequest, PredictionResponse, SaveComparisonRequest, ComparisonSummary, ComparisonDetail
 from .auth_routes import get_current_user
 from .services import get_country_features
-from .predict import predict_revenue, predict_success
-from .calculations import calculate_co2_impact, calculate_equivalencies
-from .context import generate_context
+from .projections import run_prediction_results
+from .storage import encode_results, load_results, input_hash, projection_rows
+from .exporters import EXPORT_MEDIA_TYPES, iter_ndjson, iter_csv, iter_parquet, FastJSONResponse, compact_results
+from .http_cache import make_etag, etag_matches, cache_headers, not_modified, PRIVATE_CACHE_CONTROL
 from .errors import (
     raise_validation_error, raise_not_found_error, raise_service_unavailable_error,
     raise_internal_error
@@ -17,9 +20,7 @@ from .errors import (
 
 router = APIRouter(prefix="/simulations", tags=["simulations"])
 
-def _run_prediction(request: PredictionRequest) -> PredictionResponse:
-    from .schemas import YearProjection
-    
+def _validate_prediction_request(request: PredictionRequest):
     if request.carbon_price_usd <= 0:
         raise_validation_error(
             "Carbon price must be greater than 0",
@@ -67,242 +68,164 @@ def _run_prediction(request: PredictionRequest) -> PredictionResponse:
             field="policy_type"
         )
 
-    try:
-        country_features = get_country_features(request.country, request.year)
-    except ValueError as e:
-        raise_validation_error(
-            f"Data is not available for {request.country} for the year {request.year}. Please try a different country or year.",
-            field="country",
-            details={"country": request.country, "year": request.year}
-        )
-
-    region = country_features['region']
-    fossil_fuel_pct = country_features['fossil_fuel_pct']
-    population = country_features['population']
-    gdp = country_features['gdp']
-
-    predicted_revenue = predict_revenue(
-        request.country,
-        request.policy_type,
-        request.carbon_price_usd,
-        request.coverage_percent,
-        request.year,
-        fossil_fuel_pct,
-        population,
-        gdp
-    )
-
-    co2_impact = calculate_co2_impact(
-        request.coverage_percent,
-        request.country,
-        request.year,
-        request.carbon_price_usd
-    )
-
-    if co2_impact is None:
-        co2_impact = {
-            'total_country_co2_mt': 0.0,
-            'co2_covered_mt': 0.0,
-            'co2_covered_percent': request.coverage_percent,
-            'co2_uncovered_mt': 0.0,
-            'co2_uncovered_percent': 100 - request.coverage_percent,
-            'co2_potentially_reduced_mt': 0.0,
-            'co2_covered_per_capita_tonnes': 0.0,
-            'reduction_rate_used': 0.0,
-            'carbon_price_usd': request.carbon_price_usd,
-        }
-    
-    equivalencies = calculate_equivalencies(co2_impact['co2_potentially_reduced_mt'])
-
-    abolishment_risk, risk_category, confidence = predict_success(
-        request.country,
-        request.policy_type,
-        request.coverage_percent,
-        request.year,
-        fossil_fuel_pct,
-        gdp
-    )
+def _run_predictions(requests: List[PredictionRequest]) -> List[dict]:
+    country_features = []
+    for request in requests:
+        _validate_prediction_request(request)
+        try:
+            country_features.append(get_country_features(request.country, request.year))
+        except ValueError as e:
+            raise_validation_error(
+                f"Data is not available for {request.country} for the year {request.year}. Please try a different country or year.",
+                field="country",
+                details={"country": request.country, "year": request.year}
+            )
 
-    if risk_category == "Low Risk":
-        risk_adjusted_value = predicted_revenue
-    else:
-        success_probability = 1 - (abolishment_risk / 100)
-        risk_adjusted_value = max(0.0, predicted_revenue * success_probability)
-    
-    risk_adjusted_value = max(0.0, risk_adjusted_value) if risk_adjusted_value is not None else 0.0
-
-    context = generate_context(
-        request.country,
-        request.policy_type,
-        request.carbon_price_usd,
-        request.coverage_percent,
-        predicted_revenue,
-        abolishment_risk,
-        risk_category,
-        region
-    )
-    
-    if not context.get('recommendation') or not isinstance(context['recommendation'], str):
-        context['recommendation'] = 'Policy assessment available.'
-    if not context.get('similar_policies') or not isinstance(context['similar_policies'], list) or len(context['similar_policies']) == 0:
-        context['similar_policies'] = ['Historical policy data analysis available.']
-    if not context.get('key_risks') or not isinstance(context['key_risks'], list) or len(context['key_risks']) == 0:
-        context['key_risks'] = ['Standard implementation considerations apply.']
-    if not context.get('success_context') or not context['success_context'].get('context_message') or not isinstance(context['success_context']['context_message'], str):
-        context['success_context'] = {
-            'context_message': f'Risk assessment for {request.country} based on regional patterns and economic factors.',
-            'recommendation': context.get('recommendation', 'Policy assessment available.'),
-            'has_historical_data': False,
-            'confidence': 'Medium'
-        }
+    return run_prediction_results(requests, country_features)
 
-    projections = []
-    cumulative_co2_reduced = 0.0
-    cumulative_revenue = 0.0
-    base_year_co2 = co2_impact['total_country_co2_mt'] if co2_impact else 0.0
-    
-    projection_years = max(1, min(20, request.projection_years))
-    previous_revenue = predicted_revenue
-    
-    gdp_growth_rate = 0.03
-    population_growth_rate = 0.01
-    fossil_fuel_decline_rate = 0.005
-    min_revenue_growth_rate = 0.015
-    
-    for year_offset in range(projection_years):
-        future_year = request.year + year_offset
+def _run_prediction(request: PredictionRequest) -> dict:
+    return _run_predictions([request])[0]
 
-        if year_offset == 0:
-            future_features = country_features
-        else:
-            future_features = {
-                'fossil_fuel_pct': max(0, country_features['fossil_fuel_pct'] - (fossil_fuel_decline_rate * year_offset * 100)),
-                'population': country_features['population'] * ((1 + population_growth_rate) ** year_offset),
-                'gdp': country_features['gdp'] * ((1 + gdp_growth_rate) ** year_offset),
-                'region': country_features['region'],
-                'income_group': country_features['income_group']
-            }
+def generate_policy_name(input_params: dict) -> str:
+    country = input_params.get("country", "Unknown")
+    policy_type = input_params.get("policy_type", "Policy")
+    year = input_params.get("year", "")
+    return f"{policy_type} - {country} {year}"
 
-        carbon_price = request.carbon_price_usd
+def _convert_id(id_value):
+    if id_value is None:
+        return None
+    if id_value == '' or id_value == 'null' or id_value == 'undefined':
+        return None
+    if isinstance(id_value, int):
+        return id_value
+    if isinstance(id_value, float):
+        return int(id_value)
+    if isinstance(id_value, str):
+        try:
+            return int(id_value)
+        except (ValueError, TypeError):
+            return None
+    return None
 
-        if year_offset == 0:
-            future_revenue = predicted_revenue
-        else:
-            future_revenue = predict_revenue(
-                request.country,
-                request.policy_type,
-                carbon_price,
-                request.coverage_percent,
-                future_year,
-                future_features['fossil_fuel_pct'],
-                future_features['population'],
-                future_features['gdp']
-            )
-            
-            if future_revenue <= 0:
-                from .predict import calculate_revenue_formula
-                future_revenue = calculate_revenue_formula(carbon_price, request.coverage_percent, request.country, future_year)
-            
-            min_expected_revenue = previous_revenue * (1 + min_revenue_growth_rate)
-            if future_revenue < min_expected_revenue:
-                future_revenue = min_expected_revenue
-            
-            max_reasonable_multiplier = 3.0
-            if future_revenue > previous_revenue * max_reasonable_multiplier:
-                future_revenue = previous_revenue * max_reasonable_multiplier
-        
-        previous_revenue = future_revenue
-
-        future_co2 = calculate_co2_impact(
-            request.coverage_percent,
-            request.country,
-            future_year,
-            carbon_price
-        )
-        
-        if future_co2 is None:
-            future_co2 = {
-                'total_country_co2_mt': 0.0,
-                'co2_covered_mt': 0.0,
-                'co2_potentially_reduced_mt': 0.0,
-                'co2_covered_per_capita_tonnes': 0.0
-            }
+def _find_saved_simulation_id(db: Session, user_id: int, simulation_id, policy_input: dict):
+    from pydantic import ValidationError
 
-        future_abolishment, _, _ = predict_success(
-            request.country,
-            request.policy_type,
-            request.coverage_percent,
-            future_year,
-            future_features['fossil_fuel_pct'],
-            future_features['gdp']
-        )
+    query = db.query(Simulation.id).filter(Simulation.user_id == user_id)
+    simulation_id = _convert_id(simulation_id)
+    if simulation_id:
+        return query.filter(Simulation.id == simulation_id).scalar()
 
-        risk_escalation_rate = 0.005
-        time_escalated_risk = min(100.0, future_abolishment + (risk_escalation_rate * 100 * year_offset))
+    try:
+        normalized_input = PredictionRequest(**policy_input).dict()
+    except ValidationError:
+        return None
 
-        if time_escalated_risk < 35:
-            escalated_risk_category = "Low Risk"
-        elif time_escalated_risk > 65:
-            escalated_risk_category = "High Risk"
-        else:
-            escalated_risk_category = "At Risk"
+    return query.filter(
+        Simulation.input_hash == input_hash(normalized_input)
+    ).order_by(Simulation.id.desc()).limit(1).scalar()
 
-        if escalated_risk_category == "Low Risk":
-            future_risk_adjusted_value = future_revenue
-        else:
-            success_probability = 1 - (time_escalated_risk / 100)
-            future_risk_adjusted_value = max(0.0, future_revenue * success_probability)
-
-        annual_co2_reduced = round(future_co2['co2_potentially_reduced_mt'], 3) if future_co2 else 0
-        annual_co2_reduced = max(0.0, annual_co2_reduced)
-        cumulative_co2_reduced += annual_co2_reduced
-        cumulative_revenue += future_revenue
-        
-        future_total_co2 = future_co2['total_country_co2_mt'] if future_co2 else base_year_co2
-        future_total_co2 = max(0.0, future_total_co2)
-        co2_after_reduction = max(0.0, future_total_co2 - annual_co2_reduced)
-        co2_reduced_from_base = max(0.0, cumulative_co2_reduced)
-
-        projection_entry = {
-            'year': int(future_year),
-            'revenue_million': max(0.0, round(future_revenue, 2)),
-            'co2_reduced_mt': max(0.0, annual_co2_reduced),
-            'co2_reduced_cumulative_mt': max(0.0, round(cumulative_co2_reduced, 3)),
-            'co2_after_reduction_mt': max(0.0, round(co2_after_reduction, 2)),
-            'co2_reduced_from_base_mt': max(0.0, round(co2_reduced_from_base, 3)),
-            'abolishment_risk_percent': max(0.0, min(100.0, round(time_escalated_risk, 1))),
-            'risk_category': str(escalated_risk_category) if escalated_risk_category else "At Risk",
-            'risk_adjusted_value_million': max(0.0, round(future_risk_adjusted_value, 2)),
-            'cumulative_revenue_million': max(0.0, round(cumulative_revenue, 2))
-        }
-        projections.append(projection_entry)
-
-    return PredictionResponse(
-        revenue_million=round(predicted_revenue, 2),
-        abolishment_risk_percent=round(abolishment_risk, 1),
-        risk_category=risk_category,
-        total_country_co2_mt=co2_impact['total_country_co2_mt'],
-        co2_covered_mt=co2_impact['co2_covered_mt'],
-        co2_reduced_mt=co2_impact['co2_potentially_reduced_mt'],
-        co2_covered_per_capita_tonnes=co2_impact['co2_covered_per_capita_tonnes'],
-        cars_off_road_equivalent=equivalencies['cars_off_road_1year'],
-        trees_planted_equivalent=equivalencies['trees_planted_1year'],
-        coal_plants_closed_equivalent=equivalencies['coal_plants_closed'],
-        homes_powered_equivalent=equivalencies['homes_powered_clean_1year'],
-        equivalencies_source=equivalencies['source_context'],
-        risk_adjusted_value_million=max(0.0, round(risk_adjusted_value, 2)) if risk_adjusted_value is not None else 0.0,
-        recommendation=context.get('recommendation', 'Policy assessment available.'),
-        similar_policies=context.get('similar_policies', ['Historical policy data analysis available.']),
-        key_risks=context.get('key_risks', ['Standard implementation considerations apply.']),
-        context_explanation=context.get('success_context', {}).get('context_message', f'Risk assessment for {request.country} based on regional patterns and economic factors.'),
-        projections=projections if isinstance(projections, list) else []
-    )
+def _load_referenced_inputs(db: Session, comparisons) -> dict:
+    ids = set()
+    for comp in comparisons:
+        ids.update(i for i in (comp.simulation_1_id, comp.simulation_2_id) if i)
+    if not ids:
+        return {}
+    rows = db.query(Simulation.id, Simulation.input_params).filter(Simulation.id.in_(ids)).all()
+    return {row.id: row.input_params for row in rows}
+
+def _inline_comparison_references(db: Session, simulations):
+    # Comparisons that point at a simulation being deleted get its input copied
+    # back in so they stay readable once the row is gone.
+    by_id = {sim.id: sim for sim in simulations}
+    if not by_id:
+        return
+    comparisons = db.query(Comparison).filter(
+        or_(Comparison.simulation_1_id.in_(by_id), Comparison.simulation_2_id.in_(by_id))
+    ).all()
+    for comp in comparisons:
+        if comp.simulation_1_id in by_id:
+            comp.simulation_1_data = {**(comp.simulation_1_data or {}), 'input': by_id[comp.simulation_1_id].input_params}
+            comp.simulation_1_id = None
+        if comp.simulation_2_id in by_id:
+            comp.simulation_2_data = {**(comp.simulation_2_data or {}), 'input': by_id[comp.simulation_2_id].input_params}
+            comp.simulation_2_id = None
+    db.flush()
+
+def _resolve_comparison_side(data, simulation_id, referenced_inputs: dict) -> dict:
+    data = dict(data) if isinstance(data, dict) else {}
+    if not data.get('input') and simulation_id in referenced_inputs:
+        data['input'] = referenced_inputs[simulation_id]
+    return data
+
+MAX_BULK_ITEMS = 1000
+
+def _parse_simulation_body(body: dict):
+    results_data = body.get('results', {})
+    policy_name = body.get('policy_name', None)
+    
+    input_body = {k: v for k, v in body.items() if k not in ['results', 'policy_name']}
+    
+    input_params = PredictionRequest(**input_body)
+    results = PredictionResponse(**results_data)
+    # /predict/all stamps its results with the version they were computed
+    # with; results without one are stored unstamped so the next recompute
+    # refreshes them.
+    version = results_data.get('results_version') if isinstance(results_data, dict) else None
+    return input_params, results, policy_name, version if isinstance(version, str) else None
+
+def _validation_error_summary(e) -> str:
+    error_messages = []
+    for err in e.errors():
+        field = ".".join(str(loc) for loc in err["loc"])
+        error_messages.append(f"{field}: {err['msg']}")
+    return "Invalid simulation data. " + "; ".join(error_messages[:3])
+
+def _simulation_values(user_id: int, input_dict: dict, results_dict: dict, policy_name, version) -> dict:
+    return {
+        'user_id': user_id,
+        'policy_name': policy_name or generate_policy_name(input_dict),
+        'country': input_dict['country'],
+        'policy_type': input_dict['policy_type'],
+        'risk_category': results_dict['risk_category'],
+        'revenue_million': results_dict['revenue_million'],
+        'input_params': input_dict,
+        'input_hash': input_hash(input_dict),
+        'results_packed': encode_results(results_dict),
+        'results_version': version
+    }
 
-def generate_policy_name(input_params: dict) -> str:
-    country = input_params.get("country", "Unknown")
-    policy_type = input_params.get("policy_type", "Policy")
-    year = input_params.get("year", "")
-    return f"{policy_type} - {country} {year}"
+def _bulk_insert_simulations(db: Session, values: list, results: list) -> list:
+    # One multi-row INSERT ... RETURNING for the simulations and one for all of
+    # their projection rows; ids come back in parameter order.
+    ids = db.execute(
+        insert(Simulation).returning(Simulation.id, sort_by_parameter_order=True),
+        values
+    ).scalars().all()
+    rows = []
+    for simulation_id, results_dict in zip(ids, results):
+        rows.extend(projection_rows(simulation_id, results_dict))
+    if rows:
+        db.execute(insert(SimulationProjection), rows)
+    return ids
+
+def _simulation_detail_response(simulation, compact: bool = False) -> FastJSONResponse:
+    # SimulationDetail for a stored row. Results were validated when saved,
+    # so the decoded payload goes out as is rather than through
+    # PredictionResponse again.
+    content = {
+        "id": simulation.id,
+        "user_id": simulation.user_id,
+        "policy_name": simulation.policy_name,
+        "created_at": simulation.created_at,
+        "input_params": simulation.input_params,
+        "results": load_results(simulation)
+    }
+    if compact:
+        strings = {}
+        content["results"] = compact_results(content["results"], strings)
+        content["strings"] = list(strings)
+    return FastJSONResponse(content)
 
 @router.post("", response_model=SimulationDetail, status_code=status.HTTP_201_CREATED)
 def save_simulation(
@@ -312,39 +235,25 @@ def save_simulation(
 ):
     from pydantic import ValidationError
     
-    results_data = body.get('results', {})
-    policy_name = body.get('policy_name', None)
-    
-    input_body = {k: v for k, v in body.items() if k not in ['results', 'policy_name']}
-    
     try:
-        input_params = PredictionRequest(**input_body)
-        results = PredictionResponse(**results_data)
+        input_params, results, policy_name, version = _parse_simulation_body(body)
     except ValidationError as e:
-        error_messages = []
-        for err in e.errors():
-            field = ".".join(str(loc) for loc in err["loc"])
-            error_messages.append(f"{field}: {err['msg']}")
         raise_validation_error(
-            "Invalid simulation data. " + "; ".join(error_messages[:3]),
+            _validation_error_summary(e),
             details={"validation_errors": e.errors()}
         )
     
     input_dict = input_params.dict()
     results_dict = results.dict()
     
-    if not policy_name:
-        policy_name = generate_policy_name(input_dict)
-    
-    simulation = Simulation(
-        user_id=current_user.id,
-        policy_name=policy_name,
-        input_params=input_dict,
-        results=results_dict
-    )
+    simulation = Simulation(**_simulation_values(current_user.id, input_dict, results_dict, policy_name, version))
     
     try:
         db.add(simulation)
+        db.flush()
+        rows = projection_rows(simulation.id, results_dict)
+        if rows:
+            db.execute(insert(SimulationProjection), rows)
         db.commit()
         db.refresh(simulation)
     except OperationalError as e:
@@ -360,18 +269,203 @@ def save_simulation(
         policy_name=simulation.policy_name,
         created_at=simulation.created_at,
         input_params=simulation.input_params,
-        results=PredictionResponse(**simulation.results)
+        results=results
     )
 
+@router.post("/bulk")
+def bulk_save_simulations(
+    body: dict = Body(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    from pydantic import ValidationError
+
+    items = body.get('items')
+    if not isinstance(items, list) or not items:
+        raise_validation_error("items must be a non-empty list of simulations", field="items")
+    if len(items) > MAX_BULK_ITEMS:
+        raise_validation_error(
+            f"Cannot save more than {MAX_BULK_ITEMS} simulations at once",
+            field="items",
+            details={"max_items": MAX_BULK_ITEMS}
+        )
+
+    outcomes = []
+    values = []
+    results = []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError("Each item must be an object")
+            input_params, item_results, policy_name, version = _parse_simulation_body(item)
+        except ValidationError as e:
+            outcomes.append({"index": index, "id": None, "error": _validation_error_summary(e)})
+            continue
+        except ValueError as e:
+            outcomes.append({"index": index, "id": None, "error": str(e)})
+            continue
+        results_dict = item_results.dict()
+        values.append(_simulation_values(current_user.id, input_params.dict(), results_dict, policy_name, version))
+        results.append(results_dict)
+        outcomes.append({"index": index, "id": None, "error": None})
+
+    if values:
+        try:
+            ids = _bulk_insert_simulations(db, values, results)
+            db.commit()
+        except OperationalError as e:
+            db.rollback()
+            raise_service_unavailable_error(
+                "Unable to save simulations due to a database connection issue. Please try again in a moment.",
+                service="database"
+            )
+        saved = iter(ids)
+        for outcome in outcomes:
+            if outcome["error"] is None:
+                outcome["id"] = next(saved)
+
+    return {
+        "saved": len(values),
+        "failed": len(outcomes) - len(values),
+        "items": outcomes
+    }
+
+@router.delete("/bulk")
+def bulk_delete_simulations(
+    body: dict = Body(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    raw_ids = body.get('ids')
+    if not isinstance(raw_ids, list) or not raw_ids:
+        raise_validation_error("ids must be a non-empty list of simulation ids", field="ids")
+    if len(raw_ids) > MAX_BULK_ITEMS:
+        raise_validation_error(
+            f"Cannot delete more than {MAX_BULK_ITEMS} simulations at once",
+            field="ids",
+            details={"max_items": MAX_BULK_ITEMS}
+        )
+
+    requested = [_convert_id(raw_id) for raw_id in raw_ids]
+    try:
+        simulations = db.query(Simulation).options(load_only(Simulation.id, Simulation.input_params)).filter(
+            Simulation.id.in_([i for i in requested if i]),
+            Simulation.user_id == current_user.id
+        ).all()
+        found = {sim.id for sim in simulations}
+        if found:
+            _inline_comparison_references(db, simulations)
+            db.query(SimulationProjection).filter(
+                SimulationProjection.simulation_id.in_(found)
+            ).delete(synchronize_session=False)
+            db.query(Simulation).filter(Simulation.id.in_(found)).delete(synchronize_session=False)
+        db.commit()
+    except OperationalError as e:
+        db.rollback()
+        raise_service_unavailable_error(
+            "Unable to delete simulations due to a database connection issue. Please try again in a moment.",
+            service="database"
+        )
+
+    outcomes = []
+    for raw_id, simulation_id in zip(raw_ids, requested):
+        if simulation_id in found:
+            outcomes.append({"id": simulation_id, "error": None})
+        else:
+            outcomes.append({"id": raw_id, "error": "Simulation not found"})
+
+    return {
+        "deleted": len(found),
+        "failed": sum(1 for outcome in outcomes if outcome["error"]),
+        "items": outcomes
+    }
+
+SIMULATION_SORT_COLUMNS = {
+    'created_at': Simulation.created_at,
+    'revenue_million': Simulation.revenue_million,
+    'policy_name': Simulation.policy_name,
+    'country': Simulation.country,
+}
+
+def _policy_name_prefix_filter(db: Session, prefix: str):
+    prefix = prefix.lower()
+    lowered = func.lower(Simulation.policy_name)
+    if db.bind.dialect.name == 'postgresql':
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return lowered.like(f"{escaped}%", escape='\\')
+    # Range scan on the lower(policy_name) expression index; the upper bound is
+    # the prefix with its last character bumped by one code point.
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return (lowered >= prefix) & (lowered < upper)
+
+def _history_etag(db: Session, user_id: int, request: Request) -> str:
+    # Watermark of the user's history: any save, delete, rename or
+    # recompute moves the count, the highest id or the latest update.
+    count, max_id, last_update = db.query(
+        func.count(Simulation.id), func.max(Simulation.id), func.max(Simulation.updated_at)
+    ).filter(Simulation.user_id == user_id).one()
+    return make_etag("simulations", user_id, count, max_id, str(last_update), sorted(request.query_params.multi_items()))
+
 @router.get("", response_model=List[SimulationSummary])
 def get_user_simulations(
+    request: Request,
+    response: Response,
+    country: Optional[List[str]] = Query(default=None),
+    policy_type: Optional[List[str]] = Query(default=None),
+    risk_category: Optional[List[str]] = Query(default=None),
+    min_revenue: Optional[float] = None,
+    max_revenue: Optional[float] = None,
+    search: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    if sort not in SIMULATION_SORT_COLUMNS:
+        raise_validation_error(
+            f"Cannot sort by {sort}",
+            field="sort",
+            details={"allowed": list(SIMULATION_SORT_COLUMNS)}
+        )
+    if order not in ("asc", "desc"):
+        raise_validation_error("Order must be 'asc' or 'desc'", field="order")
+
+    query = db.query(Simulation).options(load_only(
+        Simulation.id, Simulation.policy_name, Simulation.created_at, Simulation.input_params,
+        Simulation.country, Simulation.policy_type, Simulation.risk_category, Simulation.revenue_million
+    )).filter(Simulation.user_id == current_user.id)
+
+    if country:
+        query = query.filter(Simulation.country.in_(country))
+    if policy_type:
+        query = query.filter(Simulation.policy_type.in_(policy_type))
+    if risk_category:
+        query = query.filter(Simulation.risk_category.in_(risk_category))
+    if min_revenue is not None:
+        query = query.filter(Simulation.revenue_million >= min_revenue)
+    if max_revenue is not None:
+        query = query.filter(Simulation.revenue_million <= max_revenue)
+    if search and search.strip():
+        query = query.filter(_policy_name_prefix_filter(db, search.strip()))
+
+    sort_column = SIMULATION_SORT_COLUMNS[sort]
+    if order == "desc":
+        query = query.order_by(sort_column.desc(), Simulation.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Simulation.id.asc())
+
     try:
-        simulations = db.query(Simulation).filter(
-            Simulation.user_id == current_user.id
-        ).order_by(Simulation.created_at.desc()).all()
+        etag = _history_etag(db, current_user.id, request)
+        if etag_matches(request, etag):
+            return not_modified(etag, PRIVATE_CACHE_CONTROL)
+        response.headers.update(cache_headers(etag, PRIVATE_CACHE_CONTROL))
+
+        if limit is not None:
+            response.headers["X-Total-Count"] = str(query.order_by(None).count())
+            query = query.offset(offset).limit(limit)
+        simulations = query.all()
     except OperationalError as e:
         db.rollback()
         raise_service_unavailable_error(
@@ -382,146 +476,336 @@ def get_user_simulations(
     summaries = []
     for sim in simulations:
         input_params = sim.input_params
-        results = sim.results
 
         summaries.append(SimulationSummary(
             id=sim.id,
             policy_name=sim.policy_name,
             created_at=sim.created_at,
-            country=input_params.get("country", "Unknown"),
-            policy_type=input_params.get("policy_type", "Unknown"),
+            country=sim.country or input_params.get("country", "Unknown"),
+            policy_type=sim.policy_type or input_params.get("policy_type", "Unknown"),
             carbon_price_usd=input_params.get("carbon_price_usd", 0),
             coverage_percent=input_params.get("coverage_percent", 0),
-            revenue_million=results.get("revenue_million", 0),
-            risk_category=results.get("risk_category", "Unknown")
+            revenue_million=sim.revenue_million or 0,
+            risk_category=sim.risk_category or "Unknown"
         ))
 
     return summaries
 
+AGGREGATE_GROUP_COLUMNS = {
+    'country': Simulation.country,
+    'policy_type': Simulation.policy_type,
+    'year': SimulationProjection.year,
+    'risk_category': SimulationProjection.risk_category,
+}
+
+@router.get("/aggregate")
+def aggregate_simulations(
+    group_by: List[str] = Query(default=["country"]),
+    country: Optional[List[str]] = Query(default=None),
+    policy_type: Optional[List[str]] = Query(default=None),
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    unknown = [key for key in group_by if key not in AGGREGATE_GROUP_COLUMNS]
+    if unknown:
+        raise_validation_error(
+            f"Cannot group by {', '.join(unknown)}",
+            field="group_by",
+            details={"allowed": list(AGGREGATE_GROUP_COLUMNS)}
+        )
+
+    group_columns = [AGGREGATE_GROUP_COLUMNS[key].label(key) for key in group_by]
+    query = db.query(
+        *group_columns,
+        func.count(func.distinct(Simulation.id)).label('simulation_count'),
+        func.count(SimulationProjection.id).label('projection_years'),
+        func.sum(SimulationProjection.revenue_million).label('total_revenue_million'),
+        func.sum(SimulationProjection.risk_adjusted_value_million).label('total_risk_adjusted_value_million'),
+        func.sum(SimulationProjection.co2_reduced_mt).label('total_co2_reduced_mt'),
+        func.avg(SimulationProjection.abolishment_risk_percent).label('avg_abolishment_risk_percent')
+    ).join(
+        SimulationProjection, SimulationProjection.simulation_id == Simulation.id
+    ).filter(Simulation.user_id == current_user.id)
+
+    if country:
+        query = query.filter(Simulation.country.in_(country))
+    if policy_type:
+        query = query.filter(Simulation.policy_type.in_(policy_type))
+    if year_from is not None:
+        query = query.filter(SimulationProjection.year >= year_from)
+    if year_to is not None:
+        query = query.filter(SimulationProjection.year <= year_to)
+
+    query = query.group_by(*[AGGREGATE_GROUP_COLUMNS[key] for key in group_by])
+    query = query.order_by(*[AGGREGATE_GROUP_COLUMNS[key] for key in group_by])
+
+    try:
+        rows = query.all()
+    except OperationalError as e:
+        db.rollback()
+        raise_service_unavailable_error(
+            "Unable to aggregate your simulations due to a database connection issue. Please try again in a moment.",
+            service="database"
+        )
+
+    groups = []
+    for row in rows:
+        groups.append({
+            **{key: getattr(row, key) for key in group_by},
+            'simulation_count': row.simulation_count,
+            'projection_years': row.projection_years,
+            'total_revenue_million': round(row.total_revenue_million or 0.0, 2),
+            'total_risk_adjusted_value_million': round(row.total_risk_adjusted_value_million or 0.0, 2),
+            'total_co2_reduced_mt': round(row.total_co2_reduced_mt or 0.0, 3),
+            'avg_abolishment_risk_percent': round(row.avg_abolishment_risk_percent or 0.0, 1)
+        })
+
+    return {
+        "group_by": group_by,
+        "groups": groups
+    }
+
+EXPORT_BATCH_SIZE = 1000
+
+SIMULATION_EXPORT_COLUMNS = {
+    'id': 'int64',
+    'policy_name': 'string',
+    'created_at': 'timestamp',
+    'country': 'string',
+    'policy_type': 'string',
+    'carbon_price_usd': 'double',
+    'coverage_percent': 'double',
+    'year': 'int64',
+    'projection_years': 'int64',
+    'revenue_million': 'double',
+    'risk_category': 'string',
+}
+
+PROJECTION_EXPORT_COLUMNS = {
+    'simulation_id': 'int64',
+    'policy_name': 'string',
+    'country': 'string',
+    'policy_type': 'string',
+    'year': 'int64',
+    'revenue_million': 'double',
+    'cumulative_revenue_million': 'double',
+    'co2_reduced_mt': 'double',
+    'co2_reduced_cumulative_mt': 'double',
+    'co2_after_reduction_mt': 'double',
+    'abolishment_risk_percent': 'double',
+    'risk_category': 'string',
+    'risk_adjusted_value_million': 'double',
+}
+
+def _simulation_export_statement(user_id: int, country, policy_type):
+    statement = select(
+        Simulation.id, Simulation.policy_name, Simulation.created_at, Simulation.country,
+        Simulation.policy_type, Simulation.input_params, Simulation.revenue_million, Simulation.risk_category
+    ).where(Simulation.user_id == user_id)
+    if country:
+        statement = statement.where(Simulation.country.in_(country))
+    if policy_type:
+        statement = statement.where(Simulation.policy_type.in_(policy_type))
+    return statement.order_by(Simulation.id)
+
+def _projection_export_statement(user_id: int, country, policy_type):
+    statement = select(
+        SimulationProjection.simulation_id, Simulation.policy_name, Simulation.country, Simulation.policy_type,
+        SimulationProjection.year, SimulationProjection.revenue_million, SimulationProjection.cumulative_revenue_million,
+        SimulationProjection.co2_reduced_mt, SimulationProjection.co2_reduced_cumulative_mt,
+        SimulationProjection.co2_after_reduction_mt, SimulationProjection.abolishment_risk_percent,
+        SimulationProjection.risk_category, SimulationProjection.risk_adjusted_value_million
+    ).join(Simulation, SimulationProjection.simulation_id == Simulation.id).where(Simulation.user_id == user_id)
+    if country:
+        statement = statement.where(Simulation.country.in_(country))
+    if policy_type:
+        statement = statement.where(Simulation.policy_type.in_(policy_type))
+    return statement.order_by(SimulationProjection.simulation_id, SimulationProjection.year)
+
+def _simulation_export_row(row):
+    input_params = row.input_params or {}
+    return (
+        row.id, row.policy_name, row.created_at, row.country, row.policy_type,
+        input_params.get('carbon_price_usd'), input_params.get('coverage_percent'),
+        input_params.get('year'), input_params.get('projection_years'),
+        row.revenue_million, row.risk_category
+    )
+
+def _export_batches(statement, convert_row):
+    # The request-scoped session is closed before a streaming body is sent,
+    # so the export owns its own session for the lifetime of the stream.
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield [convert_row(row) for row in partition]
+    finally:
+        db.close()
+
+@router.get("/export")
+def export_simulations(
+    format: str = "ndjson",
+    rows: str = "simulations",
+    country: Optional[List[str]] = Query(default=None),
+    policy_type: Optional[List[str]] = Query(default=None),
+    current_user: User = Depends(get_current_user)
+):
+    if format not in EXPORT_MEDIA_TYPES:
+        raise_validation_error(
+            f"Unsupported export format: {format}",
+            field="format",
+            details={"allowed": list(EXPORT_MEDIA_TYPES)}
+        )
+    if rows == "simulations":
+        columns = SIMULATION_EXPORT_COLUMNS
+        statement = _simulation_export_statement(current_user.id, country, policy_type)
+        convert_row = _simulation_export_row
+    elif rows == "projections":
+        columns = PROJECTION_EXPORT_COLUMNS
+        statement = _projection_export_statement(current_user.id, country, policy_type)
+        convert_row = tuple
+    else:
+        raise_validation_error(
+            "Rows must be 'simulations' or 'projections'",
+            field="rows",
+            details={"allowed": ["simulations", "projections"]}
+        )
+
+    batches = _export_batches(statement, convert_row)
+    column_names = list(columns)
+    if format == "ndjson":
+        body = iter_ndjson(batches, column_names)
+    elif format == "csv":
+        body = iter_csv(batches, column_names)
+    else:
+        body = iter_parquet(batches, column_names, columns)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{rows}.{format}"'}
+    )
+
+MAX_COMPARE_POLICIES = 10
+ORDINALS = ["First", "Second"]
+
+def _compare_entries(body: dict) -> list:
+    # Accepts either a "policies" list of {"simulation_id": ...} or
+    # {"new_simulation": {...}} entries, or the original two-policy keys.
+    policies = body.get('policies')
+    if policies is None:
+        return [
+            {"simulation_id": body.get(f'simulation_id_{n}'), "new_simulation": body.get(f'new_simulation_{n}')}
+            for n in (1, 2)
+        ]
+    if not isinstance(policies, list) or not all(isinstance(p, dict) for p in policies):
+        raise_validation_error("policies must be a list of objects", field="policies")
+    return policies
+
+def _ordinal(position: int) -> str:
+    return ORDINALS[position] if position < len(ORDINALS) else f"Policy {position + 1}"
+
 @router.post("/compare")
 def compare_simulations(
     body: dict = Body(...),
+    compact: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     from pydantic import ValidationError
 
-    simulation_1 = None
-    simulation_2 = None
+    legacy = body.get('policies') is None
+    entries = _compare_entries(body)
+    if len(entries) < 2 or len(entries) > MAX_COMPARE_POLICIES:
+        raise_validation_error(
+            f"Please provide between 2 and {MAX_COMPARE_POLICIES} policies to compare",
+            field="policies",
+            details={"min_items": 2, "max_items": MAX_COMPARE_POLICIES}
+        )
 
-    def convert_id(id_value):
-        if id_value is None:
-            return None
-        if id_value == '' or id_value == 'null' or id_value == 'undefined':
-            return None
-        if isinstance(id_value, int):
-            return id_value
-        if isinstance(id_value, float):
-            return int(id_value)
-        if isinstance(id_value, str):
+    saved_ids = {}
+    new_requests = {}
+    for position, entry in enumerate(entries):
+        field_suffix = f"_{position + 1}" if legacy else f"[{position}]"
+        sim_id = _convert_id(entry.get('simulation_id'))
+        if sim_id:
+            saved_ids[position] = sim_id
+        elif entry.get('new_simulation'):
             try:
-                return int(id_value)
-            except (ValueError, TypeError):
-                return None
-        return None
-
-    sim_id_1_raw = body.get('simulation_id_1')
-    sim_id_2_raw = body.get('simulation_id_2')
-    sim_id_1 = convert_id(sim_id_1_raw)
-    sim_id_2 = convert_id(sim_id_2_raw)
-
-    if sim_id_1:
-        try:
-            sim = db.query(Simulation).filter(
-                Simulation.id == sim_id_1,
-                Simulation.user_id == current_user.id
-            ).first()
-        except OperationalError as e:
-            db.rollback()
-            raise_service_unavailable_error(
-                "Unable to load simulation due to a database connection issue. Please try again in a moment.",
-                service="database"
-            )
-        if not sim:
-            raise_not_found_error(
-                "First simulation not found. It may have been deleted or you don't have permission to view it.",
-                resource="simulation"
-            )
-        simulation_1 = {
-            "input": sim.input_params,
-            "results": sim.results,
-            "id": sim.id,
-            "policy_name": sim.policy_name
-        }
-    elif body.get('new_simulation_1'):
-        try:
-            new_sim_1 = PredictionRequest(**body.get('new_simulation_1'))
-            results_1 = _run_prediction(new_sim_1)
-            simulation_1 = {
-                "input": new_sim_1.dict() if hasattr(new_sim_1, 'dict') else new_sim_1.model_dump() if hasattr(new_sim_1, 'model_dump') else new_sim_1,
-                "results": results_1.dict() if hasattr(results_1, 'dict') else results_1.model_dump() if hasattr(results_1, 'model_dump') else results_1,
-                "id": None,
-                "policy_name": generate_policy_name(new_sim_1.dict() if hasattr(new_sim_1, 'dict') else new_sim_1.model_dump() if hasattr(new_sim_1, 'model_dump') else {})
-            }
-        except ValidationError as e:
+                new_requests[position] = PredictionRequest(**entry.get('new_simulation'))
+            except (ValidationError, TypeError) as e:
+                raise_validation_error(
+                    f"Invalid data for new simulation {position + 1}. Please check all required fields.",
+                    field=f"new_simulation{field_suffix}"
+                )
+        else:
             raise_validation_error(
-                "Invalid data for new simulation 1. Please check all required fields.",
-                field="new_simulation_1"
+                f"Please provide either a saved simulation or create a new simulation for the {_ordinal(position).lower()} policy",
+                field=f"simulation_id{field_suffix}"
             )
-    else:
-        raise_validation_error(
-            "Please provide either a saved simulation or create a new simulation for the first policy",
-            field="simulation_id_1"
-        )
 
-    if sim_id_2:
+    saved = {}
+    if saved_ids:
         try:
-            sim = db.query(Simulation).filter(
-                Simulation.id == sim_id_2,
-                Simulation.user_id == current_user.id
-            ).first()
+            saved = {
+                sim.id: sim for sim in db.query(Simulation).filter(
+                    Simulation.id.in_(set(saved_ids.values())),
+                    Simulation.user_id == current_user.id
+                ).all()
+            }
         except OperationalError as e:
             db.rollback()
             raise_service_unavailable_error(
                 "Unable to load simulation due to a database connection issue. Please try again in a moment.",
                 service="database"
             )
-        if not sim:
-            raise_not_found_error(
-                "Second simulation not found. It may have been deleted or you don't have permission to view it.",
-                resource="simulation"
-            )
-        simulation_2 = {
-            "input": sim.input_params,
-            "results": sim.results,
-            "id": sim.id,
-            "policy_name": sim.policy_name
-        }
-    elif body.get('new_simulation_2'):
-        try:
-            new_sim_2 = PredictionRequest(**body.get('new_simulation_2'))
-            results_2 = _run_prediction(new_sim_2)
-            simulation_2 = {
-                "input": new_sim_2.dict() if hasattr(new_sim_2, 'dict') else new_sim_2.model_dump() if hasattr(new_sim_2, 'model_dump') else new_sim_2,
-                "results": results_2.dict() if hasattr(results_2, 'dict') else results_2.model_dump() if hasattr(results_2, 'model_dump') else results_2,
+        for position, sim_id in saved_ids.items():
+            if sim_id not in saved:
+                raise_not_found_error(
+                    f"{_ordinal(position)} simulation not found. It may have been deleted or you don't have permission to view it.",
+                    resource="simulation"
+                )
+
+    # All new scenarios share one batched pass through both models.
+    new_positions = list(new_requests)
+    new_results = dict(zip(new_positions, _run_predictions([new_requests[p] for p in new_positions])))
+
+    simulations = []
+    for position in range(len(entries)):
+        if position in saved_ids:
+            sim = saved[saved_ids[position]]
+            simulations.append({
+                "input": sim.input_params,
+                "results": load_results(sim),
+                "id": sim.id,
+                "policy_name": sim.policy_name
+            })
+        else:
+            input_dict = new_requests[position].dict()
+            simulations.append({
+                "input": input_dict,
+                "results": new_results[position],
                 "id": None,
-                "policy_name": generate_policy_name(new_sim_2.dict() if hasattr(new_sim_2, 'dict') else new_sim_2.model_dump() if hasattr(new_sim_2, 'model_dump') else {})
-            }
-        except ValidationError as e:
-            raise_validation_error(
-                "Invalid data for new simulation 2. Please check all required fields.",
-                field="new_simulation_2"
-            )
-    else:
-        raise_validation_error(
-            "Please provide either a saved simulation or create a new simulation for the second policy",
-            field="simulation_id_2"
-        )
+                "policy_name": generate_policy_name(input_dict)
+            })
 
-    return {
-        "simulation_1": simulation_1,
-        "simulation_2": simulation_2
-    }
+    strings = {}
+    if compact:
+        for simulation in simulations:
+            simulation["results"] = compact_results(simulation["results"], strings)
+
+    if legacy:
+        content = {
+            "simulation_1": simulations[0],
+            "simulation_2": simulations[1]
+        }
+    else:
+        content = {"simulations": simulations}
+    if compact:
+        content["strings"] = list(strings)
+    return FastJSONResponse(content)
 
 @router.post("/comparisons", status_code=status.HTTP_201_CREATED)
 def save_comparison(
@@ -551,20 +835,30 @@ def save_comparison(
     if not comparison_name:
         comparison_name = f"{policy_1_name} vs {policy_2_name}"
 
-    sim1_data = {
-        'input': dict(policy_1_input),
-        'policy_name': policy_1_name
-    }
-    sim2_data = {
-        'input': dict(policy_2_input),
-        'policy_name': policy_2_name
-    }
+    try:
+        simulation_1_id = _find_saved_simulation_id(db, current_user.id, body.get('simulation_1_id'), policy_1_input)
+        simulation_2_id = _find_saved_simulation_id(db, current_user.id, body.get('simulation_2_id'), policy_2_input)
+    except OperationalError as e:
+        db.rollback()
+        raise_service_unavailable_error(
+            "Unable to save comparison due to a database connection issue. Please try again in a moment.",
+            service="database"
+        )
+
+    # Policies that match a saved simulation are stored by reference; the
+    # input is resolved from the simulation row when the comparison is read.
+    sim1_data = {'policy_name': policy_1_name}
+    sim2_data = {'policy_name': policy_2_name}
+    if not simulation_1_id:
+        sim1_data['input'] = dict(policy_1_input)
+    if not simulation_2_id:
+        sim2_data['input'] = dict(policy_2_input)
 
     comparison = Comparison(
         user_id=current_user.id,
         comparison_name=comparison_name,
-        simulation_1_id=None,
-        simulation_2_id=None,
+        simulation_1_id=simulation_1_id,
+        simulation_2_id=simulation_2_id,
         simulation_1_data=sim1_data,
         simulation_2_data=sim2_data
     )
@@ -596,6 +890,7 @@ def get_user_comparisons(
         comparisons = db.query(Comparison).filter(
             Comparison.user_id == current_user.id
         ).order_by(Comparison.created_at.desc()).all()
+        referenced_inputs = _load_referenced_inputs(db, comparisons)
     except OperationalError as e:
         raise_service_unavailable_error(
             "Unable to load comparisons due to a database connection issue. Please try again in a moment.",
@@ -608,8 +903,8 @@ def get_user_comparisons(
             if not comp.simulation_1_data or not comp.simulation_2_data:
                 continue
 
-            sim1_data = comp.simulation_1_data
-            sim2_data = comp.simulation_2_data
+            sim1_data = _resolve_comparison_side(comp.simulation_1_data, comp.simulation_1_id, referenced_inputs)
+            sim2_data = _resolve_comparison_side(comp.simulation_2_data, comp.simulation_2_id, referenced_inputs)
 
             if not isinstance(sim1_data, dict) or not isinstance(sim2_data, dict):
                 continue
@@ -676,6 +971,7 @@ def get_comparison(
             Comparison.id == comparison_id,
             Comparison.user_id == current_user.id
         ).first()
+        referenced_inputs = _load_referenced_inputs(db, [comparison]) if comparison else {}
     except OperationalError as e:
         raise_service_unavailable_error(
             "Unable to load comparison due to a database connection issue. Please try again in a moment.",
@@ -695,8 +991,8 @@ def get_comparison(
         created_at=comparison.created_at,
         simulation_1_id=int(comparison.simulation_1_id) if comparison.simulation_1_id else None,
         simulation_2_id=int(comparison.simulation_2_id) if comparison.simulation_2_id else None,
-        simulation_1_data=comparison.simulation_1_data,
-        simulation_2_data=comparison.simulation_2_data
+        simulation_1_data=_resolve_comparison_side(comparison.simulation_1_data, comparison.simulation_1_id, referenced_inputs),
+        simulation_2_data=_resolve_comparison_side(comparison.simulation_2_data, comparison.simulation_2_id, referenced_inputs)
     )
 
 @router.delete("/comparisons/{comparison_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -737,6 +1033,7 @@ def delete_comparison(
 @router.get("/{simulation_id}", response_model=SimulationDetail)
 def get_simulation(
     simulation_id: int,
+    compact: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -758,14 +1055,7 @@ def get_simulation(
             resource="simulation"
         )
     
-    return SimulationDetail(
-        id=simulation.id,
-        user_id=simulation.user_id,
-        policy_name=simulation.policy_name,
-        created_at=simulation.created_at,
-        input_params=simulation.input_params,
-        results=PredictionResponse(**simulation.results)
-    )
+    return _simulation_detail_response(simulation, compact)
 
 @router.patch("/{simulation_id}", response_model=SimulationDetail)
 def update_simulation(
@@ -774,8 +1064,6 @@ def update_simulation(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    from .schemas import PredictionResponse
-    
     simulation = db.query(Simulation).filter(
         Simulation.id == simulation_id,
         Simulation.user_id == current_user.id
@@ -811,14 +1099,7 @@ def update_simulation(
                 service="database"
             )
     
-    return SimulationDetail(
-        id=simulation.id,
-        user_id=simulation.user_id,
-        policy_name=simulation.policy_name,
-        created_at=simulation.created_at,
-        input_params=simulation.input_params,
-        results=PredictionResponse(**simulation.results)
-    )
+    return _simulation_detail_response(simulation)
 
 @router.delete("/{simulation_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_simulation(
@@ -838,6 +1119,10 @@ def delete_simulation(
         )
     
     try:
+        _inline_comparison_references(db, [simulation])
+        db.query(SimulationProjection).filter(
+            SimulationProjection.simulation_id == simulation.id
+        ).delete(synchronize_session=False)
         db.delete(simulation)
         db.commit()
     except OperationalError as e:
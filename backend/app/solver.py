@@ -0,0 +1,164 @@
+import numpy as np
+from .schemas import PredictionRequest, SolveRequest
+from .predict import predict_revenue_batch, predict_success_batch
+from .projections import build_projection_grid, clamp_revenue_paths
+from .calculations import co2_reduced_array
+from .services import co2_entity_ids, co2_totals
+
+# Coarse pass: prices x coverage levels, all evaluated in one model call.
+COARSE_PRICE_POINTS = 17
+COARSE_COVERAGE_POINTS = 9
+# Extra coverage levels searched between the neighbours of the best coarse level.
+REFINE_COVERAGE_POINTS = 8
+MAX_BISECTION_STEPS = 40
+
+REVENUE_METRICS = ("revenue_million", "cumulative_revenue_million")
+
+def _search_state(request: SolveRequest, country_features: dict) -> dict:
+    # Grid rows that don't depend on price or coverage, built once and tiled
+    # for every batch of points, plus the evaluation counters.
+    base = PredictionRequest(
+        country=request.country, policy_type=request.policy_type,
+        carbon_price_usd=request.price_min_usd, coverage_percent=request.coverage_min_percent,
+        year=request.year, projection_years=request.projection_years
+    )
+    grid = build_projection_grid([base], [country_features])
+    return {
+        'metric': request.target_metric,
+        'grid': grid,
+        'n_years': grid['n_years'][0],
+        'total_co2': np.fmax(co2_totals(co2_entity_ids([request.country]), grid['year']), 0.0),
+        'evaluations': 0,
+        'model_rows': 0,
+    }
+
+def _abolishment_risk_percent(state) -> float:
+    # The success model doesn't see price or coverage, so one row covers
+    # every point.
+    grid = state['grid']
+    abolishment_prob, _ = predict_success_batch(
+        grid['country'][:1], grid['policy_type'][:1], grid['year'][:1], grid['fossil_fuel_pct'][:1], grid['gdp'][:1]
+    )
+    return round(float(abolishment_prob[0]) * 100, 1)
+
+def _evaluate(state, prices, coverages) -> np.ndarray:
+    prices = np.asarray(prices, dtype=float)
+    coverages = np.asarray(coverages, dtype=float)
+    state['evaluations'] += len(prices)
+    if not len(prices):
+        return np.zeros(0)
+
+    if state['metric'] in REVENUE_METRICS:
+        grid, k, n = state['grid'], len(prices), state['n_years']
+        revenue = predict_revenue_batch(
+            grid['country'] * k, grid['policy_type'] * k, np.repeat(prices, n), np.repeat(coverages, n),
+            np.tile(grid['year'], k), np.tile(grid['fossil_fuel_pct'], k),
+            np.tile(grid['population'], k), np.tile(grid['gdp'], k)
+        ).reshape(k, n)
+        state['model_rows'] += k * n
+        revenue = clamp_revenue_paths(revenue)
+        return revenue[:, 0] if state['metric'] == "revenue_million" else revenue.sum(axis=1)
+
+    total_co2 = state['total_co2']
+    co2_reduced = np.where(total_co2 > 0, co2_reduced_array(coverages[:, None], total_co2[None, :], prices[:, None]), 0.0)
+    return co2_reduced[:, 0] if state['metric'] == "co2_reduced_mt" else co2_reduced.sum(axis=1)
+
+def _lowest_prices(state, coverages, price_min, price_max, target, tolerance):
+    # Lowest price reaching the target at each coverage level: a coarse price
+    # scan brackets the first crossing, then every level is bisected together,
+    # one batched evaluation per step. None where the target is out of reach.
+    # The metric need not rise with price, so only levels whose scan has a
+    # crossing are bisected: below the target at low, reached at high. Each
+    # step keeps that, so the result is a crossing even where the model dips.
+    coverages = np.asarray(coverages, dtype=float)
+    prices = np.linspace(price_min, price_max, COARSE_PRICE_POINTS)
+    values = _evaluate(state, np.tile(prices, len(coverages)), np.repeat(coverages, len(prices)))
+    values = values.reshape(len(coverages), len(prices))
+
+    reached = values >= target
+    found = reached.any(axis=1)
+    first = reached.argmax(axis=1)
+    high = prices[first]
+    high_value = values[np.arange(len(coverages)), first]
+    low = np.where(first > 0, prices[np.maximum(first - 1, 0)], high)
+
+    for _ in range(MAX_BISECTION_STEPS):
+        active = np.flatnonzero(found & (high - low > tolerance))
+        if not len(active):
+            break
+        mid = (low[active] + high[active]) / 2
+        mid_values = _evaluate(state, mid, coverages[active])
+        hit = mid_values >= target
+        high[active[hit]] = mid[hit]
+        high_value[active[hit]] = mid_values[hit]
+        low[active[~hit]] = mid[~hit]
+
+    # Report whole cents, rounded up, with the value at that exact price.
+    high = np.minimum(np.ceil(high * 100 - 1e-9) / 100, price_max)
+    high_value[found] = _evaluate(state, high[found], coverages[found])
+    found &= high_value >= target
+
+    return [
+        (float(c), float(p), float(v)) if ok else None
+        for c, p, v, ok in zip(coverages, high, high_value, found)
+    ]
+
+def _refined_coverages(coverages, best_index, done):
+    lower = coverages[max(best_index - 1, 0)]
+    upper = coverages[min(best_index + 1, len(coverages) - 1)]
+    candidates = np.round(np.linspace(lower, upper, REFINE_COVERAGE_POINTS + 2), 6)
+    return [c for c in candidates if c not in done]
+
+def _no_solution_message(request: SolveRequest, risk: float) -> str:
+    if request.max_risk_percent is not None and risk > request.max_risk_percent:
+        return f"Abolishment risk of {risk}% is above the {request.max_risk_percent:g}% limit"
+    return (
+        f"No carbon price between ${request.price_min_usd:g} and ${request.price_max_usd:g} reaches "
+        f"{request.target_value:g} for {request.target_metric} at {request.coverage_min_percent:g}-"
+        f"{request.coverage_max_percent:g}% coverage"
+    )
+
+def solve_policy(request: SolveRequest, country_features: dict) -> dict:
+    state = _search_state(request, country_features)
+    risk = _abolishment_risk_percent(state)
+    result = {
+        "feasible": False,
+        "target_metric": request.target_metric,
+        "target_value": request.target_value,
+        "abolishment_risk_percent": risk,
+        "optimal": None,
+        "frontier": [],
+        "message": None,
+    }
+
+    if request.max_risk_percent is None or risk <= request.max_risk_percent:
+        coverages = np.round(np.linspace(request.coverage_min_percent, request.coverage_max_percent, COARSE_COVERAGE_POINTS), 6)
+        if request.coverage_min_percent == request.coverage_max_percent:
+            coverages = coverages[:1]
+        search = (request.price_min_usd, request.price_max_usd, request.target_value, request.price_tolerance_usd)
+        points = _lowest_prices(state, coverages, *search)
+
+        # Refine coverage around the cheapest coarse level; the upper price
+        # bound comes from its neighbours, which already reach the target.
+        reached = [i for i, p in enumerate(points) if p is not None]
+        if reached and len(coverages) > 1:
+            best = min(reached, key=lambda i: (points[i][1], points[i][0]))
+            refined = _refined_coverages(coverages, best, set(coverages))
+            neighbours = [points[i][1] for i in (best - 1, best, best + 1) if 0 <= i < len(points) and points[i] is not None]
+            points += _lowest_prices(state, refined, request.price_min_usd, max(neighbours), *search[2:])
+
+        frontier = sorted(p for p in points if p is not None)
+        result["frontier"] = [
+            {"carbon_price_usd": round(p, 2), "coverage_percent": round(c, 2), "value": round(v, 3)}
+            for c, p, v in frontier
+        ]
+        if frontier:
+            c, p, v = min(frontier, key=lambda point: (point[1], point[0]))
+            result["feasible"] = True
+            result["optimal"] = {"carbon_price_usd": round(p, 2), "coverage_percent": round(c, 2), "value": round(v, 3)}
+
+    if not result["feasible"]:
+        result["message"] = _no_solution_message(request, risk)
+    result["evaluations"] = state['evaluations']
+    result["model_rows"] = state['model_rows']
+    return result
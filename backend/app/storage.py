@@ -0,0 +1,90 @@
+import hashlib
+import json
+import msgpack
+import zstandard
+
+# First byte of every packed blob. Rows written before packing existed have no
+# blob at all and keep their payload in the plain JSON column (format 0).
+FORMAT_JSON = 0
+FORMAT_COLUMNAR_V1 = 1
+CURRENT_FORMAT = FORMAT_COLUMNAR_V1
+
+ZSTD_LEVEL = 10
+
+PROJECTION_FIELDS = [
+    'year',
+    'carbon_price_usd',
+    'revenue_million',
+    'cumulative_revenue_million',
+    'co2_reduced_mt',
+    'co2_reduced_cumulative_mt',
+    'co2_after_reduction_mt',
+    'co2_reduced_from_base_mt',
+    'abolishment_risk_percent',
+    'risk_category',
+    'risk_adjusted_value_million',
+]
+
+def encode_results(results: dict) -> bytes:
+    payload = {k: v for k, v in results.items() if k != 'projections'}
+    projections = results.get('projections') or []
+    payload['projections'] = {
+        field: [p.get(field) for p in projections] for field in PROJECTION_FIELDS
+    }
+    packed = msgpack.packb(payload, use_bin_type=True)
+    return bytes([CURRENT_FORMAT]) + zstandard.compress(packed, ZSTD_LEVEL)
+
+def decode_results(blob: bytes) -> dict:
+    version = blob[0]
+    if version != FORMAT_COLUMNAR_V1:
+        raise ValueError(f"Unsupported results storage format: {version}")
+
+    payload = msgpack.unpackb(zstandard.decompress(blob[1:]), raw=False)
+    columns = payload.get('projections') or {}
+    years = columns.get('year') or []
+    payload['projections'] = [
+        {field: columns[field][i] for field in PROJECTION_FIELDS if field in columns}
+        for i in range(len(years))
+    ]
+    return payload
+
+def results_from_columns(results, results_packed) -> dict:
+    if results_packed is not None:
+        return decode_results(results_packed)
+    return results or {}
+
+def load_results(simulation) -> dict:
+    return results_from_columns(simulation.results, simulation.results_packed)
+
+def projection_rows(simulation_id: int, results: dict) -> list:
+    return [
+        {
+            'simulation_id': simulation_id,
+            'year': p['year'],
+            'revenue_million': p['revenue_million'],
+            'cumulative_revenue_million': p['cumulative_revenue_million'],
+            'co2_reduced_mt': p['co2_reduced_mt'],
+            'co2_reduced_cumulative_mt': p['co2_reduced_cumulative_mt'],
+            'co2_after_reduction_mt': p['co2_after_reduction_mt'],
+            'abolishment_risk_percent': p['abolishment_risk_percent'],
+            'risk_category': p['risk_category'],
+            'risk_adjusted_value_million': p['risk_adjusted_value_million'],
+        }
+        for p in results.get('projections') or []
+    ]
+
+def file_fingerprint(paths) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode('utf-8'))
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+def input_hash(input_params: dict) -> str:
+    # Unset optional inputs are left out so adding one to PredictionRequest
+    # doesn't change the hash of inputs saved before it existed.
+    input_params = {k: v for k, v in input_params.items() if v is not None}
+    canonical = json.dumps(input_params, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
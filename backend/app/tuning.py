@@ -0,0 +1,81 @@
+from .schemas import PredictionRequest
+from .projections import (
+    MAX_PROJECTION_YEARS, build_projection_grid, evaluate_grid, base_result,
+    headline_fields, detail_fields, iter_projections, prediction_result,
+    context_args, resolve_context,
+)
+import numpy as np
+from .services import get_country_features, co2_entity_ids, co2_totals
+
+# Seconds the session waits after an update before evaluating, so a burst
+# of slider moves collapses into one evaluation of the latest values.
+TUNE_DEBOUNCE_SECONDS = 0.02
+
+def _pin_country(request: PredictionRequest) -> dict:
+    # Everything that depends only on country and start year, resolved once
+    # per session instead of on every slider move.
+    return {
+        'key': (request.country, request.year),
+        'features': get_country_features(request.country, request.year),
+        'total_co2_mt': co2_totals(co2_entity_ids([request.country]), request.year + np.arange(MAX_PROJECTION_YEARS)),
+    }
+
+def _evaluate(request: PredictionRequest, pinned: dict, context=None):
+    # context is the (args, context) pair resolved by the previous
+    # evaluation; generate_context only runs again when its inputs changed.
+    grid = build_projection_grid([request], [pinned['features']])
+    revenue, abolishment_prob, has_history = evaluate_grid(grid)
+    base = base_result(request, revenue[0], abolishment_prob[0], bool(has_history[0]))
+    args = context_args(request, pinned['features'], base)
+    if context is None or context[0] != args:
+        context = (args, resolve_context(args))
+    result = prediction_result(
+        headline_fields(base),
+        detail_fields(request, pinned['features'], base, context=context[1]),
+        iter_projections(request, base, revenue, abolishment_prob, grid['carbon_price_usd'], pinned['total_co2_mt'])
+    )
+    return result, context
+
+def _changed_fields(previous: dict, current: dict) -> dict:
+    # Top-level fields that differ, plus changed projection years keyed by
+    # index; the whole projection list only when its length changes.
+    changed = {k: v for k, v in current.items() if k != 'projections' and previous.get(k) != v}
+    old_rows, new_rows = previous['projections'], current['projections']
+    if len(old_rows) != len(new_rows):
+        changed['projections'] = new_rows
+        return changed
+    rows = {}
+    for index, (old, new) in enumerate(zip(old_rows, new_rows)):
+        fields = {k: v for k, v in new.items() if old.get(k) != v}
+        if fields:
+            rows[str(index)] = fields
+    if rows:
+        changed['projections_changed'] = rows
+    return changed
+
+def open_session(params: dict) -> dict:
+    # Raises ValidationError for bad parameters and ValueError when the
+    # country has no data.
+    request = PredictionRequest(**params)
+    pinned = _pin_country(request)
+    result, context = _evaluate(request, pinned)
+    return {
+        'request': request,
+        'pinned': pinned,
+        'context': context,
+        'result': result,
+        'evaluations': 1,
+    }
+
+def apply_update(session: dict, delta: dict) -> dict:
+    # Merges a parameter delta into the session and returns only the fields
+    # that changed. On error the session keeps its previous state.
+    request = PredictionRequest(**{**session['request'].dict(), **delta})
+    pinned = session['pinned']
+    if (request.country, request.year) != pinned['key']:
+        pinned = _pin_country(request)
+
+    result, context = _evaluate(request, pinned, session['context'])
+    changed = _changed_fields(session['result'], result)
+    session.update(request=request, pinned=pinned, context=context, result=result, evaluations=session['evaluations'] + 1)
+    return changed
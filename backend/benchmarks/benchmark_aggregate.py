@@ -0,0 +1,87 @@
+"""
+Checks services.get_countries_features against get_country_features for
+every entity and year, then times an EU27 scenario evaluated one member at
+a time against the single batched pass behind /predict/aggregate.
+Run from backend/: python benchmarks/benchmark_aggregate.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app import services
+from app.mappings import get_bloc_members
+from app.projections import run_predictions, aggregate_totals
+from app.runtime import active_bundle
+from app.schemas import PredictionRequest
+
+YEARS = range(2000, 2051, 5)
+REPEATS = 5
+
+def scalar_features(countries, year):
+    features, errors = {}, {}
+    for country in countries:
+        try:
+            features[country] = services.get_country_features(country, year)
+        except ValueError as e:
+            errors[country] = str(e)
+    return features, errors
+
+def check_parity():
+    bundle = active_bundle()
+    entities = sorted(set().union(*(set(getattr(bundle, name)['Entity'].unique())
+                                    for name in ('energy_data', 'gdp_data', 'population_data'))))
+    entities += list(services.GDP_ALTERNATE_NAMES)
+    mismatches = 0
+    for year in YEARS:
+        expected = scalar_features(entities, year)
+        actual = services.get_countries_features(entities, year)
+        if expected != actual:
+            mismatches += sum(expected[0].get(c) != actual[0].get(c) or expected[1].get(c) != actual[1].get(c)
+                              for c in entities)
+    print(f"features for {len(entities)} entities x {len(YEARS)} years: {mismatches} mismatches")
+    return mismatches
+
+def best_of(fn):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+def main():
+    mismatches = check_parity()
+
+    members = get_bloc_members('EU27')
+    common = dict(policy_type='ETS', carbon_price_usd=80, coverage_percent=45, year=2025, projection_years=10)
+
+    def one_at_a_time():
+        responses = []
+        for country in members:
+            try:
+                features = services.get_country_features(country, common['year'])
+                responses.append(run_predictions([PredictionRequest(country=country, **common)], [features])[0])
+            except ValueError:
+                continue
+        return responses
+
+    def batched():
+        features, errors = services.get_countries_features(members, common['year'])
+        with_co2 = services.countries_with_co2_data(features)
+        included = [c for c in members if c in features and c in with_co2]
+        requests = [PredictionRequest(country=c, **common) for c in included]
+        return run_predictions(requests, [features[c] for c in included])
+
+    serial_ms, serial = best_of(one_at_a_time)
+    batched_ms, batch = best_of(batched)
+    same = [r.dict() for r in serial] == [r.dict() for r in batch]
+    print(f"EU27, {len(batch)} members with data, 10 years: one at a time {serial_ms:.1f} ms, "
+          f"batched {batched_ms:.1f} ms, identical results: {same}")
+    print(f"bloc revenue {aggregate_totals(batch)['revenue_million']:.2f} M")
+    if mismatches or not same:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
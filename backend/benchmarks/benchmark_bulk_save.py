@@ -0,0 +1,73 @@
+"""
+Times saving 500 simulations one commit at a time (the POST /simulations
+path) against a single bulk insert (the POST /simulations/bulk path).
+Run from backend/ with a configured .env: python benchmarks/benchmark_bulk_save.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.database import Base
+from app.models import User, Simulation, SimulationProjection
+from app.storage import projection_rows
+from app.simulation_routes import _simulation_values, _bulk_insert_simulations
+from benchmark_storage import synthetic_results
+
+ITEMS = 500
+
+def synthetic_items():
+    rng = random.Random(3)
+    items = []
+    for _ in range(ITEMS):
+        input_dict = {
+            'country': rng.choice(['Germany', 'France', 'Spain', 'Italy']),
+            'policy_type': rng.choice(['Carbon tax', 'ETS']),
+            'carbon_price_usd': round(rng.uniform(10, 150), 1),
+            'coverage_percent': round(rng.uniform(10, 90), 1),
+            'year': 2025,
+            'projection_years': 20,
+        }
+        items.append((input_dict, synthetic_results(rng)))
+    return items
+
+def new_session(tmp, name):
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, name)}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    db.add(User(id=1, email='bench@example.com', hashed_password='x'))
+    db.commit()
+    return engine, db
+
+def sequential(db, items):
+    for input_dict, results in items:
+        simulation = Simulation(**_simulation_values(1, input_dict, results, None, None))
+        db.add(simulation)
+        db.flush()
+        db.execute(insert(SimulationProjection), projection_rows(simulation.id, results))
+        db.commit()
+
+def bulk(db, items):
+    values = [_simulation_values(1, input_dict, results, None, None) for input_dict, results in items]
+    _bulk_insert_simulations(db, values, [results for _, results in items])
+    db.commit()
+
+if __name__ == "__main__":
+    items = synthetic_items()
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, save in (('sequential (N commits)', sequential), ('bulk (1 transaction)', bulk)):
+            engine, db = new_session(tmp, f"{save.__name__}.db")
+            start = time.perf_counter()
+            save(db, items)
+            elapsed = time.perf_counter() - start
+            db.close()
+            engine.dispose()
+            print(f"{label:<24} {ITEMS} items: {elapsed * 1000:8.1f} ms ({elapsed / ITEMS * 1000:.2f} ms/item)")
@@ -0,0 +1,194 @@
+"""
+Times the scalar calculations.py functions in a Python loop against their
+array counterparts on 1M random rows, and checks every array result against
+the scalar one: reduction rates, CO2 impact records and equivalencies.
+Prices include every interpolation breakpoint; CO2 totals include zero,
+negative and sub-threshold values and decimal midpoints (x.x5 totals, and
+totals whose covered share at an integer coverage lands on one), and
+populations include zero. Also checks every shipped CO2 total (2000-2024)
+at every integer coverage. Scalar inputs are NumPy float64, as the
+pipeline passes them, so both paths round with NumPy's midpoint rules.
+
+Given the backend/ directory of a checkout from before the array path
+(e.g. git worktree add ../baseline <commit>), also runs that tree's
+calculate_co2_impact and /predict/all (_run_prediction) and checks the
+current scalar and array CO2 impacts and run_prediction_results (flat
+3% GDP growth, which the baseline used) against them.
+Run from backend/: python benchmarks/benchmark_calculations_array.py [BASELINE_BACKEND_DIR]
+"""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app import calculations, services
+from app.projections import run_prediction_results
+from app.runtime import active_bundle, use_bundle
+from app.schemas import PredictionRequest
+
+ROWS = 1_000_000
+BASELINE_YEARS = range(2015, 2025)
+BASELINE_COVERAGES = range(10, 91)
+BASELINE_SCENARIOS = [
+    dict(policy_type='Carbon tax', carbon_price_usd=50, coverage_percent=50, year=2025, projection_years=10),
+    dict(policy_type='ETS', carbon_price_usd=37, coverage_percent=33, year=2030, projection_years=5),
+    dict(policy_type='Carbon tax', carbon_price_usd=120, coverage_percent=85, year=2024, projection_years=3),
+    dict(policy_type='ETS', carbon_price_usd=5, coverage_percent=10, year=2040, projection_years=20),
+]
+
+# Runs in the baseline checkout: its scalar CO2 impact for every case and
+# its /predict/all result for every scenario, as JSON. Lookups are cached
+# per (country, year); they return the same values either way.
+BASELINE_SCRIPT = """
+import functools, json, sys
+from app import calculations
+from app.context import load_training_data
+from app.predict import load_models
+from app.schemas import PredictionRequest
+from app.services import load_all_data
+from app.simulation_routes import _run_prediction
+load_models()
+load_all_data()
+load_training_data()
+calculations.get_country_total_co2 = functools.lru_cache(None)(calculations.get_country_total_co2)
+calculations.get_country_population = functools.lru_cache(None)(calculations.get_country_population)
+cases = json.load(sys.stdin)
+def attempt(fn):
+    try:
+        return fn()
+    except Exception:
+        return None
+json.dump({
+    'impacts': [attempt(lambda: calculations.calculate_co2_impact(c, country, year, 50)) for c, country, year in cases['impacts']],
+    'predictions': [attempt(lambda: _run_prediction(PredictionRequest(**params)).dict()) for params in cases['predictions']],
+}, sys.stdout, default=float)
+"""
+
+def random_inputs(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    breakpoints = np.array([p for p, _ in calculations.REDUCTION_PRICE_POINTS] + [-5.0, 200.0])
+    price = np.where(rng.random(rows) < 0.05, rng.choice(breakpoints, rows), np.round(rng.uniform(-10, 300, rows), 2))
+    coverage = np.round(rng.uniform(10, 90, rows), 1)
+    total_co2 = rng.lognormal(3, 2.5, rows)
+    total_co2[rng.random(rows) < 0.02] = 0.0
+    total_co2[rng.random(rows) < 0.01] = -1.0
+    # Decimal midpoints, where np.round and round() disagree.
+    midpoint = rng.random(rows) < 0.05
+    total_co2[midpoint] = rng.integers(0, 300_000, midpoint.sum()) / 10 + 0.05
+    covered_midpoint = rng.random(rows) < 0.05
+    coverage[covered_midpoint] = rng.integers(10, 91, covered_midpoint.sum())
+    total_co2[covered_midpoint] = (rng.integers(0, 100_000, covered_midpoint.sum()) / 10 + 0.05) / (coverage[covered_midpoint] / 100)
+    population = rng.integers(0, 1_500_000_000, rows)
+    population[rng.random(rows) < 0.01] = 0
+    return price, coverage, total_co2, population
+
+def plain(value):
+    return json.loads(json.dumps(value, default=float))
+
+def baseline_subset(expected, actual):
+    # actual restricted to the fields the baseline reports.
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return {k: baseline_subset(v, actual.get(k)) for k, v in expected.items()}
+    if isinstance(expected, list) and isinstance(actual, list):
+        return [baseline_subset(e, a) for e, a in zip(expected, actual)]
+    return actual
+
+def check_baseline(baseline_dir):
+    countries = [c for c in services.get_available_countries() if c in active_bundle().co2_table['entity_ids']]
+    impact_cases = [(c, country, year) for country in countries for year in BASELINE_YEARS for c in BASELINE_COVERAGES]
+    prediction_cases = [dict(country=country, **s) for country in services.get_available_countries() for s in BASELINE_SCENARIOS]
+
+    start = time.perf_counter()
+    baseline = json.loads(subprocess.run(
+        [sys.executable, '-c', BASELINE_SCRIPT], cwd=baseline_dir, check=True, capture_output=True, text=True,
+        input=json.dumps({'impacts': impact_cases, 'predictions': prediction_cases}),
+    ).stdout)
+    print(f"\nbaseline {baseline_dir} evaluated in {time.perf_counter() - start:.0f} s")
+
+    scalar = [calculations.calculate_co2_impact(c, country, year, 50) for c, country, year in impact_cases]
+    entity_ids = services.co2_entity_ids([country for _, country, _ in impact_cases])
+    years = [year for _, _, year in impact_cases]
+    populations = [services.get_country_population(country, year) for _, country, year in impact_cases]
+    impact = calculations.calculate_co2_impact_array([c for c, _, _ in impact_cases], services.co2_totals(entity_ids, years), 50, populations)
+    array = [calculations.co2_impact_record(row, c, 50) for row, (c, _, _) in zip(impact, impact_cases)]
+    scalar_mismatches = sum(e != a for e, a in zip(baseline['impacts'], plain(scalar)))
+    array_mismatches = sum(e != a for e, a in zip(baseline['impacts'], plain(array)))
+    print(f"CO2 impact, {len(impact_cases)} cases: scalar {scalar_mismatches}, array {array_mismatches} mismatches against the baseline")
+
+    flat = active_bundle()._replace(gdp_growth_table=services.build_gdp_growth_table(
+        services._read_dataset(services.GDP_GROWTH_FILE, services.GDP_GROWTH_COLUMNS), window=0))
+    prediction_mismatches = 0
+    with use_bundle(flat):
+        for params, expected in zip(prediction_cases, baseline['predictions']):
+            request = PredictionRequest(**params)
+            try:
+                actual = run_prediction_results([request], [services.get_country_features(request.country, request.year)])[0]
+            except ValueError:
+                actual = None
+            actual = plain(actual)
+            prediction_mismatches += expected != (baseline_subset(expected, actual) if expected and actual else actual)
+    print(f"run_prediction_results, {len(prediction_cases)} scenarios: {prediction_mismatches} mismatches against the baseline")
+    return scalar_mismatches + array_mismatches + prediction_mismatches
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+def main():
+    price, coverage, total_co2, population = random_inputs(ROWS)
+    # The pipeline hands the scalar functions NumPy float64 CO2 values.
+    totals = list(total_co2)
+    prices, coverages, populations = price.tolist(), coverage.tolist(), population.tolist()
+
+    print(f"{'function':<28}{'scalar loop ms':>16}{'array ms':>10}{'speedup':>9}{'mismatches':>12}")
+
+    def report(name, scalar_ms, array_ms, mismatches):
+        print(f"{name:<28}{scalar_ms:>16.0f}{array_ms:>10.1f}{scalar_ms / array_ms:>8.0f}x{mismatches:>12}")
+        return mismatches
+
+    scalar_ms, expected = timed(lambda: [calculations.calculate_reduction_rate(p) for p in prices])
+    array_ms, actual = timed(lambda: calculations.calculate_reduction_rate_array(price))
+    mismatches = report('reduction rate', scalar_ms, array_ms, int(np.count_nonzero(np.array(expected) != actual)))
+
+    def scalar_impacts():
+        return [
+            calculations.co2_impact_from_totals(c, t, p, n) if not t <= 0 else None
+            for c, t, p, n in zip(coverages, totals, prices, populations)
+        ]
+    scalar_ms, expected = timed(scalar_impacts)
+    array_ms, impact = timed(lambda: calculations.calculate_co2_impact_array(coverage, total_co2, price, population))
+    records = [calculations.co2_impact_record(row, c, p) for row, c, p in zip(impact, coverages, prices)]
+    mismatches += report('CO2 impact', scalar_ms, array_ms, sum(e != a for e, a in zip(expected, records)))
+
+    reduced = [e['co2_potentially_reduced_mt'] if e else 0.0 for e in expected]
+    scalar_ms, expected = timed(lambda: [calculations.calculate_equivalencies(r) for r in reduced])
+    array_ms, equivalencies = timed(lambda: calculations.calculate_equivalencies_array(reduced))
+    records = [calculations.equivalencies_record(row) for row in equivalencies]
+    mismatches += report('equivalencies', scalar_ms, array_ms, sum(e != a for e, a in zip(expected, records)))
+
+    # The shipped data at every integer coverage.
+    table = active_bundle().co2_table['values'][:, 2000 - services.CO2_TABLE_FIRST_YEAR:2025 - services.CO2_TABLE_FIRST_YEAR]
+    shipped_coverage = np.repeat(np.arange(10.0, 91.0)[None, :], table.size, axis=0).ravel()
+    shipped_total = np.repeat(table.ravel(), 81)
+    impact = calculations.calculate_co2_impact_array(shipped_coverage, shipped_total, 50.0, 1_000_000)
+    shipped_mismatches = sum(
+        calculations.co2_impact_record(row, c, 50.0) != (calculations.co2_impact_from_totals(c, t, 50.0, 1_000_000) if not t <= 0 else None)
+        for row, c, t in zip(impact, shipped_coverage.tolist(), shipped_total)
+    )
+    print(f"shipped CO2 totals x integer coverages: {len(shipped_total)} rows, {shipped_mismatches} mismatches")
+    mismatches += shipped_mismatches
+
+    print(f"\narray results identical to scalar: {mismatches == 0}")
+    if len(sys.argv) > 1:
+        mismatches += check_baseline(sys.argv[1])
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Builds the dense CO2 table, checks every cell it serves against the scalar
+DataFrame lookup, and times per-year lookups both ways: one at a time, a
+prediction grid (every country x 20 years) and a Monte Carlo-sized gather.
+Run from backend/: python benchmarks/benchmark_co2_table.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app import services
+from app.runtime import active_bundle
+
+PARITY_YEARS = range(max(services.DATASET_MIN_YEAR, 1990) - 10, services.CO2_TABLE_LAST_YEAR + 1)
+GRID_YEARS = 20
+MONTE_CARLO_ROWS = 5000 * GRID_YEARS
+REPEATS = 5
+
+def best_ms(fn):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+def main():
+    bundle = active_bundle()
+    build_ms, table = best_ms(lambda: services.build_co2_table(bundle.co2_data))
+    print(f"table: {table['values'].shape[0]} entities x {table['values'].shape[1]} years "
+          f"({services.CO2_TABLE_FIRST_YEAR}-{services.CO2_TABLE_LAST_YEAR}), "
+          f"{table['values'].nbytes / 1e6:.2f} MB, built in {build_ms:.1f} ms")
+
+    entities = sorted(table['entity_ids'])
+    mismatches = 0
+    for entity in entities:
+        for year in PARITY_YEARS:
+            expected = services._country_total_co2(entity, year)
+            actual = services.get_country_total_co2(entity, year)
+            if expected != actual and not (np.isnan(expected) and np.isnan(actual)):
+                mismatches += 1
+    print(f"{len(entities) * len(PARITY_YEARS)} lookups over {len(entities)} entities x "
+          f"{PARITY_YEARS.start}-{PARITY_YEARS.stop - 1}: {mismatches} mismatches")
+
+    print(f"\n{'lookup':<34}{'rows':>8}{'dataframe ms':>14}{'table ms':>10}")
+    scalar_ms, _ = best_ms(lambda: [services._country_total_co2('Germany', 2025 + t) for t in range(GRID_YEARS)])
+    table_ms, _ = best_ms(lambda: [services.get_country_total_co2('Germany', 2025 + t) for t in range(GRID_YEARS)])
+    print(f"{'one country, one year at a time':<34}{GRID_YEARS:>8}{scalar_ms:>14.2f}{table_ms:>10.3f}")
+
+    years = 2025 + np.arange(GRID_YEARS)
+    grid_scalar_ms, expected = best_ms(lambda: np.array([
+        [services._country_total_co2(entity, int(year)) for year in years] for entity in entities
+    ]))
+    grid_table_ms, actual = best_ms(lambda: services.co2_totals(services.co2_entity_ids(entities)[:, None], years[None, :]))
+    print(f"{'every country x 20 years':<34}{expected.size:>8}{grid_scalar_ms:>14.2f}{grid_table_ms:>10.3f}")
+
+    rng = np.random.default_rng(0)
+    ids = rng.integers(0, len(entities), MONTE_CARLO_ROWS)
+    sample_years = rng.integers(2000, 2070, MONTE_CARLO_ROWS)
+    gather_ms, _ = best_ms(lambda: services.co2_totals(ids, sample_years))
+    print(f"{'random (entity, year) gather':<34}{MONTE_CARLO_ROWS:>8}{'':>14}{gather_ms:>10.3f}")
+
+    identical = mismatches == 0 and np.array_equal(expected, actual, equal_nan=True)
+    print(f"\ntable identical to the dataframe lookup: {identical}")
+    if not identical:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Checks every observed cell of the series table against the scalar
+per-year lookups (the fossil share against a per-row pandas computation
+from the file's real energy columns, since the prediction feature still
+reads the legacy names), then times a trend line built the way the charts did
+(one /country-info lookup per year) against a slice of the series table,
+for one country and for 20, and times LTTB downsampling on long series.
+Run from backend/: python benchmarks/benchmark_country_series.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app import memo, services
+from app.exporters import FastJSONResponse
+from app.runtime import active_bundle
+from app.series import country_series, lttb_indices
+
+COUNTRIES = ['Germany', 'France', 'Spain', 'Italy', 'Poland', 'Netherlands', 'Belgium', 'Sweden', 'Austria', 'Denmark',
+             'United Kingdom', 'Norway', 'Japan', 'Canada', 'Australia', 'Brazil', 'India', 'China', 'Mexico', 'Chile']
+REPEATS = 5
+
+def series_fossil_fuel_pct(entity, year):
+    energy_data = active_bundle().energy_data
+    row = energy_data[(energy_data['Entity'] == entity) & (energy_data['Year'] == year)].iloc[0]
+    values = {col: 0.0 if np.isnan(row[col]) else float(row[col]) for col in services.SERIES_ENERGY_COLUMNS}
+    fossil = sum(values[col] for col in services.SERIES_FOSSIL_COLUMNS)
+    total = fossil + sum(v for col, v in values.items() if col not in services.SERIES_FOSSIL_COLUMNS)
+    return 70.0 if total == 0 else round(np.float64(fossil / total * 100), 2)
+
+SCALAR = {
+    'co2_mt': services._country_total_co2,
+    'gdp_million': services.get_country_gdp,
+    'population': services.get_country_population,
+    'fossil_fuel_pct': series_fossil_fuel_pct,
+}
+
+def check_parity():
+    table = active_bundle().series_table
+    mismatches = checked = 0
+    for entity, entity_id in table['entity_ids'].items():
+        for metric, lookup in SCALAR.items():
+            if metric == 'gdp_million' and entity in services.GDP_ALTERNATE_NAMES:
+                continue
+            row = table[metric][entity_id]
+            for offset in np.flatnonzero(~np.isnan(row)):
+                checked += 1
+                if lookup(entity, table['first_year'] + int(offset)) != row[offset]:
+                    mismatches += 1
+    print(f"{checked} observed cells checked against the scalar lookups: {mismatches} mismatches")
+    return mismatches
+
+def per_year(countries, years):
+    # What a chart needed before: the /country-info lookups for every year.
+    memo.clear_caches()
+    return {
+        country: [(services.get_country_features(country, year), services.get_country_total_co2(country, year)) for year in years]
+        for country in countries
+    }
+
+def best_ms(fn):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+def main():
+    mismatches = check_parity()
+    table = active_bundle().series_table
+    years = range(table['first_year'], table['last_year'] + 1)
+
+    print(f"\n{'trend line':<24}{'per-year ms':>12}{'series ms':>11}{'bytes':>8}")
+    for name, countries in (('1 country', COUNTRIES[:1]), ('20 countries', COUNTRIES)):
+        scalar_ms = best_ms(lambda: per_year(countries, years))
+        series_ms = best_ms(lambda: country_series(countries))
+        size = len(FastJSONResponse({"series": country_series(countries)[0]}).body)
+        print(f"{name + f', {len(years)} years':<24}{scalar_ms:>12.2f}{series_ms:>11.3f}{size:>8}")
+
+    print(f"\n{'LTTB':<24}{'ms':>12}")
+    rng = np.random.default_rng(0)
+    for n, points in ((351, 50), (10_000, 200), (100_000, 500)):
+        x = np.arange(n, dtype=np.float64)
+        y = rng.normal(size=n).cumsum()
+        print(f"{f'{n} -> {points} points':<24}{best_ms(lambda: lttb_indices(x, y, points)):>12.3f}")
+
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
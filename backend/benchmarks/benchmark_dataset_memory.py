@@ -0,0 +1,91 @@
+"""
+Compares the memory of the four OWID datasets loaded as plain CSV frames
+against the lean frames services.load_all_data() keeps, and checks that
+every lookup returns the same value from both for each country and year.
+Run from backend/: python benchmarks/benchmark_dataset_memory.py
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app import services
+from app.runtime import RuntimeBundle, use_bundle
+
+DATASETS = [
+    ('energy_data', services.ENERGY_FILE, services.ENERGY_COLUMNS),
+    ('gdp_data', services.GDP_FILE, services.GDP_COLUMNS),
+    ('population_data', services.POPULATION_FILE, services.POPULATION_COLUMNS),
+    ('co2_data', services.CO2_FILE, services.CO2_COLUMNS),
+]
+
+LOOKUPS = [
+    services.get_country_fossil_fuel_pct,
+    services.get_country_gdp,
+    services.get_country_population,
+    services.get_country_total_co2,
+]
+
+LAST_YEAR = 2050
+
+def data_bundle(frames):
+    return RuntimeBundle(
+        version='', revenue_model=None, revenue_encoders=None, success_model=None,
+        success_encoders=None, model_version='', data_version='', training_data=None,
+        countries_with_history=frozenset(), training_data_version='',
+        co2_table=services.build_co2_table(frames['co2_data']),
+        available_countries=services.build_available_countries(**frames),
+        series_table=services.build_series_table(**frames),
+        gdp_growth_table=None,
+        **frames
+    )
+
+def lookup_all(bundle, countries, years):
+    results = {}
+    with use_bundle(bundle):
+        for country in countries:
+            for year in years:
+                for lookup in LOOKUPS:
+                    try:
+                        results[(lookup.__name__, country, year)] = lookup(country, year)
+                    except ValueError as e:
+                        results[(lookup.__name__, country, year)] = f"ValueError: {e}"
+        available = services.get_available_countries()
+    return results, available
+
+def main():
+    plain = {}
+    lean = {}
+    print(f"{'dataset':<18}{'rows':>8}{'columns':>9}{'before':>12}{'rows':>8}{'columns':>9}{'after':>12}")
+    total_before = total_after = 0
+    for name, path, columns in DATASETS:
+        plain[name] = pd.read_csv(path)
+        lean[name] = services.read_lean_csv(path, columns)
+        before = plain[name].memory_usage(deep=True).sum()
+        after = lean[name].memory_usage(deep=True).sum()
+        total_before += before
+        total_after += after
+        print(f"{name:<18}{len(plain[name]):>8}{plain[name].shape[1]:>9}{before / 1e6:>9.2f} MB"
+              f"{len(lean[name]):>8}{lean[name].shape[1]:>9}{after / 1e6:>9.2f} MB")
+    print(f"{'total':<18}{'':>17}{total_before / 1e6:>9.2f} MB{'':>17}{total_after / 1e6:>9.2f} MB"
+          f"  ({total_after / total_before:.1%})")
+
+    countries = sorted(set().union(*(set(df['Entity'].unique()) for df in plain.values())))
+    years = range(max(services.DATASET_MIN_YEAR, 1990), LAST_YEAR + 1)
+    expected, expected_available = lookup_all(data_bundle(plain), countries, years)
+    actual, actual_available = lookup_all(data_bundle(lean), countries, years)
+
+    mismatches = [key for key in expected if expected[key] != actual[key]]
+    print(f"\n{len(expected)} lookups over {len(countries)} entities x {len(years)} years: "
+          f"{len(mismatches)} mismatches")
+    for key in mismatches[:10]:
+        print(f"  {key}: {expected[key]!r} != {actual[key]!r}")
+    if expected_available != actual_available:
+        print(f"  available countries differ: {sorted(set(expected_available) ^ set(actual_available))}")
+    if mismatches or expected_available != actual_available:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Builds the per-country GDP growth table from real-gdp-growth.csv, checks it
+against a per-country pandas computation (with and without the trend), and
+times projections with the table against the flat 3% path
+(GDP_GROWTH_WINDOW=0, which reproduces the old projections exactly): the
+projection grid for one scenario and for every country, and a full
+20-year /predict/all run. Exits non-zero if the table path is measurably
+slower (more than 5% and 0.05 ms on the best-of timings).
+Run from backend/: python benchmarks/benchmark_gdp_growth.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app import memo, services
+from app.projections import build_projection_grid, run_prediction_results
+from app.runtime import active_bundle, use_bundle
+from app.schemas import PredictionRequest
+from app.services import get_country_features, get_countries_features
+
+WINDOW = 10
+REPEATS = 200
+TOLERANCE = 0.05
+
+def reference_profile(observed, trend):
+    column = services.GDP_GROWTH_COLUMNS[0]
+    profiles = {}
+    for entity, rows in observed.groupby('Entity', observed=True):
+        rows = rows.sort_values('Year', ascending=False, kind='stable').head(WINDOW)
+        x, y = rows['Year'].to_numpy(dtype=float), rows[column].to_numpy(dtype=float) / 100
+        slope = np.polyfit(x, y, 1)[0] if trend and np.ptp(x) > 0 else 0.0
+        rate = y.mean() + slope * (x.max() - x.mean())
+        profiles[str(entity)] = (np.clip(rate, services.GDP_GROWTH_MIN, services.GDP_GROWTH_MAX), slope)
+    return profiles
+
+def check_table(growth_data):
+    observed = growth_data.dropna(subset=services.GDP_GROWTH_COLUMNS)
+    mismatches = 0
+    for trend in (False, True):
+        table = services.build_gdp_growth_table(growth_data, WINDOW, trend)
+        for entity, (rate, slope) in reference_profile(observed, trend).items():
+            i = table['entity_ids'][entity]
+            mismatches += not (np.isclose(table['rate'][i], rate) and np.isclose(table['trend'][i], slope))
+    print(f"{len(table['entity_ids'])} entities, with and without trend: {mismatches} mismatches against pandas")
+    return mismatches
+
+def best_ms(fn):
+    fn()
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+def main():
+    growth_data = services._read_dataset(services.GDP_GROWTH_FILE, services.GDP_GROWTH_COLUMNS)
+    start = time.perf_counter()
+    services.build_gdp_growth_table(growth_data)
+    print(f"table built in {(time.perf_counter() - start) * 1000:.2f} ms")
+    mismatches = check_table(growth_data)
+
+    bundle = active_bundle()
+    flat = bundle._replace(gdp_growth_table=services.build_gdp_growth_table(growth_data, window=0))
+    request = PredictionRequest(country='Germany', policy_type='Carbon tax', carbon_price_usd=50,
+                                coverage_percent=50, year=2025, projection_years=20)
+    features = get_country_features('Germany', 2025)
+    countries = list(bundle.available_countries)
+    all_features, _ = get_countries_features(countries, 2025)
+    every_country = [request.copy(update={'country': c}) for c in countries if c in all_features]
+
+    def predict():
+        memo.clear_caches()
+        return run_prediction_results([request], [features])
+
+    cases = [
+        ('grid, 1 scenario x 20 years', lambda: build_projection_grid([request], [features])),
+        (f'grid, {len(every_country)} countries x 20 years',
+         lambda: build_projection_grid(every_country, [all_features[r.country] for r in every_country])),
+        ('/predict/all, 20 years', predict),
+    ]
+    print(f"\n{'path':<36}{'flat ms':>9}{'table ms':>10}")
+    slower = False
+    for name, fn in cases:
+        with use_bundle(flat):
+            flat_ms = best_ms(fn)
+        table_ms = best_ms(fn)
+        slower |= table_ms > flat_ms * (1 + TOLERANCE) and table_ms - flat_ms > 0.05
+        print(f"{name:<36}{flat_ms:>9.3f}{table_ms:>10.3f}")
+
+    print(f"\nno measurable latency added: {not slower}")
+    if mismatches or slower:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
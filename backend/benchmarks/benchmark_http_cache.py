@@ -0,0 +1,91 @@
+"""
+Times repeat loads of the reference endpoints and a user's saved-simulation
+history with and without a matching If-None-Match (200 with a body against
+an empty 304), and the country list computed from the four datasets against
+the list precomputed on the bundle. History runs against a temporary SQLite
+database holding 500 simulations.
+Run from backend/: python benchmarks/benchmark_http_cache.py
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from fastapi.testclient import TestClient
+from app import services
+from app.auth_routes import get_current_user
+from app.database import Base, get_db
+from app.main import app
+from app.models import User
+from app.runtime import active_bundle
+from app.simulation_routes import _simulation_values, _bulk_insert_simulations
+from benchmark_bulk_save import synthetic_items
+
+ENDPOINTS = ['/countries', '/policy-types', '/country-info/Germany', '/simulations', '/simulations?limit=50']
+REPEATS = 200
+
+def median_ms(fn):
+    fn()
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def computed_countries():
+    # What /countries did on every request before the list moved to the bundle.
+    bundle = active_bundle()
+    return sorted(set(bundle.energy_data['Entity'].unique()) & set(bundle.gdp_data['Entity'].unique())
+                  & set(bundle.population_data['Entity'].unique()) & set(bundle.co2_data['Entity'].unique()))
+
+def main():
+    print(f"country list: computed {median_ms(computed_countries):.3f} ms, "
+          f"precomputed {median_ms(services.get_available_countries):.4f} ms median; "
+          f"same: {computed_countries() == services.get_available_countries()}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'history.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+        db.add(User(id=1, email='bench@example.com', hashed_password='x'))
+        db.commit()
+        items = synthetic_items()
+        _bulk_insert_simulations(db, [_simulation_values(1, i, r, None, None) for i, r in items], [r for _, r in items])
+        db.commit()
+        db.close()
+
+        def session():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+        app.dependency_overrides[get_db] = session
+        app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, email='bench@example.com')
+        client = TestClient(app)
+
+        print(f"\n{'GET':<26}{'bytes':>8}{'200 ms':>9}{'304 ms':>9}")
+        for path in ENDPOINTS:
+            response = client.get(path)
+            response.raise_for_status()
+            etag = response.headers['etag']
+            revalidated = client.get(path, headers={'If-None-Match': etag})
+            assert revalidated.status_code == 304 and not revalidated.content
+            full_ms = median_ms(lambda: client.get(path))
+            cached_ms = median_ms(lambda: client.get(path, headers={'If-None-Match': etag}))
+            print(f"{path:<26}{len(response.content):>8}{full_ms:>9.3f}{cached_ms:>9.3f}")
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+if __name__ == '__main__':
+    main()
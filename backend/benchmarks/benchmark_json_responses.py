@@ -0,0 +1,112 @@
+"""
+Times the JSON response paths for 20-year projections: /predict/all over
+HTTP (in-process client) and at the handler (endpoint plus FastAPI's
+response_model handling and rendering, no transport), and a stored
+simulation read built with full pydantic validation against the trusted
+orjson path. Checks that both read paths produce the same JSON.
+Run from backend/: python benchmarks/benchmark_json_responses.py
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from app.main import app
+from app.exporters import FastJSONResponse
+from app.projections import prediction_result
+from app.simulation_routes import _simulation_detail_response
+from app.schemas import PredictionRequest, PredictionResponse, SimulationDetail
+from app.storage import encode_results, load_results
+
+REQUEST = {
+    'country': 'Germany', 'policy_type': 'Carbon tax', 'carbon_price_usd': 50,
+    'coverage_percent': 50, 'year': 2025, 'projection_years': 20,
+}
+REPEATS = 200
+
+def handler_body(route, loop) -> bytes:
+    # What FastAPI does with the endpoint's return value: a Response goes
+    # out as is, anything else is validated against response_model, dumped
+    # and rendered.
+    raw = route.endpoint(PredictionRequest(**REQUEST))
+    if isinstance(raw, Response):
+        return raw.body
+    content = loop.run_until_complete(serialize_response(field=route.response_field, response_content=raw))
+    return JSONResponse(content).body
+
+def median_ms(fn):
+    fn()
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    client = TestClient(app)
+    response = client.post('/predict/all', json=REQUEST)
+    response.raise_for_status()
+    results = response.json()
+    print(f"POST /predict/all, 20 years ({len(response.content)} bytes)")
+    print(f"  over HTTP:  {median_ms(lambda: client.post('/predict/all', json=REQUEST)):.3f} ms median")
+    route = next(r for r in app.routes if getattr(r, 'path', None) == '/predict/all')
+    loop = asyncio.new_event_loop()
+    print(f"  handler:    {median_ms(lambda: handler_body(route, loop)):.3f} ms median")
+
+    # The response step alone, for the same pipeline output: the model
+    # built with validation, then validated, dumped and rendered again by
+    # FastAPI, against the trusted dict rendered by orjson.
+    def validated_response():
+        model = PredictionResponse(**results)
+        return JSONResponse(loop.run_until_complete(serialize_response(field=route.response_field, response_content=model))).body
+
+    def trusted_response():
+        return FastJSONResponse(prediction_result(results, {}, results['projections'])).body
+
+    print(f"  response step, validated:  {median_ms(validated_response):.3f} ms median")
+    print(f"  response step, trusted:    {median_ms(trusted_response):.3f} ms median")
+    same = json.loads(validated_response()) == json.loads(trusted_response())
+
+    simulation = SimpleNamespace(
+        id=1, user_id=1, policy_name='Carbon tax - Germany 2025', input_params=REQUEST,
+        created_at=datetime(2025, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc),
+        results=None, results_packed=encode_results(results),
+    )
+    adapter = TypeAdapter(SimulationDetail)
+
+    def validated():
+        # What get_simulation did before: build the models, then FastAPI
+        # validates and dumps the response_model and json.dumps renders it.
+        detail = SimulationDetail(
+            id=simulation.id, user_id=simulation.user_id, policy_name=simulation.policy_name,
+            created_at=simulation.created_at, input_params=simulation.input_params,
+            results=PredictionResponse(**load_results(simulation))
+        )
+        content = adapter.dump_python(adapter.validate_python(detail, from_attributes=True), mode='json')
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+    def trusted():
+        return _simulation_detail_response(simulation).body
+
+    print("\nstored simulation read, 20 years (median)")
+    print(f"  pydantic validate + dump:  {median_ms(validated):.3f} ms")
+    print(f"  trusted orjson:            {median_ms(trusted):.3f} ms")
+    same &= json.loads(validated()) == json.loads(trusted())
+    print(f"  same JSON: {same}")
+    if not same:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
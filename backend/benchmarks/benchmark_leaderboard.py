@@ -0,0 +1,69 @@
+"""
+Times building the leaderboard table and serving pages from it, and checks
+every row against the full /predict/all pipeline run one country at a time.
+Run from backend/: python benchmarks/benchmark_leaderboard.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app import leaderboard
+from app.projections import run_predictions
+from app.runtime import active_bundle
+from app.schemas import PredictionRequest
+from app.services import get_country_features
+
+PAGE_REQUESTS = 10000
+
+def full_pipeline(scenario, countries):
+    params = {k: v for k, v in scenario.items() if k != "id"}
+    rows = {}
+    for country in countries:
+        request = PredictionRequest(country=country, **params)
+        response = run_predictions([request], [get_country_features(country, request.year)])[0]
+        rows[country] = {
+            "revenue_million": response.revenue_million,
+            "risk_adjusted_value_million": response.risk_adjusted_value_million,
+            "cumulative_revenue_million": response.projections[-1].cumulative_revenue_million,
+            "co2_reduced_mt": response.co2_reduced_mt,
+            "co2_reduced_cumulative_mt": response.projections[-1].co2_reduced_cumulative_mt,
+            "abolishment_risk_percent": response.abolishment_risk_percent,
+            "risk_category": response.risk_category,
+        }
+    return rows
+
+def main():
+    bundle = active_bundle()
+    start = time.perf_counter()
+    table = leaderboard.build_leaderboard(bundle)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    first = next(iter(table["scenarios"].values()))
+    ranking = first["rankings"]["revenue_million"]
+    countries = [row["country"] for row in ranking]
+
+    start = time.perf_counter()
+    expected = full_pipeline(first["scenario"], countries)
+    pipeline_ms = (time.perf_counter() - start) * 1000
+
+    mismatches = [row["country"] for row in ranking
+                  if {k: row[k] for k in expected[row["country"]]} != expected[row["country"]]]
+
+    leaderboard._tables[bundle.version] = table
+    start = time.perf_counter()
+    for i in range(PAGE_REQUESTS):
+        page = leaderboard.get_leaderboard()["scenarios"][first["scenario"]["id"]]["rankings"]["co2_reduced_mt"]
+        [{"rank": j + 1, **row} for j, row in enumerate(page[i % 5 * 20:i % 5 * 20 + 20])]
+    page_us = (time.perf_counter() - start) / PAGE_REQUESTS * 1e6
+
+    print(f"{len(table['scenarios'])} scenarios x {len(countries)} countries built in {build_ms:.0f} ms")
+    print(f"one scenario through /predict/all per country: {pipeline_ms:.0f} ms")
+    print(f"page of 20 from the table: {page_us:.1f} us")
+    print(f"rows differing from /predict/all: {len(mismatches)} {mismatches[:5]}")
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
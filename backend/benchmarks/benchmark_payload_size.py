@@ -0,0 +1,114 @@
+"""
+Measures response bytes for realistic payloads - a two- and four-policy
+comparison and a stored simulation with 20-year projections, and a
+500-row history page - as sent today, gzip- and brotli-compressed, in the
+compact representation, and compact plus compressed. Also times the
+compression step and checks the compact form expands back to the original.
+Run from backend/: python benchmarks/benchmark_payload_size.py
+"""
+
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app import compression
+from app.exporters import FastJSONResponse, compact_results, SHARED_STRING_FIELDS
+from app.projections import run_prediction_results
+from app.schemas import PredictionRequest
+from app.services import get_country_features
+
+BASE = dict(country='Germany', policy_type='Carbon tax', carbon_price_usd=50, coverage_percent=50, year=2025, projection_years=20)
+FOUR_POLICIES = [
+    BASE,
+    {**BASE, 'policy_type': 'ETS', 'carbon_price_usd': 80},
+    {**BASE, 'country': 'France', 'coverage_percent': 70},
+    {**BASE, 'country': 'Spain', 'carbon_price_usd': 35},
+]
+HISTORY_ROWS = 500
+REPEATS = 50
+
+def comparison(params_list, compact):
+    requests = [PredictionRequest(**params) for params in params_list]
+    results = run_prediction_results(requests, [get_country_features(r.country, r.year) for r in requests])
+    simulations = [{"input": r.dict(), "results": res, "id": None, "policy_name": None} for r, res in zip(requests, results)]
+    if not compact:
+        return {"simulations": simulations}
+    strings = {}
+    for simulation in simulations:
+        simulation["results"] = compact_results(simulation["results"], strings)
+    return {"simulations": simulations, "strings": list(strings)}
+
+def detail(compact):
+    content = comparison([BASE], compact)
+    simulation = content["simulations"][0]
+    detail = {"id": 1, "user_id": 1, "policy_name": "Carbon tax - Germany 2025",
+              "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc), "input_params": simulation["input"],
+              "results": simulation["results"]}
+    if compact:
+        detail["strings"] = content["strings"]
+    return detail
+
+def history(compact):
+    rng = random.Random(7)
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [{
+        "id": i + 1, "policy_name": f"Carbon tax - Germany 2025 #{i}",
+        "created_at": created + timedelta(minutes=i), "country": rng.choice(['Germany', 'France', 'Spain', 'Italy']),
+        "policy_type": rng.choice(['Carbon tax', 'ETS']), "carbon_price_usd": round(rng.uniform(10, 150), 1),
+        "coverage_percent": round(rng.uniform(10, 90), 1), "revenue_million": round(rng.uniform(50, 5000), 2),
+        "risk_category": rng.choice(['Low Risk', 'At Risk', 'High Risk']),
+    } for i in range(HISTORY_ROWS)]
+
+PAYLOADS = [
+    ('compare, 2 policies', lambda compact: comparison(FOUR_POLICIES[:2], compact)),
+    ('compare, 4 policies', lambda compact: comparison(FOUR_POLICIES, compact)),
+    ('stored simulation', detail),
+    (f'history, {HISTORY_ROWS} rows', None),
+]
+
+def expand(content):
+    # Client side of the compact form.
+    strings = content.pop("strings")
+    for simulation in content.get("simulations", [content]):
+        results = simulation["results"]
+        for field in SHARED_STRING_FIELDS:
+            results[field] = strings[results[field]]
+        columns = results["projections"]
+        results["projections"] = [dict(zip(columns, row)) for row in zip(*columns.values())]
+    return content
+
+def median_ms(fn):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    print(f"{'payload':<22}{'plain':>8}{'gzip':>7}{'br':>7}{'compact':>9}{'+gzip':>7}{'+br':>7}"
+          f"{'gzip ms':>9}{'br ms':>7}")
+    identical = True
+    for name, build in PAYLOADS:
+        plain = FastJSONResponse(build(False) if build else history(False)).body
+        compact = FastJSONResponse(build(True)).body if build else None
+        if build:
+            identical &= expand(json.loads(compact)) == json.loads(plain)
+        sizes = [len(compression.compress(body, encoding)) if body else None
+                 for body in (plain, compact) for encoding in ('gzip', 'br')]
+        gzip_ms = median_ms(lambda: compression.compress(plain, 'gzip'))
+        br_ms = median_ms(lambda: compression.compress(plain, 'br'))
+        compact_size = f"{len(compact):>9}" if compact else f"{'-':>9}"
+        extra = f"{sizes[2]:>7}{sizes[3]:>7}" if compact else f"{'-':>7}{'-':>7}"
+        print(f"{name:<22}{len(plain):>8}{sizes[0]:>7}{sizes[1]:>7}{compact_size}{extra}{gzip_ms:>9.3f}{br_ms:>7.3f}")
+    print(f"\ncompact form expands to the full payload: {identical}")
+    if not identical:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Compares /predict/solve against a brute-force scan of the price/coverage
+space ($0.50 x 1% steps) for a few targets: the cheapest price each finds,
+the points evaluated and the time taken.
+Run from backend/: python benchmarks/benchmark_solver.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.schemas import SolveRequest
+from app.services import get_country_features
+from app.solver import solve_policy, _search_state, _evaluate
+
+BRUTE_PRICE_STEP = 0.5
+BRUTE_COVERAGE_STEP = 1.0
+
+CASES = [
+    ('Germany', 'revenue_million', 3000),
+    ('Germany', 'cumulative_revenue_million', 20000),
+    ('France', 'co2_reduced_mt', 20),
+    ('India', 'co2_reduced_cumulative_mt', 1500),
+]
+
+def brute_force(request, features):
+    state = _search_state(request, features)
+    prices = np.arange(request.price_min_usd, request.price_max_usd + 1e-9, BRUTE_PRICE_STEP)
+    coverages = np.arange(request.coverage_min_percent, request.coverage_max_percent + 1e-9, BRUTE_COVERAGE_STEP)
+    values = _evaluate(state, np.tile(prices, len(coverages)), np.repeat(coverages, len(prices)))
+    reached = (values >= request.target_value).reshape(len(coverages), len(prices))
+    if not reached.any():
+        return None, state['evaluations']
+    cheapest = prices[reached.any(axis=0)].min()
+    return float(cheapest), state['evaluations']
+
+def main():
+    print(f"{'country':<10}{'metric':<28}{'solver $':>10}{'points':>8}{'ms':>8}{'brute $':>10}{'points':>9}{'ms':>9}")
+    for country, metric, target in CASES:
+        request = SolveRequest(country=country, policy_type='Carbon tax', year=2025, projection_years=10,
+                               target_metric=metric, target_value=target)
+        features = get_country_features(country, request.year)
+
+        start = time.perf_counter()
+        result = solve_policy(request, features)
+        solver_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        brute_price, brute_points = brute_force(request, features)
+        brute_ms = (time.perf_counter() - start) * 1000
+
+        solver_price = result['optimal']['carbon_price_usd'] if result['optimal'] else None
+        print(f"{country:<10}{metric:<28}{solver_price!s:>10}{result['evaluations']:>8}{solver_ms:>8.0f}"
+              f"{brute_price!s:>10}{brute_points:>9}{brute_ms:>9.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Times /predict/all-style runs with the stage caches cold and warm for the
+edits the memo is meant for: a longer horizon for the same scenario, a new
+price or coverage, and a repeat. Checks that warm results are identical to
+cold ones and prints the stage hit counters.
+Run from backend/: python benchmarks/benchmark_stage_memo.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app import memo
+from app.projections import run_predictions
+from app.runtime import active_bundle
+from app.schemas import PredictionRequest
+from app.services import get_country_features
+
+BASE = dict(country='Germany', policy_type='Carbon tax', carbon_price_usd=50, coverage_percent=50, year=2025, projection_years=5)
+
+EDITS = [
+    ('5 -> 20 years', dict(projection_years=20)),
+    ('new price', dict(projection_years=20, carbon_price_usd=65)),
+    ('new coverage', dict(projection_years=20, carbon_price_usd=65, coverage_percent=70)),
+    ('repeat', dict(projection_years=20, carbon_price_usd=65, coverage_percent=70)),
+]
+REPEATS = 20
+
+def predict(params):
+    request = PredictionRequest(**params)
+    return run_predictions([request], [get_country_features(request.country, request.year)])[0]
+
+def timed(params, warm_with):
+    timings = []
+    for _ in range(REPEATS):
+        memo.clear_caches()
+        if warm_with is not None:
+            predict(warm_with)
+        start = time.perf_counter()
+        result = predict(params)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+def main():
+    active_bundle()
+    print(f"{'edit':<16}{'cold ms':>9}{'warm ms':>9}  stage hits/misses on the warm run")
+    previous = BASE
+    identical = True
+    for name, change in EDITS:
+        params = {**BASE, **change}
+        cold_ms, cold = timed(params, None)
+        warm_ms, warm = timed(params, previous)
+        identical &= cold.dict() == warm.dict()
+
+        memo.clear_caches()
+        predict(previous)
+        before = memo.cache_stats()
+        predict(params)
+        after = memo.cache_stats()
+        counts = "  ".join(
+            f"{stage} {after[stage]['hits'] - before[stage]['hits']}/{after[stage]['misses'] - before[stage]['misses']}"
+            for stage in memo.STAGES
+        )
+        print(f"{name:<16}{cold_ms:>9.2f}{warm_ms:>9.2f}  {counts}")
+        previous = params
+    print(f"warm results identical to cold: {identical}")
+    if not identical:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Compares the legacy JSON results column against the packed columnar format
+on a synthetic table. Run from backend/: python benchmarks/benchmark_storage.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import Column, Integer, JSON, LargeBinary, MetaData, Table, create_engine, select
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.storage import encode_results, decode_results
+
+ROWS = 100_000
+BATCH = 5_000
+READ_SAMPLE = 2_000
+
+def synthetic_results(rng):
+    revenue = rng.uniform(50, 5000)
+    projections = []
+    cumulative = 0.0
+    for offset in range(20):
+        revenue *= 1.015
+        cumulative += revenue
+        projections.append({
+            'year': 2025 + offset,
+            'revenue_million': round(revenue, 2),
+            'cumulative_revenue_million': round(cumulative, 2),
+            'co2_reduced_mt': round(rng.uniform(0.1, 40), 3),
+            'co2_reduced_cumulative_mt': round(rng.uniform(1, 400), 3),
+            'co2_after_reduction_mt': round(rng.uniform(10, 900), 2),
+            'co2_reduced_from_base_mt': round(rng.uniform(1, 400), 3),
+            'abolishment_risk_percent': round(rng.uniform(0, 100), 1),
+            'risk_category': rng.choice(['Low Risk', 'At Risk', 'High Risk']),
+            'risk_adjusted_value_million': round(revenue * 0.7, 2),
+        })
+    return {
+        'revenue_million': round(projections[0]['revenue_million'], 2),
+        'abolishment_risk_percent': 42.0,
+        'risk_category': 'At Risk',
+        'total_country_co2_mt': 650.2,
+        'co2_covered_mt': 325.1,
+        'co2_reduced_mt': 13.004,
+        'co2_covered_per_capita_tonnes': 3.9,
+        'cars_off_road_equivalent': 2826956,
+        'trees_planted_equivalent': 216733333,
+        'coal_plants_closed_equivalent': 3.72,
+        'homes_powered_equivalent': 1652350,
+        'equivalencies_source': 'Conversion factors based on EPA Greenhouse Gas Equivalencies Calculator: 4.6 tons/vehicle, 0.06 tons/tree/year, 3.5M tons/1GW coal plant, 7.87 tons/home/year. Sources: EPA, USDA Forest Service, IEA.',
+        'risk_adjusted_value_million': 1200.5,
+        'recommendation': 'Moderate risk - careful implementation required.',
+        'similar_policies': ['Sweden Carbon tax (2019): $120/tonne, 40.0% coverage'] * 3,
+        'key_risks': ['High carbon price may trigger political opposition'],
+        'context_explanation': 'The model predicts At Risk for Germany. ' * 6,
+        'projections': projections,
+    }
+
+def populate(engine, table, column, encode):
+    rng = random.Random(7)
+    with engine.begin() as conn:
+        for start in range(0, ROWS, BATCH):
+            conn.execute(table.insert(), [{column: encode(synthetic_results(rng))} for _ in range(min(BATCH, ROWS - start))])
+
+def read_latency(engine, table, column, decode):
+    ids = random.Random(11).sample(range(1, ROWS + 1), READ_SAMPLE)
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        for row_id in ids:
+            decode(conn.execute(select(table.c[column]).where(table.c.id == row_id)).scalar_one())
+        return (time.perf_counter() - start) / READ_SAMPLE * 1000
+
+def run(label, column_type, column, encode, decode):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        engine = create_engine(f'sqlite:///{db_path}')
+        metadata = MetaData()
+        table = Table('simulations', metadata, Column('id', Integer, primary_key=True), Column(column, column_type))
+        metadata.create_all(engine)
+        populate(engine, table, column, encode)
+        size_mb = os.path.getsize(db_path) / 1_000_000
+        latency_ms = read_latency(engine, table, column, decode)
+        engine.dispose()
+    print(f"{label:<22} table size: {size_mb:8.1f} MB   read+decode: {latency_ms:.3f} ms/row")
+
+if __name__ == "__main__":
+    print(f"Synthetic dataset: {ROWS:,} simulations with 20-year projections")
+    run('JSON (format 0)', JSON, 'results', lambda r: r, lambda r: r)
+    run('Columnar zstd (v1)', LargeBinary, 'results_packed', encode_results, decode_results)
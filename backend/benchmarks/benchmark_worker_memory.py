@@ -0,0 +1,120 @@
+"""
+Reports per-worker unique (USS) and proportional (PSS) memory for 1, 4 and 8
+gunicorn workers: every worker loading its own models and datasets, the
+preload-and-fork setup in gunicorn.conf.py, and preload plus memory-mapped
+datasets and models.
+Linux only (reads /proc/<pid>/smaps_rollup).
+Run from backend/ with a configured .env: python benchmarks/benchmark_worker_memory.py
+"""
+
+import json
+import os
+import socket
+import subprocess
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+WORKER_COUNTS = [1, 4, 8]
+REQUESTS_PER_WORKER = 8
+
+PREDICTION = {
+    'country': 'Germany',
+    'policy_type': 'Carbon tax',
+    'carbon_price_usd': 50,
+    'coverage_percent': 50,
+    'year': 2025,
+    'projection_years': 10,
+}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def smaps_rollup(pid):
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        'uss_mb': (values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)) / 1024,
+        'pss_mb': values.get('Pss', 0) / 1024,
+    }
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(p) for p in f.read().split()]
+
+def wait_for(url, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=2).read()
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError(f"Server did not start: {url}")
+
+def predict(base_url):
+    request = urllib.request.Request(
+        f"{base_url}/predict/all",
+        data=json.dumps(PREDICTION).encode('utf-8'),
+        headers={'Content-Type': 'application/json', 'Connection': 'close'}
+    )
+    urllib.request.urlopen(request, timeout=60).read()
+
+MODES = ['load per worker', 'preload', 'preload + mmap']
+
+def measure(mode, workers, tmp):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), RECOMPUTE_ON_STARTUP='false')
+    env.pop('DATASET_CACHE_DIR', None)
+    env.pop('MODEL_MMAP_MODE', None)
+    if mode == 'load per worker':
+        # An empty config file, otherwise gunicorn picks up ./gunicorn.conf.py.
+        empty_config = os.path.join(tmp, 'empty.conf.py')
+        Path(empty_config).touch()
+        command = ['gunicorn', 'app.main:app', '-c', empty_config, '-k', 'uvicorn.workers.UvicornWorker',
+                   '-b', f'127.0.0.1:{port}', '-w', str(workers)]
+    else:
+        if mode == 'preload + mmap':
+            env.update(DATASET_CACHE_DIR=os.path.join(tmp, 'datasets'), MODEL_MMAP_MODE='r')
+        command = ['gunicorn', 'app.main:app', '-c', 'gunicorn.conf.py', '-w', str(workers)]
+
+    master = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_for(f"{base_url}/health")
+        for _ in range(workers * REQUESTS_PER_WORKER):
+            predict(base_url)
+        time.sleep(1)
+
+        worker_stats = [smaps_rollup(pid) for pid in children(master.pid)]
+        master_stats = smaps_rollup(master.pid)
+        return {
+            'workers': len(worker_stats),
+            'uss_per_worker_mb': sum(s['uss_mb'] for s in worker_stats) / len(worker_stats),
+            'pss_per_worker_mb': sum(s['pss_mb'] for s in worker_stats) / len(worker_stats),
+            'total_pss_mb': master_stats['pss_mb'] + sum(s['pss_mb'] for s in worker_stats),
+        }
+    finally:
+        master.terminate()
+        master.wait(timeout=30)
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'mode':<22}{'workers':>8}{'USS/worker':>13}{'PSS/worker':>13}{'total PSS':>12}")
+        for mode in MODES:
+            for workers in WORKER_COUNTS:
+                r = measure(mode, workers, tmp)
+                print(f"{mode:<22}{r['workers']:>8}{r['uss_per_worker_mb']:>10.1f} MB"
+                      f"{r['pss_per_worker_mb']:>10.1f} MB{r['total_pss_mb']:>9.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app and load models and datasets once in the master, then fork.
+# Workers inherit the bundle copy-on-write instead of each loading their own.
+preload_app = True
+
+def when_ready(server):
+    from app.database import init_db
+    from app.runtime import active_bundle
+    from app.leaderboard import materialize_leaderboard
+    # Migrations run once here rather than in every worker's lifespan.
+    try:
+        init_db()
+    except Exception as e:
+        server.log.warning(f"Database initialization warning: {e}")
+    bundle = active_bundle()
+    materialize_leaderboard(bundle)
+    # Moves everything allocated so far out of the collector's reach, so GC
+    # passes in the workers don't write to (and un-share) the inherited pages.
+    gc.freeze()
+    server.log.info(f"Runtime bundle {bundle.version} loaded before fork")
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared across processes.
+    from app.database import engine
+    engine.dispose(close=False)
+    # Only the first worker runs the startup recompute; every worker's
+    # lifespan would otherwise start one over the same stale rows.
+    if worker.age > 1:
+        os.environ["RECOMPUTE_ON_STARTUP"] = "false"
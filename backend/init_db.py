@@ -1,10 +1,10 @@
-from app.database import init_db, engine
-from app.models import Base
+from app.database import init_db
+import app.models
 
 if __name__ == "__main__":
     print("Initializing database...")
     try:
-        Base.metadata.create_all(bind=engine)
+        init_db()
         print("Database tables created successfully!")
     except Exception as e:
         print(f"Error initializing database: {e}")
@@ -30,7 +30,8 @@ export const predictPolicy = async (data) => {
         carbon_price_usd: parseFloat(data.carbonPrice),
         coverage_percent: parseFloat(data.coverage),
         year: data.year || 2025,
-        projection_years: parseInt(data.duration)
+        projection_years: parseInt(data.duration),
+        price_schedule: data.priceSchedule || null
       })
     });
     return await handleResponse(response);
@@ -40,6 +41,160 @@ export const predictPolicy = async (data) => {
   }
 };
 
+export const streamPrediction = async (data, onEvent) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/predict/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        country: data.country,
+        policy_type: data.policyType,
+        carbon_price_usd: parseFloat(data.carbonPrice),
+        coverage_percent: parseFloat(data.coverage),
+        year: data.year || 2025,
+        projection_years: parseInt(data.duration),
+        price_schedule: data.priceSchedule || null
+      })
+    });
+    if (!response.ok) return await handleResponse(response);
+
+    // NDJSON: one {event, data} object per line, passed on as it arrives.
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffered += decoder.decode(value, { stream: true });
+      const lines = buffered.split('\n');
+      buffered = lines.pop();
+      lines.filter(Boolean).forEach((line) => {
+        const { event, data: payload } = JSON.parse(line);
+        onEvent(event, payload);
+      });
+    }
+  } catch (error) {
+    if (error.response) throw error;
+    throw new Error('Network error. Please check your connection and try again.');
+  }
+};
+
+export const openTuningSession = (data, onMessage) => {
+  // Live what-if session: send the full policy once, then only the changed
+  // slider values; replies carry just the fields that changed.
+  const socket = new WebSocket(`${API_BASE_URL.replace(/^http/, 'ws')}/ws/tune`);
+  let seq = 0;
+  socket.onopen = () => socket.send(JSON.stringify({
+    type: 'init',
+    seq,
+    params: {
+      country: data.country,
+      policy_type: data.policyType,
+      carbon_price_usd: parseFloat(data.carbonPrice),
+      coverage_percent: parseFloat(data.coverage),
+      year: data.year || 2025,
+      projection_years: parseInt(data.duration)
+    }
+  }));
+  socket.onmessage = (event) => onMessage(JSON.parse(event.data));
+  return {
+    update: (params) => {
+      seq += 1;
+      socket.send(JSON.stringify({ type: 'update', seq, params }));
+      return seq;
+    },
+    close: () => socket.close()
+  };
+};
+
+export const predictPolicyUncertainty = async (data, samples = 1000, seed = null) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/predict/uncertainty`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        country: data.country,
+        policy_type: data.policyType,
+        carbon_price_usd: parseFloat(data.carbonPrice),
+        coverage_percent: parseFloat(data.coverage),
+        year: data.year || 2025,
+        projection_years: parseInt(data.duration),
+        samples,
+        seed
+      })
+    });
+    return await handleResponse(response);
+  } catch (error) {
+    if (error.response) throw error;
+    throw new Error('Network error. Please check your connection and try again.');
+  }
+};
+
+export const solvePolicy = async (data) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/predict/solve`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        country: data.country,
+        policy_type: data.policyType,
+        year: data.year || 2025,
+        projection_years: parseInt(data.duration),
+        target_metric: data.targetMetric,
+        target_value: parseFloat(data.targetValue),
+        max_risk_percent: data.maxRisk != null ? parseFloat(data.maxRisk) : null
+      })
+    });
+    return await handleResponse(response);
+  } catch (error) {
+    if (error.response) throw error;
+    throw new Error('Network error. Please check your connection and try again.');
+  }
+};
+
+export const predictAggregate = async (data) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/predict/aggregate`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        bloc: data.bloc || null,
+        countries: data.countries || [],
+        policy_type: data.policyType,
+        carbon_price_usd: parseFloat(data.carbonPrice),
+        coverage_percent: parseFloat(data.coverage),
+        year: data.year || 2025,
+        projection_years: parseInt(data.duration),
+        price_schedule: data.priceSchedule || null
+      })
+    });
+    return await handleResponse(response);
+  } catch (error) {
+    if (error.response) throw error;
+    throw new Error('Network error. Please check your connection and try again.');
+  }
+};
+
+export const getLeaderboard = async ({ scenario, sort = 'revenue_million', offset = 0, limit = 20 } = {}) => {
+  try {
+    const params = new URLSearchParams({ sort, offset, limit });
+    if (scenario) params.set('scenario', scenario);
+    const response = await fetch(`${API_BASE_URL}/leaderboard?${params}`);
+    return await handleResponse(response);
+  } catch (error) {
+    if (error.response) throw error;
+    throw new Error('Network error. Please check your connection and try again.');
+  }
+};
+
 export const getAvailableCountries = async () => {
   try {
     const response = await fetch(`${API_BASE_URL}/countries`);
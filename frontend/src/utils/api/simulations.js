@@ -33,6 +33,7 @@ export const saveSimulation = async (inputParams, results, policyName = null) =>
     coverage_percent: parseFloat(inputParams.coverage),
     year: inputParams.year || 2025,
     projection_years: parseInt(inputParams.duration || 5),
+    price_schedule: inputParams.priceSchedule || null,
     results: results,
     policy_name: policyName
   };
@@ -50,9 +51,62 @@ export const saveSimulation = async (inputParams, results, policyName = null) =>
   }
 };
 
-export const getUserSimulations = async () => {
+export const bulkSaveSimulations = async (items) => {
+  const requestBody = {
+    items: items.map(({ inputParams, results, policyName = null }) => ({
+      country: inputParams.country,
+      policy_type: inputParams.policyType,
+      carbon_price_usd: parseFloat(inputParams.carbonPrice),
+      coverage_percent: parseFloat(inputParams.coverage),
+      year: inputParams.year || 2025,
+      projection_years: parseInt(inputParams.duration || 5),
+      price_schedule: inputParams.priceSchedule || null,
+      results: results,
+      policy_name: policyName
+    }))
+  };
+
   try {
-    const response = await fetch(`${API_BASE_URL}/simulations`, {
+    const response = await fetch(`${API_BASE_URL}/simulations/bulk`, {
+      method: 'POST',
+      headers: getAuthHeaders(),
+      body: JSON.stringify(requestBody)
+    });
+    return await handleResponse(response);
+  } catch (error) {
+    if (error.response) throw error;
+    throw new Error('Network error. Please check your connection and try again.');
+  }
+};
+
+export const bulkDeleteSimulations = async (simulationIds) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/simulations/bulk`, {
+      method: 'DELETE',
+      headers: getAuthHeaders(),
+      body: JSON.stringify({ ids: simulationIds })
+    });
+    return await handleResponse(response);
+  } catch (error) {
+    if (error.response) throw error;
+    throw new Error('Network error. Please check your connection and try again.');
+  }
+};
+
+export const getUserSimulations = async (filters = {}) => {
+  const params = new URLSearchParams();
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value === undefined || value === null || value === '') return;
+    if (Array.isArray(value)) {
+      value.forEach(item => params.append(key, item));
+    } else {
+      params.append(key, value);
+    }
+  });
+  const query = params.toString();
+
+  try {
+    const response = await fetch(`${API_BASE_URL}/simulations${query ? `?${query}` : ''}`, {
       method: 'GET',
       headers: getAuthHeaders()
     });